@@ -22,9 +22,12 @@ the classes contained therein.
 
 import collections
 import copy
+import functools
+import hashlib
 import inspect
 import logging
 import os
+import uuid
 
 from django.conf import settings
 from django.conf.urls import include
@@ -60,24 +63,94 @@ def _decorate_urlconf(urlpatterns, decorator, *args, **kwargs):
             _decorate_urlconf(pattern.url_patterns, decorator, *args, **kwargs)
 
 
-# FIXME(lhcheng): We need to find a better way to cache the result.
-# Rather than storing it in the session, we could leverage the Django
-# session. Currently, this has been causing issue with cookie backend,
-# adding 1600+ in the cookie size.
+# Incremented whenever a dashboard or a panel is registered or unregistered,
+# so that navigation trees built before are discarded.
+_registry_generation = 0
+
+
+def _registry_changed():
+    global _registry_generation
+    _registry_generation += 1
+
+
+# Name of the session key holding the version of the cached access map.
+ACCESS_VERSION_SESSION_KEY = 'horizon_access_version'
+
+
+def _get_component_key(component):
+    return "%s.%s" % (component.__class__.__module__,
+                      component.__class__.__name__)
+
+
+def _get_access_cache_key(request):
+    """Returns the cache key of the access map of the request.
+
+    The key depends on the token and the region of the user, and on a
+    version stored in the session, which is all the session has to hold.
+    Returns ``None`` for requests without a token.
+    """
+    user = getattr(request, 'user', None)
+    token_id = getattr(getattr(user, 'token', None), 'id', None)
+    if not token_id:
+        return None
+    session = request.session
+    version = session.get(ACCESS_VERSION_SESSION_KEY)
+    if version is None:
+        version = session[ACCESS_VERSION_SESSION_KEY] = uuid.uuid4().hex
+    scope = u'%s:%s' % (token_id, getattr(user, 'services_region', None))
+    digest = hashlib.md5(scope.encode('utf-8')).hexdigest()
+    return 'horizon:access:%s:%s' % (digest, version)
+
+
+def _get_access_cache():
+    # Imported here, as the cache framework cannot be loaded before the
+    # settings, which may import horizon.
+    from django.core.cache import cache
+    return cache
+
+
+def invalidate_access_cache(request):
+    """Discards the access map cached for the session of the request.
+
+    The map is computed again on the next call to
+    :meth:`~horizon.base.Site.get_access_map`. Switching the project or
+    the region gets a map of its own, and logging out discards the
+    session, so this is only needed when the checks of the user change
+    otherwise, e.g. after the user changed their own roles.
+    """
+    request.session[ACCESS_VERSION_SESSION_KEY] = uuid.uuid4().hex
+    horizon = getattr(request, 'horizon', {})
+    horizon.pop('access', None)
+    horizon.pop('navigation_mask', None)
+
+
+def access_check_failed(request):
+    """Keeps the access map of the request from being cached.
+
+    To be called by ``allowed`` methods which deny access because a check
+    could not be completed, e.g. when a service did not respond, so that
+    the check is run again on the next request.
+    """
+    horizon = getattr(request, 'horizon', None)
+    if horizon is not None:
+        horizon['access_check_failed'] = True
+
+
 def access_cached(func):
+    """Serves ``can_access`` from the access map of the current request.
+
+    The map is computed by :meth:`~horizon.base.Site.get_access_map`,
+    which the navigation template tags call before checking any component.
+    Components missing from the map are checked by calling ``func``.
+    """
+    @functools.wraps(func)
     def inner(self, context):
-        session = context['request'].session
-        try:
-            if session['allowed']['valid_for'] != session.get('token'):
-                raise KeyError()
-        except KeyError:
-            session['allowed'] = {"valid_for": session.get('token')}
-
-        key = "%s.%s" % (self.__class__.__module__, self.__class__.__name__)
-        if key not in session['allowed']:
-            session['allowed'][key] = func(self, context)
-            session.modified = True
-        return session['allowed'][key]
+        horizon = getattr(context['request'], 'horizon', None) or {}
+        access = horizon.get('access', {})
+        key = _get_component_key(self)
+        if key in access:
+            return access[key]
+        return func(self, context)
     return inner
 
 
@@ -116,15 +189,13 @@ class HorizonComponent(object):
                 urlpatterns = patterns('')
         return urlpatterns
 
-    # FIXME(lhcheng): Removed the access_cached decorator for now until
-    # a better implementation has been figured out. This has been causing
-    # issue with cookie backend, adding 1600+ in the cookie size.
-    # @access_cached
+    @access_cached
     def can_access(self, context):
         """Return whether the user has role based access to this component.
 
         This method is not intended to be overridden.
-        The result of the method is stored in per-session cache.
+        The result of the method is looked up in the access map of the
+        navigation, see :meth:`~horizon.base.Site.get_access_map`.
         """
         return self.allowed(context)
 
@@ -173,6 +244,7 @@ class Registry(object):
         if cls not in self._registry:
             cls._registered_with = self
             self._registry[cls] = cls()
+            _registry_changed()
 
         return self._registry[cls]
 
@@ -190,6 +262,7 @@ class Registry(object):
             raise NotRegistered('%s is not registered' % cls)
 
         del self._registry[cls]
+        _registry_changed()
 
         return True
 
@@ -649,6 +722,86 @@ class Dashboard(Registry, HorizonComponent):
         return False
 
 
+class NavigationItem(object):
+    """A dashboard or a panel as shown in the navigation.
+
+    Attributes not defined here are read from the wrapped ``component``.
+    The URL of the component is only reversed once.
+    """
+    def __init__(self, component, index):
+        self.component = component
+        self.index = index
+        self._url = None
+
+    def __getattr__(self, name):
+        return getattr(self.component, name)
+
+    def __repr__(self):
+        return '<%s: %r>' % (self.__class__.__name__, self.component)
+
+    def get_absolute_url(self):
+        if self._url is None:
+            self._url = self.component.get_absolute_url()
+        return self._url
+
+
+class NavigationTree(object):
+    """The ordered dashboards, panel groups and panels of a site.
+
+    ``dashboards`` is a list of ``(dashboard, groups)`` pairs, where
+    ``groups`` is an ordered dictionary of the panels of each panel group.
+    Dashboards and panels are wrapped in :class:`NavigationItem`, whose
+    ``index`` is the bit representing them in the masks returned by
+    :meth:`get_mask`.
+    """
+    def __init__(self, site):
+        self.generation = _registry_generation
+        self.order = site.dashboards
+        self.dashboards = []
+        self.items = []
+        for dashboard in site.get_dashboards():
+            dashboard_item = self._add_item(dashboard)
+            groups = collections.OrderedDict()
+            for group in dashboard.get_panel_groups().values():
+                groups[group] = [self._add_item(panel) for panel in group]
+            self.dashboards.append((dashboard_item, groups))
+        keys = [_get_component_key(item.component) for item in self.items]
+        self.fingerprint = hashlib.md5(
+            ' '.join(keys).encode('utf-8')).hexdigest()
+
+    def _add_item(self, component):
+        item = NavigationItem(component, len(self.items))
+        self.items.append(item)
+        return item
+
+    def is_valid_for(self, site):
+        return (self.generation == _registry_generation and
+                self.order == site.dashboards)
+
+    def get_mask(self, context):
+        """Returns which items the user of the request may see, as bits.
+
+        An item is visible when it is enabled in the navigation, when the
+        user has its permissions and passes its access checks, which are
+        looked up in the access map of the request.
+        """
+        request = context['request']
+        if 'navigation_mask' in request.horizon:
+            return request.horizon['navigation_mask']
+        mask = 0
+        for item in self.items:
+            nav = item.nav(context) if callable(item.nav) else item.nav
+            if (nav and request.user.has_perms(
+                    getattr(item, 'permissions', set())) and
+                    item.can_access(context)):
+                mask |= 1 << item.index
+        request.horizon['navigation_mask'] = mask
+        return mask
+
+    def get_allowed(self, mask, items):
+        return [item for item in items if mask >> item.index & 1]
+
+
 class Workflow(object):
     pass
 
@@ -752,6 +905,57 @@ class Site(Registry, HorizonComponent):
         else:
             return sorted(self._registry.values())
 
+    def get_access_map(self, context):
+        """Returns whether the user may access each component of the site.
+
+        The map is keyed by the dotted path of the class of every dashboard
+        and panel shown in the navigation, and is computed in one pass over
+        the registry. It is kept for the rest of the request, and stored in
+        Django's cache for ``access_cache_timeout`` seconds of
+        ``HORIZON_CONFIG``, so that the navigation of following requests
+        made with the same token does not run the checks again. Maps in
+        which a check failed, see :func:`access_check_failed`, are not
+        stored.
+        """
+        request = context['request']
+        if 'access' in request.horizon:
+            return request.horizon['access']
+        timeout = self._conf['access_cache_timeout']
+        key = _get_access_cache_key(request) if timeout else None
+        access = _get_access_cache().get(key) if key else None
+        if access is None:
+            # Dashboards check their panels while the map is being filled,
+            # so it is made available to can_access() right away.
+            access = request.horizon['access'] = {}
+            request.horizon.pop('access_check_failed', None)
+            try:
+                for dashboard in self.get_dashboards():
+                    for panel in dashboard.get_panels():
+                        if panel.nav:
+                            access[_get_component_key(panel)] = \
+                                panel.allowed(context)
+                    if dashboard.nav:
+                        access[_get_component_key(dashboard)] = \
+                            dashboard.allowed(context)
+            except Exception:
+                del request.horizon['access']
+                raise
+            if key and not request.horizon.pop('access_check_failed', False):
+                _get_access_cache().set(key, access, timeout)
+        request.horizon['access'] = access
+        return access
+
+    def get_navigation_tree(self):
+        """Returns the :class:`NavigationTree` of the site.
+
+        The tree is only built again after dashboards or panels have been
+        registered or unregistered.
+        """
+        tree = getattr(self, '_navigation_tree', None)
+        if tree is None or not tree.is_valid_for(self):
+            tree = self._navigation_tree = NavigationTree(self)
+        return tree
+
     def get_default_dashboard(self):
         """Returns the default :class:`~horizon.Dashboard` instance.
 
@@ -859,6 +1063,9 @@ class Site(Registry, HorizonComponent):
                                     url(r'^%s/' % dash.slug,
                                         include(dash._decorated_urls)))
 
+        # Panel groups may have changed with the panel configuration.
+        _registry_changed()
+
         # Return the three arguments to django.conf.urls.include
         return urlpatterns, self.namespace, self.slug
 
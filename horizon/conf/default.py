@@ -28,6 +28,16 @@ HORIZON_CONFIG = {
     'ajax_queue_limit': 10,
     'ajax_poll_interval': 2500,
 
+    # Concurrent API call settings for views
+    'api_max_workers': 8,
+    'api_call_timeout': None,
+
+    # Seconds the access map of the navigation is cached for, per token
+    'access_cache_timeout': 300,
+
+    # Seconds rendered navigation fragments are cached for
+    'navigation_cache_timeout': 300,
+
     # URL for reporting issue with this site.
     'bug_url': None,
 
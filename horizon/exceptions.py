@@ -200,6 +200,17 @@ class NotAvailable(HorizonException):
     pass
 
 
+class TimedOut(NotAvailable):
+    """Raised when a concurrently executed API call does not finish within
+    its timeout.
+    """
+    def __init__(self, name, timeout):
+        self.name = name
+        self.timeout = timeout
+        message = '%s did not finish within %s seconds.' % (name, timeout)
+        super(TimedOut, self).__init__(message)
+
+
 class WorkflowError(HorizonException):
     """Exception to be raised when something goes wrong in a workflow."""
     pass
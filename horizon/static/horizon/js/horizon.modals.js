@@ -280,6 +280,21 @@ horizon.addInitFunction(horizon.modals.init = function() {
     if (modalFileUpload) {
       ajaxOpts.contentType = false;  // tell jQuery not to process the data
       ajaxOpts.processData = false;  // tell jQuery not to set contentType
+      ajaxOpts.xhr = function () {
+        // Large files are stored while they are being sent, so the upload
+        // progress is reported in the spinner.
+        var xhr = $.ajaxSettings.xhr();
+        if (xhr.upload) {
+          xhr.upload.addEventListener('progress', function (evt) {
+            if (evt.lengthComputable && horizon.modals.spinner) {
+              horizon.modals.spinner.find(".modal-body p").text(
+                interpolate(gettext("Uploading %s%%"),
+                            [Math.floor(evt.loaded * 100 / evt.total)]));
+            }
+          }, false);
+        }
+        return xhr;
+      };
     }
     $.ajax(ajaxOpts);
   });
@@ -72,6 +72,8 @@ horizon.network_topology = {
   network_index: {},
   balloonID:null,
   reload_duration: 10000,
+  topology: null,
+  etag: null,
   network_height : 0,
   previous_message : null,
   deleting_device : null,
@@ -165,24 +167,65 @@ horizon.network_topology = {
     if (angular.element('#networktopology').length === 0) {
       return;
     }
-    angular.element.getJSON(
-      angular.element('#networktopology').data('networktopology') + '?' + angular.element.now(),
-      function(data) {
-        self.data_loaded = true;
-        self.load_topology(data);
-        if (force_start) {
-          var i = 0;
-          self.force.start();
-          while (i <= 100) {
-            self.force.tick();
-            i++;
+    var url = angular.element('#networktopology').data('networktopology') + '?' + angular.element.now();
+    var headers = {};
+    // Only ask for what changed since the topology that was last loaded.
+    if (self.etag) {
+      url += '&since=' + encodeURIComponent(self.etag);
+      headers['If-None-Match'] = self.etag;
+    }
+    angular.element.ajax({
+      url: url,
+      dataType: 'json',
+      headers: headers,
+      success: function(data, status, xhr) {
+        if (xhr.status !== 304) {
+          if (data.changes) {
+            data = self.apply_changes(data.changes);
+          }
+          self.topology = data;
+          self.etag = xhr.getResponseHeader('ETag');
+          self.data_loaded = true;
+          self.load_topology(data);
+          if (force_start) {
+            var i = 0;
+            self.force.start();
+            while (i <= 100) {
+              self.force.tick();
+              i++;
+            }
           }
         }
         setTimeout(function() {
           self.retrieve_network_info();
         }, self.reload_duration);
       }
-    );
+    });
+  },
+
+  // Apply the nodes added, changed and removed since the last loaded
+  // topology, and return the resulting topology.
+  apply_changes: function(changes) {
+    var self = this;
+    var topology = {};
+    angular.forEach(changes, function(change, kind) {
+      var key = function(node) {
+        return kind == 'ports' ? node.id + node.device_id : node.id;
+      };
+      var updated = {};
+      angular.forEach(change.changed, function(node) {
+        updated[key(node)] = node;
+      });
+      topology[kind] = [];
+      angular.forEach(self.topology[kind], function(node) {
+        var nodeKey = key(node);
+        if (change.removed.indexOf(nodeKey) === -1) {
+          topology[kind].push(updated[nodeKey] || node);
+        }
+      });
+      topology[kind] = topology[kind].concat(change.added);
+    });
+    return topology;
   },
 
   // Load config from cookie
@@ -21,105 +21,173 @@ horizon.datatables = {
         $table.removeAttr('decay_constant');
         return;
       }
-      // Trigger the update handlers.
+      var requests = [],
+        batches = {};
+
+      // Rows of tables which support batched updates are polled with one
+      // request per table, the others with one request per row.
       $rows_to_update.each(function() {
         var $row = $(this),
-          $table = $row.closest('table.datatable');
-        horizon.ajax.queue({
-          url: $row.attr('data-update-url'),
-          error: function (jqXHR) {
-            switch (jqXHR.status) {
-              // A 404 indicates the object is gone, and should be removed from the table
-              case 404:
-                // Update the footer count and reset to default empty row if needed
-                var row_count, colspan, template, params;
-
-                // existing count minus one for the row we're removing
-                row_count = horizon.datatables.update_footer_count($table, -1);
-
-                if(row_count === 0) {
-                  colspan = $table.find('th[colspan]').attr('colspan');
-                  template = horizon.templates.compiled_templates["#empty_row_template"];
-                  params = {
-                      "colspan": colspan,
-                      no_items_label: gettext("No items to display.")
-                  };
-                  var empty_row = template.render(params);
-                  $row.replaceWith(empty_row);
-                } else {
-                  $row.remove();
-                }
-                // Reset tablesorter's data cache.
-                $table.trigger("update");
-                // Enable launch action if quota is not exceeded
-                horizon.datatables.update_actions();
-                break;
-              default:
-                console.log(gettext("An error occurred while updating."));
-                $row.removeClass("ajax-update");
-                $row.find("i.ajax-updating").remove();
-                break;
-            }
-          },
-          success: function (data) {
-            var $new_row = $(data);
-
-            if ($new_row.hasClass('status_unknown')) {
-              var spinner_elm = $new_row.find("td.status_unknown:last");
-              var imagePath = $new_row.find('.btn-action-required').length > 0 ?
-                "dashboard/img/action_required.png":
-                "dashboard/img/loading.gif";
-
-              imagePath = window.STATIC_URL + imagePath;
-              spinner_elm.prepend(
-                $("<div>")
-                  .addClass("loading_gif")
-                  .append($("<img>").attr("src", imagePath)));
-            }
+          $row_table = $row.closest('table.datatable'),
+          batch_url = $row_table.attr('data-batch-update-url'),
+          table_id = $row_table.attr('id');
+        if (batch_url) {
+          if (!batches.hasOwnProperty(table_id)) {
+            batches[table_id] = {$table: $row_table, rows: []};
+          }
+          batches[table_id].rows.push($row);
+        } else {
+          requests.push(horizon.datatables.row_update_request($row_table, $row));
+        }
+      });
+      $.each(batches, function(table_id, batch) {
+        var size = horizon.datatables.batch_update_size;
+        for (var i = 0; i < batch.rows.length; i += size) {
+          requests.push(horizon.datatables.rows_update_request(
+            batch.$table, batch.rows.slice(i, i + size)));
+        }
+      });
 
-            // Only replace row if the html content has changed
-            if($new_row.html() !== $row.html()) {
-              if($row.find('.table-row-multi-select:checkbox').is(':checked')) {
-                // Preserve the checkbox if it's already clicked
-                $new_row.find('.table-row-multi-select:checkbox').prop('checked', true);
-              }
-              $row.replaceWith($new_row);
-              // Reset tablesorter's data cache.
-              $table.trigger("update");
-              // Reset decay constant.
-              $table.removeAttr('decay_constant');
-              // Check that quicksearch is enabled for this table
-              // Reset quicksearch's data cache.
-              if ($table.attr('id') in horizon.datatables.qs) {
-                horizon.datatables.qs[$table.attr('id')].cache();
-              }
-            }
-          },
-          complete: function () {
-            // Revalidate the button check for the updated table
-            horizon.datatables.validate_button();
-            rows_to_update--;
-            // Schedule next poll when all the rows are updated
-            if ( rows_to_update === 0 ) {
-              // Set interval decay to this table, and increase if it already exist
-              if(decay_constant === undefined) {
-                decay_constant = 1;
-              } else {
-                decay_constant++;
-              }
-              $table.attr('decay_constant', decay_constant);
-              // Poll until there are no rows in an "unknown" state on the page.
-              var next_poll = interval * decay_constant;
-              // Limit the interval to 30 secs
-              if(next_poll > 30 * 1000) { next_poll = 30 * 1000; }
-              setTimeout(horizon.datatables.update, next_poll);
+      var requests_pending = requests.length;
+      // Trigger the update handlers.
+      $.each(requests, function(index, request) {
+        request.complete = function () {
+          // Revalidate the button check for the updated table
+          horizon.datatables.validate_button();
+          requests_pending--;
+          // Schedule next poll when all the rows are updated
+          if ( requests_pending === 0 ) {
+            // Set interval decay to this table, and increase if it already exist
+            if(decay_constant === undefined) {
+              decay_constant = 1;
+            } else {
+              decay_constant++;
             }
+            $table.attr('decay_constant', decay_constant);
+            // Poll until there are no rows in an "unknown" state on the page.
+            var next_poll = interval * decay_constant;
+            // Limit the interval to 30 secs
+            if(next_poll > 30 * 1000) { next_poll = 30 * 1000; }
+            setTimeout(horizon.datatables.update, next_poll);
           }
-        });
+        };
+        horizon.ajax.queue(request);
       });
     }
   },
 
+  // Maximum number of rows polled with a single batched update request.
+  batch_update_size: 50,
+
+  row_update_request: function ($table, $row) {
+    return {
+      url: $row.attr('data-update-url'),
+      error: function (jqXHR) {
+        horizon.datatables.row_update_failed($table, $row, jqXHR.status);
+      },
+      success: function (data) {
+        horizon.datatables.replace_row($table, $row, data);
+      }
+    };
+  },
+
+  rows_update_request: function ($table, rows) {
+    var obj_ids = $.map(rows, function ($row) {
+      return $row.attr('data-object-id');
+    });
+    return {
+      url: $table.attr('data-batch-update-url'),
+      data: {obj_ids: obj_ids},
+      traditional: true,
+      dataType: 'json',
+      error: function () {
+        // Go back to updating the rows of this table one by one.
+        $table.removeAttr('data-batch-update-url');
+      },
+      success: function (data) {
+        $.each(rows, function (index, $row) {
+          var obj_id = $row.attr('data-object-id');
+          if (data.rows.hasOwnProperty(obj_id)) {
+            horizon.datatables.replace_row($table, $row, data.rows[obj_id]);
+          } else {
+            horizon.datatables.row_update_failed($table, $row,
+                                                 data.errors[obj_id]);
+          }
+        });
+      }
+    };
+  },
+
+  row_update_failed: function ($table, $row, status) {
+    switch (status) {
+      // A 404 indicates the object is gone, and should be removed from the table
+      case 404:
+        // Update the footer count and reset to default empty row if needed
+        var row_count, colspan, template, params;
+
+        // existing count minus one for the row we're removing
+        row_count = horizon.datatables.update_footer_count($table, -1);
+
+        if(row_count === 0) {
+          colspan = $table.find('th[colspan]').attr('colspan');
+          template = horizon.templates.compiled_templates["#empty_row_template"];
+          params = {
+              "colspan": colspan,
+              no_items_label: gettext("No items to display.")
+          };
+          var empty_row = template.render(params);
+          $row.replaceWith(empty_row);
+        } else {
+          $row.remove();
+        }
+        // Reset tablesorter's data cache.
+        $table.trigger("update");
+        // Enable launch action if quota is not exceeded
+        horizon.datatables.update_actions();
+        break;
+      default:
+        console.log(gettext("An error occurred while updating."));
+        $row.removeClass("ajax-update");
+        $row.find("i.ajax-updating").remove();
+        break;
+    }
+  },
+
+  replace_row: function ($table, $row, data) {
+    var $new_row = $(data);
+
+    if ($new_row.hasClass('status_unknown')) {
+      var spinner_elm = $new_row.find("td.status_unknown:last");
+      var imagePath = $new_row.find('.btn-action-required').length > 0 ?
+        "dashboard/img/action_required.png":
+        "dashboard/img/loading.gif";
+
+      imagePath = window.STATIC_URL + imagePath;
+      spinner_elm.prepend(
+        $("<div>")
+          .addClass("loading_gif")
+          .append($("<img>").attr("src", imagePath)));
+    }
+
+    // Only replace row if the html content has changed
+    if($new_row.html() !== $row.html()) {
+      if($row.find('.table-row-multi-select:checkbox').is(':checked')) {
+        // Preserve the checkbox if it's already clicked
+        $new_row.find('.table-row-multi-select:checkbox').prop('checked', true);
+      }
+      $row.replaceWith($new_row);
+      // Reset tablesorter's data cache.
+      $table.trigger("update");
+      // Reset decay constant.
+      $table.removeAttr('decay_constant');
+      // Check that quicksearch is enabled for this table
+      // Reset quicksearch's data cache.
+      if ($table.attr('id') in horizon.datatables.qs) {
+        horizon.datatables.qs[$table.attr('id')].cache();
+      }
+    }
+  },
+
   update_actions: function() {
     var $actions_to_update = $('.btn-launch.ajax-update, .btn-create.ajax-update');
     $actions_to_update.each(function() {
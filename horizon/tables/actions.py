@@ -30,6 +30,7 @@ from django.utils.translation import ungettext_lazy
 import six
 
 from horizon import messages
+from horizon.utils import concurrency
 from horizon.utils import functions
 from horizon.utils import html
 
@@ -135,6 +136,20 @@ class BaseAction(html.HTMLElement):
                     self.allowed(request, datum))
         return self.allowed(request, datum)
 
+    def bind_to_row(self, datum):
+        """Returns a copy of this action to render for one row of data.
+
+        Row actions are customized per row by ``allowed`` and ``update``,
+        so each row needs its own instance. This is a cheaper shallow copy
+        than :func:`copy.copy`, with a copy of ``attrs`` since actions
+        commonly change it per row.
+        """
+        bound_action = object.__new__(self.__class__)
+        bound_action.__dict__.update(self.__dict__)
+        bound_action.attrs = dict(self.attrs)
+        bound_action.datum = datum
+        return bound_action
+
     def update(self, request, datum):
         """Allows per-action customization based on current conditions.
 
@@ -395,7 +410,7 @@ class LinkAction(BaseAction):
         try:
             if datum:
                 obj_id = self.table.get_object_id(datum)
-                return urlresolvers.reverse(self.url, args=(obj_id,))
+                return self.table.reverse_object_url(self.url, obj_id)
             else:
                 return urlresolvers.reverse(self.url)
         except urlresolvers.NoReverseMatch as ex:
@@ -649,9 +664,18 @@ class BatchAction(Action):
 
        Optional message for providing an appropriate help text for
        the horizon user.
+
+    .. attribute:: concurrency
+
+       Optional maximum number of selected objects the :meth:`action` is
+       executed for at the same time, in separate threads. Defaults to
+       ``1``, which handles the objects one after another. Only raise it
+       for actions which don't rely on state stored on the action, e.g. by
+       ``allowed``, as all objects are checked before any is acted upon.
     """
 
     help_text = _("This action cannot be undone.")
+    concurrency = 1
 
     def __init__(self, **kwargs):
         super(BatchAction, self).__init__(**kwargs)
@@ -713,6 +737,7 @@ class BatchAction(Action):
         self.success_ids = []
 
         self.help_text = kwargs.get('help_text', self.help_text)
+        self.concurrency = kwargs.get('concurrency', self.concurrency)
 
     def _allowed(self, request, datum=None):
         # Override the default internal action method to prevent batch
@@ -807,23 +832,18 @@ class BatchAction(Action):
         action_success = []
         action_failure = []
         action_not_allowed = []
-        for datum_id in obj_ids:
-            datum = table.get_object_by_id(datum_id)
-            datum_display = table.get_object_display(datum) or datum_id
-            if not table._filter_action(self, request, datum):
-                action_not_allowed.append(datum_display)
-                LOG.warning(u'Permission denied to %s: "%s"' %
-                            (self._get_action_name(past=True).lower(),
-                             datum_display))
-                continue
+        pending = []
+
+        def record_result(datum_id, datum, datum_display, task):
             try:
-                self.action(request, datum_id)
+                task.get()
                 # Call update to invoke changes if needed
                 self.update(request, datum)
                 action_success.append(datum_display)
                 self.success_ids.append(datum_id)
-                LOG.info(u'%s: "%s"' %
-                         (self._get_action_name(past=True), datum_display))
+                LOG.info(u'%s: "%s" (%.3fs)' %
+                         (self._get_action_name(past=True), datum_display,
+                          task.elapsed or 0))
             except Exception as ex:
                 # Handle the exception but silence it since we'll display
                 # an aggregate error message later. Otherwise we'd get
@@ -832,8 +852,33 @@ class BatchAction(Action):
                 action_description = (
                     self._get_action_name(past=True).lower(), datum_display)
                 LOG.warning(
-                    'Action %(action)s Failed for %(reason)s', {
-                        'action': action_description, 'reason': ex})
+                    'Action %(action)s Failed for %(reason)s (%(time).3fs)', {
+                        'action': action_description, 'reason': ex,
+                        'time': task.elapsed or 0})
+
+        for datum_id in obj_ids:
+            datum = table.get_object_by_id(datum_id)
+            datum_display = table.get_object_display(datum) or datum_id
+            if not table._filter_action(self, request, datum):
+                action_not_allowed.append(datum_display)
+                LOG.warning(u'Permission denied to %s: "%s"' %
+                            (self._get_action_name(past=True).lower(),
+                             datum_display))
+                continue
+            task = concurrency.Task(self.action, args=(request, datum_id),
+                                    name=u'%s %s' % (self.name, datum_id))
+            if self.concurrency > 1:
+                pending.append((datum_id, datum, datum_display, task))
+            else:
+                # Actions may depend on state set by allowed() for the same
+                # object, so run them right after their check.
+                task.run()
+                record_result(datum_id, datum, datum_display, task)
+
+        concurrency.execute([item[-1] for item in pending],
+                            max_workers=self.concurrency)
+        for datum_id, datum, datum_display, task in pending:
+            record_result(datum_id, datum, datum_display, task)
 
         # Begin with success message class, downgrade to info if problems.
         success_message_level = messages.success
@@ -17,6 +17,8 @@ import copy
 import json
 import logging
 from operator import attrgetter
+import re
+import string
 import sys
 
 from django.core import exceptions as core_exceptions
@@ -24,10 +26,14 @@ from django.core import urlresolvers
 from django import forms
 from django.http import HttpResponse  # noqa
 from django import template
+from django.template.base import render_value_in_context
 from django.template.defaultfilters import slugify  # noqa
 from django.template.defaultfilters import truncatechars  # noqa
+from django.template.loader import get_template
 from django.template.loader import render_to_string
+from django.utils.encoding import force_text
 from django.utils.html import escape
+from django.utils.html import strip_spaces_between_tags
 from django.utils import http
 from django.utils.http import urlencode
 from django.utils.safestring import mark_safe
@@ -46,6 +52,14 @@ from horizon.utils import html
 LOG = logging.getLogger(__name__)
 PALETTE = termcolors.PALETTES[termcolors.DEFAULT_PALETTE]
 STRING_SEPARATOR = "__"
+# Stands in for the object id in URLs which are reversed once per table. It
+# only contains characters accepted by the usual object id URL patterns.
+OBJECT_ID_PLACEHOLDER = "horizonobjectid0"
+# Object ids which can be substituted in such URLs without any quoting.
+SAFE_OBJECT_ID_RE = re.compile(r'^[A-Za-z0-9_-]+$')
+# Ids the URL patterns must also accept for the placeholder to be replaced,
+# i.e. any safe id of a single or of many characters.
+OBJECT_ID_PROBES = ("0", string.ascii_letters + string.digits + "_-" * 16)
 
 
 @six.python_2_unicode_compatible
@@ -526,10 +540,26 @@ class Row(html.HTMLElement):
         updates of cell. Generally you won't need to change this value.
         It is also used for inline edit of the cell.
         Default: ``"cell_update"``.
+
+    .. attribute:: ajax_batch
+
+        Boolean value to determine whether the rows of a table which are
+        waiting for an AJAX update are polled together, with one request
+        per table, instead of with one request per row. Subclasses may
+        implement :meth:`~horizon.tables.Row.get_data_batch` to fetch all
+        of them with a single API call. Default: ``False``.
+
+    .. attribute:: ajax_batch_action_name
+
+        String that is used for the query parameter key to request batched
+        AJAX updates of rows. Generally you won't need to change this value.
+        Default: ``"rows_update"``.
     """
     ajax = False
     ajax_action_name = "row_update"
     ajax_cell_action_name = "cell_update"
+    ajax_batch = False
+    ajax_batch_action_name = "rows_update"
 
     def __init__(self, table, datum=None):
         super(Row, self).__init__()
@@ -611,6 +641,9 @@ class Row(html.HTMLElement):
             return ''
 
     def render(self):
+        renderer = self.table._row_renderer
+        if renderer is not None:
+            return renderer.render(self)
         return render_to_string("horizon/common/_data_table_row.html",
                                 {"row": self})
 
@@ -639,6 +672,19 @@ class Row(html.HTMLElement):
         """
         return {}
 
+    def get_data_batch(self, request, obj_ids):
+        """Fetches the updated data for several rows at once.
+
+        Returns a dictionary mapping object ids to data objects. An object
+        which couldn't be retrieved may instead be mapped to the exception
+        raised while fetching it, which is then handled as if raised by
+        :meth:`~horizon.tables.Row.get_data`. Objects which are not included
+        in it are fetched one by one with ``get_data``, so subclasses only
+        need to override this when the API offers a cheaper way to retrieve
+        many objects, e.g. a single filtered list call.
+        """
+        return {}
+
 
 class Cell(html.HTMLElement):
     """Represents a single cell in the table."""
@@ -840,6 +886,49 @@ class Cell(html.HTMLElement):
                                 {"cell": self})
 
 
+class RowRenderer(object):
+    """Renders rows without going through the Django template engine.
+
+    The output is the same HTML as the one of the
+    ``horizon/common/_data_table_row.html`` and
+    ``horizon/common/_data_table_cell.html`` templates, but for large tables
+    it is produced several times faster. A renderer is compiled once per
+    table class, from its columns, when the table's
+    :attr:`~horizon.tables.DataTableOptions.row_renderer` option is set.
+
+    Cells of columns with an inline edit action are still rendered with the
+    cell template.
+    """
+    cell_template = "horizon/common/_data_table_cell.html"
+
+    def __init__(self, columns):
+        self.template_columns = set(name for name, column in columns.items()
+                                    if column.update_action is not None)
+        # Values are rendered with the defaults of a template context,
+        # i.e. localized and autoescaped.
+        self.context = template.Context()
+        self._cell_template = None
+
+    def render(self, row):
+        cells = [self.render_cell(name, cell)
+                 for name, cell in row.cells.items()]
+        # Same as the {% spaceless %} block of the row template.
+        cells = strip_spaces_between_tags(u''.join(cells).strip())
+        return mark_safe(u'<tr%s>\n    %s\n</tr>\n' % (
+            force_text(row.attr_string), cells))
+
+    def render_cell(self, name, cell):
+        if name in self.template_columns or cell.inline_edit_mod:
+            if self._cell_template is None:
+                self._cell_template = get_template(self.cell_template)
+            return self._cell_template.render({"cell": cell})
+        value = render_value_in_context(cell.value, self.context)
+        if cell.wrap_list:
+            value = u'<ul>%s</ul>' % value
+        return u'<td%s>\n            %s\n        </td>' % (
+            force_text(cell.attr_string), value)
+
+
 class DataTableOptions(object):
     """Contains options for :class:`.DataTable` objects.
 
@@ -944,6 +1033,15 @@ class DataTableOptions(object):
         The class which should be used for handling the columns of this table.
         Optional. Default: :class:`~horizon.tables.Column`.
 
+    .. attribute:: row_renderer
+
+        The class which should be used for rendering the rows of this table
+        without the row and cell templates, such as
+        :class:`~horizon.tables.RowRenderer`. This is worth setting for
+        tables which usually display hundreds of rows and don't customize
+        those templates. Optional. Default: ``None``, the rows are rendered
+        with the templates.
+
     .. attribute:: css_classes
 
         A custom CSS class or classes to add to the ``<table>`` tag of the
@@ -994,6 +1092,7 @@ class DataTableOptions(object):
         self.cell_class = getattr(options, 'cell_class', Cell)
         self.row_class = getattr(options, 'row_class', Row)
         self.column_class = getattr(options, 'column_class', Column)
+        self.row_renderer = getattr(options, 'row_renderer', None)
         self.css_classes = getattr(options, 'css_classes', '')
         self.prev_pagination_param = getattr(options,
                                              'prev_pagination_param',
@@ -1122,6 +1221,10 @@ class DataTableMetaclass(type):
             columns.append(("actions", actions_column))
         # Store this set of columns internally so we can copy them per-instance
         dt_attrs['_columns'] = collections.OrderedDict(columns)
+        # Compile the row renderer once for the whole class
+        dt_attrs['_row_renderer'] = None
+        if opts.row_renderer:
+            dt_attrs['_row_renderer'] = opts.row_renderer(dt_attrs['_columns'])
 
         # Gather and register actions for later access since we only want
         # to instantiate them once.
@@ -1176,6 +1279,7 @@ class DataTable(object):
         self.breadcrumb = None
         self.current_item_id = None
         self.permissions = self._meta.permissions
+        self._object_url_templates = {}
 
         # Create a new set
         columns = []
@@ -1325,6 +1429,41 @@ class DataTable(object):
         """Returns the message to be displayed when there is no data."""
         return self._no_data_message
 
+    @property
+    def data(self):
+        return self._data
+
+    @data.setter
+    def data(self, data):
+        self._data = data
+        # The lookup index is rebuilt from the new data when needed.
+        self._object_index = None
+
+    @staticmethod
+    def _get_lookup_key(obj_id):
+        if not isinstance(obj_id, six.text_type):
+            obj_id = str(obj_id)
+            if six.PY2:
+                obj_id = obj_id.decode('utf-8')
+        return obj_id
+
+    def _get_object_index(self):
+        """Returns a dictionary mapping object ids to lists of data objects.
+
+        The index is built lazily and kept until ``data`` is assigned again,
+        so that repeated lookups, e.g. when a batch action is applied to
+        many selected rows, don't scan the whole dataset. Code which adds,
+        removes or replaces objects of ``data`` in place has to assign it
+        again for them to be found.
+        """
+        if self._object_index is None:
+            index = {}
+            for datum in self.data or []:
+                key = self._get_lookup_key(self.get_object_id(datum))
+                index.setdefault(key, []).append(datum)
+            self._object_index = index
+        return self._object_index
+
     def get_object_by_id(self, lookup):
         """Returns the data object from the table's dataset which matches
         the ``lookup`` parameter specified. An error will be raised if
@@ -1335,19 +1474,8 @@ class DataTable(object):
 
         Uses :meth:`~horizon.tables.DataTable.get_object_id` internally.
         """
-        if not isinstance(lookup, six.text_type):
-            lookup = str(lookup)
-            if six.PY2:
-                lookup = lookup.decode('utf-8')
-        matches = []
-        for datum in self.data:
-            obj_id = self.get_object_id(datum)
-            if not isinstance(obj_id, six.text_type):
-                obj_id = str(obj_id)
-                if six.PY2:
-                    obj_id = obj_id.decode('utf-8')
-            if obj_id == lookup:
-                matches.append(datum)
+        lookup = self._get_lookup_key(lookup)
+        matches = self._get_object_index().get(lookup, [])
         if len(matches) > 1:
             raise ValueError("Multiple matches were returned for that id: %s."
                              % matches)
@@ -1393,9 +1521,7 @@ class DataTable(object):
         bound_actions = []
         for action in self._meta.row_actions:
             # Copy to allow modifying properties per row
-            bound_action = copy.copy(self.base_actions[action.name])
-            bound_action.attrs = copy.copy(bound_action.attrs)
-            bound_action.datum = datum
+            bound_action = self.base_actions[action.name].bind_to_row(datum)
             # Remove disallowed actions.
             if not self._filter_action(bound_action,
                                        self.request,
@@ -1409,6 +1535,34 @@ class DataTable(object):
             bound_actions.append(bound_action)
         return bound_actions
 
+    def reverse_object_url(self, viewname, obj_id):
+        """Reverses the URL named ``viewname`` for the object ``obj_id``.
+
+        This is equivalent to ``reverse(viewname, args=(obj_id,))``, except
+        that the URL is reversed only once per table; for every row the
+        object id is then substituted in it. Object ids containing other
+        characters than letters, digits, ``-`` and ``_`` are still reversed
+        one by one, as are all the ids of URL patterns which don't accept
+        any such id, e.g. which only accept digits.
+        """
+        url_template = self._object_url_templates.get(viewname, False)
+        if url_template is False:
+            try:
+                url_template = urlresolvers.reverse(
+                    viewname, args=(OBJECT_ID_PLACEHOLDER,))
+                for probe in OBJECT_ID_PROBES:
+                    urlresolvers.reverse(viewname, args=(probe,))
+            except urlresolvers.NoReverseMatch:
+                url_template = None
+            if url_template and \
+                    url_template.count(OBJECT_ID_PLACEHOLDER) != 1:
+                url_template = None
+            self._object_url_templates[viewname] = url_template
+        obj_id = six.text_type(obj_id)
+        if url_template is None or not SAFE_OBJECT_ID_RE.match(obj_id):
+            return urlresolvers.reverse(viewname, args=(obj_id,))
+        return url_template.replace(OBJECT_ID_PLACEHOLDER, obj_id)
+
     def set_multiselect_column_visibility(self, visible=True):
         """hide checkbox column if no current table action is allowed."""
         if not self.multi_select:
@@ -1539,21 +1693,17 @@ class DataTable(object):
             new_row = self._meta.row_class(self)
 
             if new_row.ajax and new_row.ajax_action_name == action_name:
-                try:
-                    datum = new_row.get_data(request, obj_id)
-                    if self.get_object_id(datum) == self.current_item_id:
-                        self.selected = True
-                        new_row.classes.append('current_selected')
-                    new_row.load_cells(datum)
-                    error = False
-                except Exception:
-                    datum = None
-                    error = exceptions.handle(request, ignore=True)
+                error = self._load_updated_row(request, new_row, obj_id)
                 if request.is_ajax():
                     if not error:
                         return HttpResponse(new_row.render())
                     else:
                         return HttpResponse(status=error.status_code)
+            elif (new_row.ajax and new_row.ajax_batch and
+                    new_row.ajax_batch_action_name == action_name):
+                if request.is_ajax():
+                    obj_ids = request.GET.getlist("obj_ids")
+                    return self.batch_row_update_handle(request, obj_ids)
             elif new_row.ajax_cell_action_name == action_name:
                 # inline edit of the cell actions
                 return self.inline_edit_handle(request, table_name,
@@ -1570,6 +1720,75 @@ class DataTable(object):
                             return handled
         return None
 
+    def _load_updated_row(self, request, new_row, obj_id, datum=None):
+        """Loads the cells of a row for an AJAX update.
+
+        The data object is fetched with the row's ``get_data`` unless it is
+        given, either as is or as the exception raised while fetching it.
+        Returns the value of :func:`horizon.exceptions.handle` if it
+        couldn't be retrieved, ``False`` otherwise.
+        """
+        try:
+            if datum is None:
+                datum = new_row.get_data(request, obj_id)
+            elif isinstance(datum, Exception):
+                raise datum
+            if self.get_object_id(datum) == self.current_item_id:
+                self.selected = True
+                new_row.classes.append('current_selected')
+            new_row.load_cells(datum)
+        except Exception:
+            return exceptions.handle(request, ignore=True)
+        return False
+
+    def batch_row_update_handle(self, request, obj_ids):
+        """Renders the AJAX updates of several rows in a single response.
+
+        The rows are fetched together with the row class's
+        ``get_data_batch``; objects it neither returns nor reports as
+        failed are fetched one by one exactly like single row updates. The
+        response is a JSON object
+        holding the rendered ``rows`` and, under ``errors``, the HTTP status
+        code of each row which couldn't be updated, both keyed by object id.
+        """
+        obj_ids = list(collections.OrderedDict.fromkeys(
+            self._get_lookup_key(obj_id) for obj_id in obj_ids))
+        try:
+            data = self._meta.row_class(self).get_data_batch(request,
+                                                             obj_ids)
+        except Exception:
+            # Fall back to fetching each row on its own.
+            exceptions.handle(request, ignore=True)
+            data = {}
+        data = dict((self._get_lookup_key(obj_id), datum)
+                    for obj_id, datum in (data or {}).items())
+
+        rows = {}
+        errors = {}
+        for obj_id in obj_ids:
+            new_row = self._meta.row_class(self)
+            error = self._load_updated_row(request, new_row, obj_id,
+                                           data.get(obj_id))
+            if error:
+                errors[obj_id] = error.status_code
+            else:
+                rows[obj_id] = new_row.render()
+        return HttpResponse(json.dumps({"rows": rows, "errors": errors}),
+                            content_type="application/json")
+
+    def get_ajax_batch_update_url(self):
+        """Returns the URL used to poll for batched row updates, or ``None``
+        if the table's rows are updated one by one.
+        """
+        row_class = self._meta.row_class
+        if not (row_class.ajax and row_class.ajax_batch):
+            return None
+        params = urlencode(collections.OrderedDict([
+            ("action", row_class.ajax_batch_action_name),
+            ("table", self.name)
+        ]))
+        return "%s?%s" % (self.get_absolute_url(), params)
+
     def inline_edit_handle(self, request, table_name, action_name, obj_id,
                            new_row):
         """Inline edit handler.
@@ -1786,10 +2005,14 @@ class DataTable(object):
     def get_rows(self):
         """Return the row data for this table broken out by columns."""
         rows = []
+        current_items = []
+        if self.current_item_id is not None:
+            current_items = self._get_object_index().get(
+                self._get_lookup_key(self.current_item_id), [])
         try:
             for datum in self.filtered_data:
                 row = self._meta.row_class(self, datum)
-                if self.get_object_id(datum) == self.current_item_id:
+                if any(datum is item for item in current_items):
                     self.selected = True
                     row.classes.append('current_selected')
                 rows.append(row)
@@ -13,17 +13,26 @@
 #    under the License.
 
 from collections import defaultdict
+from collections import OrderedDict
+import itertools
 
 from django import shortcuts
 
+from horizon.utils import concurrency
 from horizon import views
 
 from horizon.templatetags.horizon import has_permissions  # noqa
 
 
 class MultiTableMixin(object):
-    """A generic mixin which provides methods for handling DataTables."""
+    """A generic mixin which provides methods for handling DataTables.
+
+    Set ``concurrent_data_loading`` to ``True`` when the
+    ``get_{{ table_name }}_data`` methods of a view are independent of each
+    other; they are then run concurrently instead of one after another.
+    """
     data_method_pattern = "get_%s_data"
+    concurrent_data_loading = False
 
     def __init__(self, *args, **kwargs):
         super(MultiTableMixin, self).__init__(*args, **kwargs)
@@ -36,6 +45,9 @@ class MultiTableMixin(object):
 
     def _get_data_dict(self):
         if not self._data:
+            if self.concurrent_data_loading:
+                self._load_data_concurrently()
+                return self._data
             for table in self.table_classes:
                 data = []
                 name = table._meta.name
@@ -45,6 +57,20 @@ class MultiTableMixin(object):
                 self._data[name] = data
         return self._data
 
+    def _load_data_concurrently(self):
+        tasks = OrderedDict()
+        for table in self.table_classes:
+            name = table._meta.name
+            tasks[name] = [concurrency.Task(func) for func
+                           in self._data_methods.get(name, [])]
+        concurrency.execute(itertools.chain(*tasks.values()))
+        for name, table_tasks in tasks.items():
+            data = []
+            for task in table_tasks:
+                # Re-raises any exception of the data method in this thread.
+                data.extend(task.get())
+            self._data[name] = data
+
     def get_data_methods(self, table_classes, methods):
         for table in table_classes:
             name = table._meta.name
@@ -15,12 +15,18 @@
 from __future__ import absolute_import
 
 from collections import OrderedDict
+import hashlib
+
 from horizon.contrib import bootstrap_datepicker
 
 from django.conf import settings
+from django.core.cache import cache
+from django.core import urlresolvers
 from django import template
+from django.template import loader
 from django.template import Node
 from django.utils.encoding import force_text
+from django.utils.safestring import mark_safe
 from django.utils import translation
 from django.utils.translation import ugettext_lazy as _
 
@@ -55,91 +61,118 @@ def has_permissions_on_list(components, user):
             in components if has_permissions(user, component)]
 
 
-@register.inclusion_tag('horizon/_sidebar.html', takes_context=True)
+def _render_navigation(template_name, nav_context, *key_parts):
+    """Renders a navigation template, caching the result.
+
+    Rendered fragments are shared by all the requests for which the
+    navigation is the same, as described by ``key_parts``: which items
+    the user may see and which are active. The language and the script
+    prefix are part of the key as well.
+    """
+    timeout = conf.HORIZON_CONFIG['navigation_cache_timeout']
+    key = None
+    if timeout:
+        key_parts += (template_name, translation.get_language(),
+                      urlresolvers.get_script_prefix())
+        key = 'horizon:navigation:%s' % hashlib.md5(
+            repr(key_parts).encode('utf-8')).hexdigest()
+        html = cache.get(key)
+        if html is not None:
+            return mark_safe(html)
+    html = loader.render_to_string(template_name, nav_context)
+    if key:
+        cache.set(key, html, timeout)
+    return mark_safe(html)
+
+
+@register.simple_tag(takes_context=True)
 def horizon_nav(context):
     if 'request' not in context:
-        return {}
-    current_dashboard = context['request'].horizon.get('dashboard', None)
+        return ''
+    request = context['request']
+    Horizon.get_access_map(context)
+    tree = Horizon.get_navigation_tree()
+    mask = tree.get_mask(context)
+    current_dashboard = request.horizon.get('dashboard', None)
     current_panel_group = None
-    current_panel = context['request'].horizon.get('panel', None)
+    current_panel = request.horizon.get('panel', None)
     dashboards = []
-    for dash in Horizon.get_dashboards():
-        panel_groups = dash.get_panel_groups()
+    for dash, panel_groups in tree.dashboards:
         non_empty_groups = []
-        for group in panel_groups.values():
-            allowed_panels = []
-            for panel in group:
-                if (callable(panel.nav) and panel.nav(context) and
-                        panel.can_access(context)):
-                    allowed_panels.append(panel)
-                elif (not callable(panel.nav) and panel.nav and
-                        panel.can_access(context)):
-                    allowed_panels.append(panel)
-                if panel == current_panel:
-                    current_panel_group = group.slug
+        for group, panels in panel_groups.items():
+            allowed_panels = tree.get_allowed(mask, panels)
+            if any(panel.component == current_panel for panel in panels):
+                current_panel_group = group.slug
             if allowed_panels:
                 non_empty_groups.append((group, allowed_panels))
-        if (callable(dash.nav) and dash.nav(context) and
-                dash.can_access(context)):
-            dashboards.append((dash, OrderedDict(non_empty_groups)))
-        elif (not callable(dash.nav) and dash.nav and
-                dash.can_access(context)):
+        if tree.get_allowed(mask, [dash]):
             dashboards.append((dash, OrderedDict(non_empty_groups)))
-    return {'components': dashboards,
-            'user': context['request'].user,
-            'current': current_dashboard,
-            'current_panel_group': current_panel_group,
-            'current_panel': current_panel.slug if current_panel else '',
-            'request': context['request']}
-
-
-@register.inclusion_tag('horizon/_nav_list.html', takes_context=True)
+    current_dashboard_slug = getattr(current_dashboard, 'slug', None)
+    current_panel_slug = current_panel.slug if current_panel else ''
+    return _render_navigation(
+        'horizon/_sidebar.html',
+        {'components': dashboards,
+         'user': request.user,
+         'current': current_dashboard,
+         'current_panel_group': current_panel_group,
+         'current_panel': current_panel_slug,
+         'request': request},
+        tree.fingerprint, mask, current_dashboard_slug, current_panel_group,
+        current_panel_slug)
+
+
+@register.simple_tag(takes_context=True)
 def horizon_main_nav(context):
     """Generates top-level dashboard navigation entries."""
     if 'request' not in context:
-        return {}
-    current_dashboard = context['request'].horizon.get('dashboard', None)
-    dashboards = []
-    for dash in Horizon.get_dashboards():
-        if dash.can_access(context):
-            if callable(dash.nav) and dash.nav(context):
-                dashboards.append(dash)
-            elif dash.nav:
-                dashboards.append(dash)
-    return {'components': dashboards,
-            'user': context['request'].user,
-            'current': current_dashboard,
-            'request': context['request']}
-
-
-@register.inclusion_tag('horizon/_subnav_list.html', takes_context=True)
+        return ''
+    request = context['request']
+    Horizon.get_access_map(context)
+    tree = Horizon.get_navigation_tree()
+    mask = tree.get_mask(context)
+    current_dashboard = request.horizon.get('dashboard', None)
+    dashboards = tree.get_allowed(mask, [dash for dash, groups
+                                         in tree.dashboards])
+    return _render_navigation(
+        'horizon/_nav_list.html',
+        {'components': dashboards,
+         'user': request.user,
+         'current': current_dashboard,
+         'request': request},
+        tree.fingerprint, mask, getattr(current_dashboard, 'slug', None))
+
+
+@register.simple_tag(takes_context=True)
 def horizon_dashboard_nav(context):
     """Generates sub-navigation entries for the current dashboard."""
     if 'request' not in context:
-        return {}
-    dashboard = context['request'].horizon['dashboard']
-    panel_groups = dashboard.get_panel_groups()
+        return ''
+    request = context['request']
+    Horizon.get_access_map(context)
+    tree = Horizon.get_navigation_tree()
+    mask = tree.get_mask(context)
+    dashboard = request.horizon['dashboard']
     non_empty_groups = []
 
-    for group in panel_groups.values():
-        allowed_panels = []
-        for panel in group:
-            if (callable(panel.nav) and panel.nav(context) and
-                    panel.can_access(context)):
-                allowed_panels.append(panel)
-            elif (not callable(panel.nav) and panel.nav and
-                    panel.can_access(context)):
-                allowed_panels.append(panel)
-        if allowed_panels:
-            if group.name is None:
-                non_empty_groups.append((dashboard.name, allowed_panels))
-            else:
-                non_empty_groups.append((group.name, allowed_panels))
-
-    return {'components': OrderedDict(non_empty_groups),
-            'user': context['request'].user,
-            'current': context['request'].horizon['panel'].slug,
-            'request': context['request']}
+    for dash, panel_groups in tree.dashboards:
+        if dash.component != dashboard:
+            continue
+        for group, panels in panel_groups.items():
+            allowed_panels = tree.get_allowed(mask, panels)
+            if allowed_panels:
+                if group.name is None:
+                    non_empty_groups.append((dashboard.name, allowed_panels))
+                else:
+                    non_empty_groups.append((group.name, allowed_panels))
+
+    current_panel = request.horizon['panel'].slug
+    return _render_navigation(
+        'horizon/_subnav_list.html',
+        {'components': OrderedDict(non_empty_groups),
+         'user': request.user,
+         'current': current_panel,
+         'request': request},
+        tree.fingerprint, mask, dashboard.slug, current_panel)
 
 
 @register.filter
@@ -21,7 +21,9 @@ from django.conf import settings
 from django.contrib.auth.models import User  # noqa
 from django.core.exceptions import ImproperlyConfigured  # noqa
 from django.core import urlresolvers
+from django import http
 from django.utils.importlib import import_module  # noqa
+import mock
 from six import moves
 
 import six
@@ -29,6 +31,7 @@ import six
 import horizon
 from horizon import base
 from horizon import conf
+from horizon import middleware
 from horizon.test import helpers as test
 from horizon.test.test_dashboards.cats.dashboard import Cats  # noqa
 from horizon.test.test_dashboards.cats.kittens.panel import Kittens  # noqa
@@ -207,6 +210,29 @@ class HorizonTests(BaseHorizonTests):
         self.assertEqual(cats, tigers._registered_with)
         self.assertEqual("/cats/tigers/", tigers.get_absolute_url())
 
+    def test_navigation_tree(self):
+        tree = base.Horizon.get_navigation_tree()
+        self.assertIs(tree, base.Horizon.get_navigation_tree())
+        dashboards = [dash.slug for dash, groups in tree.dashboards]
+        self.assertEqual(['cats', 'dogs'], dashboards[:2])
+        cats, cats_groups = tree.dashboards[0]
+        self.assertEqual([[], ['kittens'], ['tigers']],
+                         [[panel.slug for panel in panels]
+                          for panels in cats_groups.values()])
+
+        tigers = list(cats_groups.values())[2][0]
+        with mock.patch.object(Tigers, 'get_absolute_url',
+                               return_value='/cats/tigers/') as url:
+            self.assertEqual('/cats/tigers/', tigers.get_absolute_url())
+            self.assertEqual('/cats/tigers/', tigers.get_absolute_url())
+        self.assertEqual(1, url.call_count)
+
+        # The tree is built again once the registry changes.
+        base.Horizon.register(MyDash)
+        tree = base.Horizon.get_navigation_tree()
+        self.assertIn('mydash', [dash.slug for dash, groups
+                                 in tree.dashboards])
+
     def test_panel_without_slug_fails(self):
         class InvalidPanel(horizon.Panel):
             name = 'Invalid'
@@ -525,3 +551,68 @@ class RbacHorizonTests(test.TestCase):
                                  ['<Panel: rbac_panel_yes>'])
 
         self.assertTrue(dogs.can_access(context))
+
+    def _get_request(self, session, token_id):
+        request = http.HttpRequest()
+        request.session = session
+        request.user = mock.Mock(token=mock.Mock(id=token_id),
+                                 services_region='RegionOne')
+        middleware.HorizonMiddleware().process_request(request)
+        return request
+
+    def test_access_map(self):
+        context = {'request': self.request}
+        with mock.patch.object(RbacYesAccessPanel, 'allowed',
+                               return_value=True) as allowed:
+            access = base.Horizon.get_access_map(context)
+            self.assertIs(access, base.Horizon.get_access_map(context))
+            dogs = horizon.get_dashboard("dogs")
+            self.assertTrue(dogs.can_access(context))
+            self.assertTrue(dogs.get_panel("rbac_panel_yes")
+                            .can_access(context))
+        self.assertEqual(1, allowed.call_count)
+        self.assertEqual({
+            'horizon.test.test_dashboards.cats.dashboard.Cats': False,
+            'horizon.test.test_dashboards.dogs.dashboard.Dogs': True,
+            'horizon.test.tests.base.RbacNoAccessPanel': False,
+            'horizon.test.tests.base.RbacYesAccessPanel': True,
+        }, access)
+
+    def test_access_map_cached_per_token(self):
+        session = self.client._session()
+        with mock.patch.object(RbacYesAccessPanel, 'allowed',
+                               return_value=True) as allowed:
+            request = self._get_request(session, 'token-a')
+            base.Horizon.get_access_map({'request': request})
+            request = self._get_request(session, 'token-a')
+            base.Horizon.get_access_map({'request': request})
+            self.assertEqual(1, allowed.call_count)
+
+            request = self._get_request(session, 'token-b')
+            base.Horizon.get_access_map({'request': request})
+            self.assertEqual(2, allowed.call_count)
+
+            base.invalidate_access_cache(request)
+            request = self._get_request(session, 'token-b')
+            base.Horizon.get_access_map({'request': request})
+            self.assertEqual(3, allowed.call_count)
+        # The session only holds the version of the cached map.
+        self.assertIn(base.ACCESS_VERSION_SESSION_KEY, session)
+        self.assertNotIn('allowed', session)
+
+    def test_access_map_not_cached_after_failed_check(self):
+        session = self.client._session()
+
+        def allowed(context):
+            base.access_check_failed(context['request'])
+            return False
+
+        with mock.patch.object(RbacYesAccessPanel, 'allowed',
+                               side_effect=allowed) as panel_allowed:
+            request = self._get_request(session, 'token-a')
+            access = base.Horizon.get_access_map({'request': request})
+            self.assertFalse(access[
+                'horizon.test.tests.base.RbacYesAccessPanel'])
+            request = self._get_request(session, 'token-a')
+            base.Horizon.get_access_map({'request': request})
+            self.assertEqual(2, panel_allowed.call_count)
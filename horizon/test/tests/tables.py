@@ -15,15 +15,24 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import json
+import os
+import re
+import time
+import unittest
+
+from django.core import urlresolvers
 from django.core.urlresolvers import reverse
 from django import forms
 from django import http
 from django import shortcuts
 from django.template import defaultfilters
 
+import mock
 from mox3.mox import IsA  # noqa
 import six
 
+from horizon import exceptions
 from horizon import tables
 from horizon.tables import formset as table_formset
 from horizon.tables import views as table_views
@@ -144,6 +153,18 @@ class MyBatchActionWithHelpText(MyBatchAction):
     action_past = "BatchedHelp"
 
 
+class MyConcurrentBatchAction(MyBatchAction):
+    name = "concurrent_batch"
+    concurrency = 4
+
+    def allowed(self, request, obj=None):
+        return getattr(obj, 'status', None) != 'down'
+
+    def action(self, request, object_id):
+        if object_id == '3':
+            raise Exception("Action failed.")
+
+
 class MyToggleAction(tables.BatchAction):
     name = "toggle"
     action_present = ("Down", "Up")
@@ -309,6 +330,11 @@ class MyTableWrapList(MyTable):
                              wrap_list=False)
 
 
+class MyFastTable(MyTable):
+    class Meta(MyTable.Meta):
+        row_renderer = tables.RowRenderer
+
+
 class NoActionsTable(tables.DataTable):
     id = tables.Column('id')
 
@@ -431,6 +457,89 @@ class DataTableTests(test.TestCase):
                                  ['<Column: multi_select>',
                                   '<Column: id>'])
 
+    def test_get_object_by_id(self):
+        self.table = MyTable(self.request, TEST_DATA)
+        self.assertEqual(TEST_DATA[1], self.table.get_object_by_id('2'))
+        self.assertEqual(TEST_DATA[1], self.table.get_object_by_id(2))
+        self.assertEqual(TEST_DATA[3], self.table.get_object_by_id(u'4'))
+        self.assertRaises(exceptions.Http302,
+                          self.table.get_object_by_id, '5')
+
+    def test_get_object_by_id_data_changed(self):
+        self.table = MyTable(self.request, TEST_DATA)
+        self.assertEqual(TEST_DATA[0], self.table.get_object_by_id('1'))
+        self.table.data = TEST_DATA_2
+        self.assertEqual(TEST_DATA_2[0], self.table.get_object_by_id('1'))
+        self.assertRaises(exceptions.Http302,
+                          self.table.get_object_by_id, '2')
+
+        # Objects replaced in place are found once data is assigned again.
+        data = list(TEST_DATA_2)
+        self.table.data = data
+        self.assertEqual(TEST_DATA_2[0], self.table.get_object_by_id('1'))
+        data[0] = TEST_DATA[1]
+        self.table.data = data
+        self.assertEqual(TEST_DATA[1], self.table.get_object_by_id('2'))
+        self.assertRaises(exceptions.Http302,
+                          self.table.get_object_by_id, '1')
+
+    def test_get_object_by_id_duplicates(self):
+        self.table = MyTable(self.request, TEST_DATA + TEST_DATA_2)
+        self.assertRaises(ValueError, self.table.get_object_by_id, '1')
+
+    def test_get_rows_current_item(self):
+        self.table = MyTable(self.request, TEST_DATA)
+        self.table.current_item_id = '2'
+        rows = self.table.get_rows()
+        self.assertEqual(['current_selected'],
+                         [cls for row in rows for cls in row.classes
+                          if cls == 'current_selected'])
+        self.assertIn('current_selected', rows[1].classes)
+
+    def test_concurrent_batch_action(self):
+        action_string = "concurrent_table__concurrent_batch"
+        req = self.factory.post('/my_url/', {'action': action_string,
+                                             'object_ids': ['1', '2', '3',
+                                                            '4']})
+        self.table = ConcurrentBatchTable(req, TEST_DATA)
+        handled = self.table.maybe_handle()
+        self.assertEqual(302, handled.status_code)
+        action = self.table.base_actions['concurrent_batch']
+        self.assertEqual(['1', '4'], action.success_ids)
+        messages = [six.text_type(m.message) for m in req._messages]
+        self.assertEqual([u'You are not allowed to batch item: object_2',
+                          u'Unable to batch item: object_3',
+                          u'Batched Items: object_1, \xf6bject_4'],
+                         messages)
+
+    def test_batch_row_update(self):
+        params = {"table": "batch_update_table", "action": "rows_update",
+                  "obj_ids": ['1', '2', '3']}
+        req = self.factory.get('/my_url/', params,
+                               HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+        self.table = BatchUpdateTable(req)
+        resp = self.table.maybe_preempt()
+        self.assertEqual(200, resp.status_code)
+        data = json.loads(resp.content.decode('utf-8'))
+        self.assertEqual(['1', '2'], sorted(data['rows']))
+        # Data returned by get_data_batch is used as is...
+        self.assertIn("status_down", data['rows']['1'])
+        # ...while the rest is fetched row by row, except for the rows
+        # which it reported as failed.
+        self.assertIn("batch_update_table__row__2", data['rows']['2'])
+        self.assertEqual({'3': 100}, data['errors'])
+
+    def test_batch_row_update_url(self):
+        req = self.factory.get('/my_url/')
+        self.table = BatchUpdateTable(req, TEST_DATA)
+        self.assertEqual('/my_url/?action=rows_update'
+                         '&table=batch_update_table',
+                         self.table.get_ajax_batch_update_url())
+        self.assertIn('data-batch-update-url=', self.table.render())
+        self.table = MyTable(req, TEST_DATA)
+        self.assertIsNone(self.table.get_ajax_batch_update_url())
+        self.assertNotIn('data-batch-update-url=', self.table.render())
+
     def test_table_natural_no_inline_editing(self):
         class TempTable(MyTable):
             name = tables.Column(get_name,
@@ -672,6 +781,135 @@ class DataTableTests(test.TestCase):
         self.assertNotContains(resp_optional, '<ul>')
         self.assertNotContains(resp_optional, '</ul>')
 
+    def test_reverse_object_url(self):
+        self.table = MyTable(self.request, TEST_DATA)
+        with mock.patch.object(urlresolvers, 'reverse',
+                               side_effect=lambda name, args:
+                               u'/objects/%s/' % args[0]) as reverse:
+            for obj_id in ('1', 'abc-123', 'abc-123'):
+                self.assertEqual(u'/objects/%s/' % obj_id,
+                                 self.table.reverse_object_url('obj', obj_id))
+            # The URL is only reversed once for a placeholder, and for the
+            # ids checking that the pattern accepts any safe id.
+            self.assertEqual(1 + len(tables.base.OBJECT_ID_PROBES),
+                             reverse.call_count)
+            # Object ids which may need quoting are reversed as they are.
+            reverse.reset_mock()
+            self.assertEqual(u'/objects/a b/',
+                             self.table.reverse_object_url('obj', 'a b'))
+            self.assertEqual(1, reverse.call_count)
+
+    def test_reverse_object_url_restricted_pattern(self):
+        def reverse(name, args):
+            # A pattern accepting the placeholder but not every safe id.
+            if not re.match(r'^[0-9a-z]+$', args[0]):
+                raise urlresolvers.NoReverseMatch()
+            return u'/objects/%s/' % args[0]
+
+        self.table = MyTable(self.request, TEST_DATA)
+        with mock.patch.object(urlresolvers, 'reverse',
+                               side_effect=reverse) as reverse_mock:
+            self.assertEqual(u'/objects/1/',
+                             self.table.reverse_object_url('obj', '1'))
+            reverse_mock.reset_mock()
+            # Ids are reversed one by one, so the ids rejected by the
+            # pattern are not substituted in a URL.
+            self.assertRaises(urlresolvers.NoReverseMatch,
+                              self.table.reverse_object_url, 'obj', 'ABC')
+            self.assertEqual(u'/objects/2/',
+                             self.table.reverse_object_url('obj', '2'))
+            self.assertEqual(2, reverse_mock.call_count)
+
+    def test_row_action_policy_checked_per_row(self):
+        checks = []
+
+        def policy_check(rules, request, target):
+            checks.append(target)
+            return target['status'] != 'down'
+
+        class MyPolicyAction(MyAction):
+            name = "policy"
+            policy_rules = (("horizon", "horizon:policy"),)
+
+            def get_policy_target(self, request, datum):
+                return {'status': datum.status}
+
+        class MyPolicyTable(tables.DataTable):
+            id = tables.Column('id')
+
+            class Meta(object):
+                name = "my_policy_table"
+                row_actions = (MyPolicyAction,)
+
+        with self.settings(POLICY_CHECK_FUNCTION=policy_check):
+            self.table = MyPolicyTable(self.request, TEST_DATA)
+            actions = [self.table.get_row_actions(datum)
+                       for datum in TEST_DATA]
+        self.assertEqual([1, 0, 1, 1], [len(a) for a in actions])
+        # Caching the decisions is left to the policy check function.
+        self.assertEqual(4, len(checks))
+
+    def test_row_actions_are_bound_per_row(self):
+        self.table = MyTable(self.request, TEST_DATA)
+        first, second = [
+            [action for action in self.table.get_row_actions(datum)
+             if action.name == 'toggle'][0]
+            for datum in TEST_DATA[:2]]
+        toggle = self.table.base_actions['toggle']
+        for bound in (first, second):
+            self.assertIsInstance(bound, MyToggleAction)
+            self.assertIsNot(toggle, bound)
+            self.assertIsNot(toggle.attrs, bound.attrs)
+        self.assertEqual(TEST_DATA[0], first.datum)
+        self.assertEqual(TEST_DATA[1], second.datum)
+        self.assertEqual("Down Item", first.verbose_name)
+        self.assertEqual("Up Item", second.verbose_name)
+
+    def _assert_row_renderer_output(self, table):
+        renderer = tables.RowRenderer(table._columns)
+        for row in table.get_rows():
+            self.assertEqual(row.render(), renderer.render(row))
+
+    def test_row_renderer(self):
+        self._assert_row_renderer_output(MyTable(self.request, TEST_DATA))
+        self._assert_row_renderer_output(
+            MyTableSelectable(self.request, TEST_DATA))
+        self._assert_row_renderer_output(
+            MyTableWrapList(self.request, TEST_DATA_7))
+
+    def test_row_renderer_inline_edit_mod(self):
+        table = MyTable(self.request, TEST_DATA_2)
+        row = table.get_rows()[0]
+        row.cells['name'].inline_edit_mod = True
+        renderer = tables.RowRenderer(table._columns)
+        self.assertEqual(row.render(), renderer.render(row))
+        self.assertIn('inline-edit-form', renderer.render(row))
+
+    def test_row_renderer_option(self):
+        self.assertIsNone(MyTable._row_renderer)
+        self.assertIsInstance(MyFastTable._row_renderer, tables.RowRenderer)
+        self.assertEqual(MyTable(self.request, TEST_DATA).render(),
+                         MyFastTable(self.request, TEST_DATA).render())
+
+    @unittest.skipUnless(os.environ.get('WITH_BENCHMARKS', False),
+                         "The WITH_BENCHMARKS env variable is not set.")
+    def test_row_renderer_benchmark(self):
+        data = [FakeObject(six.text_type(i), 'object_%s' % i, 'value_%s' % i,
+                           'up' if i % 2 else 'down', 'optional_%s' % i)
+                for i in range(1000)]
+        timings = []
+        for table_class in (MyTable, MyFastTable):
+            table = table_class(self.request, data)
+            rows = table.get_rows()
+            started = time.time()
+            for row in rows:
+                row.render()
+            timings.append(time.time() - started)
+        self.assertLess(timings[1], timings[0],
+                        "Rendering %d rows took %.3fs with the row renderer "
+                        "and %.3fs without." % (len(data), timings[1],
+                                                timings[0]))
+
     def test_inline_edit_available_cell_rendering(self):
         self.table = MyTable(self.request, TEST_DATA_2)
         row = self.table.get_rows()[0]
@@ -1424,6 +1662,41 @@ class MultiTableView(tables.MultiTableView):
         return TEST_DATA
 
 
+class ConcurrentBatchTable(tables.DataTable):
+    id = tables.Column('id')
+    name = tables.Column('name')
+
+    class Meta(object):
+        name = "concurrent_table"
+        table_actions = (MyConcurrentBatchAction,)
+
+
+class MyBatchUpdateRow(tables.Row):
+    ajax = True
+    ajax_batch = True
+
+    def get_data(self, request, obj_id):
+        return TEST_DATA[int(obj_id) - 1]
+
+    def get_data_batch(self, request, obj_ids):
+        return {'1': TEST_DATA_2[0], '3': exceptions.NotAvailable()}
+
+
+class BatchUpdateTable(tables.DataTable):
+    id = tables.Column('id')
+    name = tables.Column('name')
+    status = tables.Column('status')
+
+    class Meta(object):
+        name = "batch_update_table"
+        status_columns = ["status"]
+        row_class = MyBatchUpdateRow
+
+
+class ConcurrentMultiTableView(MultiTableView):
+    concurrent_data_loading = True
+
+
 class DataTableViewTests(test.TestCase):
     def _prepare_view(self, cls, *args, **kwargs):
         req = self.factory.get('/my_url/')
@@ -1467,6 +1740,12 @@ class DataTableViewTests(test.TestCase):
         self.assertEqual(TableWithPermissions,
                          context['table_with_permissions_table'].__class__)
 
+    def test_multi_table_view_concurrent_data_loading(self):
+        view = self._prepare_view(ConcurrentMultiTableView)
+        data = view._get_data_dict()
+        self.assertEqual(list(TEST_DATA), data['my_table'])
+        self.assertEqual(list(TEST_DATA), data['table_with_permissions'])
+
     fil_value_param = "my_table__filter__q"
     fil_field_param = '%s_field' % fil_value_param
 
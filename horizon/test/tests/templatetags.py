@@ -19,10 +19,16 @@
 import re
 
 from django.conf import settings
+from django.core.cache import cache
+from django import http
 from django.template import Context  # noqa
+from django.template import loader
 from django.template import Template  # noqa
 from django.utils.text import normalize_newlines  # noqa
+import mock
 
+from horizon import conf
+from horizon import middleware
 from horizon.test import helpers as test
 from horizon.test.test_dashboards.cats.dashboard import Cats  # noqa
 from horizon.test.test_dashboards.cats.kittens.panel import Kittens  # noqa
@@ -129,3 +135,40 @@ class TemplateTagTests(test.TestCase):
                                             template_text=text,
                                             context={'request': self.request})
         self.assertEqual(single_line(rendered_str), single_line(expected))
+
+    def test_horizon_main_nav_cached(self):
+        cache.clear()
+        text = "{% horizon_main_nav %}"
+        render = loader.render_to_string
+        with mock.patch.object(loader, 'render_to_string',
+                               side_effect=render) as render_to_string:
+            rendered_str = self.render_template(
+                tag_require='horizon', template_text=text,
+                context={'request': self.request})
+            # Another user with the same access gets the same fragment.
+            request = http.HttpRequest()
+            request.session = self.client._session()
+            request.user = self.user
+            middleware.HorizonMiddleware().process_request(request)
+            self.assertEqual(rendered_str, self.render_template(
+                tag_require='horizon', template_text=text,
+                context={'request': request}))
+            self.assertEqual(1, render_to_string.call_count)
+
+            # The fragment differs when the current dashboard does.
+            request.horizon['dashboard'] = Cats
+            self.render_template(tag_require='horizon', template_text=text,
+                                 context={'request': request})
+            self.assertEqual(2, render_to_string.call_count)
+
+    @mock.patch.dict(conf.HORIZON_CONFIG, {'navigation_cache_timeout': 0})
+    def test_horizon_main_nav_not_cached(self):
+        text = "{% horizon_main_nav %}"
+        render = loader.render_to_string
+        with mock.patch.object(loader, 'render_to_string',
+                               side_effect=render) as render_to_string:
+            for i in range(2):
+                self.render_template(tag_require='horizon',
+                                     template_text=text,
+                                     context={'request': self.request})
+        self.assertEqual(2, render_to_string.call_count)
@@ -14,13 +14,19 @@
 
 import datetime
 import os
+import threading
+import time
 
 from django.core.exceptions import ValidationError  # noqa
 import django.template
 from django.template import defaultfilters
+from django.test.utils import override_settings
+import mock
 
+from horizon import exceptions
 from horizon import forms
 from horizon.test import helpers as test
+from horizon.utils import concurrency
 from horizon.utils import filters
 # we have to import the filter in order to register it
 from horizon.utils.filters import parse_isotime  # noqa
@@ -373,6 +379,235 @@ class MemoizedTests(test.TestCase):
             cache_calls(1)
         self.assertEqual(1, len(values_list))
 
+    def test_memoized_unhashable_arguments(self):
+        values_list = []
+
+        @memoized.memoized
+        def cache_calls(opts):
+            values_list.append(opts)
+            return True
+
+        cache_calls({'a': [1, 2], 'b': {'c': 3}})
+        cache_calls({'b': {'c': 3}, 'a': [1, 2]})
+        self.assertEqual(1, len(values_list))
+        cache_calls({'a': (1, 2), 'b': {'c': 3}})
+        self.assertEqual(2, len(values_list))
+
+    def test_memoized_max_size(self):
+        values_list = []
+
+        @memoized.memoized(max_size=2)
+        def cache_calls(value):
+            values_list.append(value)
+            return value
+
+        cache_calls(1)
+        cache_calls(2)
+        cache_calls(1)
+        # 2 is now the least recently used value, so it is evicted.
+        cache_calls(3)
+        cache_calls(1)
+        self.assertEqual([1, 2, 3], values_list)
+        cache_calls(2)
+        self.assertEqual([1, 2, 3, 2], values_list)
+        self.assertEqual({'max_size': 2, 'size': 2, 'hits': 2,
+                          'misses': 4, 'evictions': 2},
+                         cache_calls.cache_stats())
+
+    def test_memoized_weakref_removal_updates_size(self):
+        class Arg(object):
+            pass
+
+        @memoized.memoized
+        def cache_calls(arg):
+            return True
+
+        arg = Arg()
+        cache_calls(arg)
+        self.assertEqual(1, cache_calls.cache_stats()['size'])
+        del arg
+        self.assertEqual(0, cache_calls.cache_stats()['size'])
+
+    def test_get_cache_stats(self):
+        @memoized.memoized
+        def registered_function(value):
+            return value
+
+        registered_function(1)
+        registered_function(1)
+        name = '%s.registered_function' % __name__
+        stats = memoized.get_cache_stats()[name]
+        self.assertEqual(1, stats['hits'])
+        self.assertEqual(1, stats['misses'])
+
+
+@memoized.memoized_with_ttl()
+def cached_value(request):
+    return object()
+
+
+@override_settings(MEMOIZED_CACHE_ENABLED=True)
+class MemoizedWithTTLTests(test.TestCase):
+    def setUp(self):
+        super(MemoizedWithTTLTests, self).setUp()
+        memoized.get_ttl_backend().clear()
+        self.calls = []
+
+    def _get_request(self, token_id='token', tenant_id='tenant'):
+        request = self.factory.get('/')
+        request.user = mock.Mock(token=mock.Mock(id=token_id),
+                                 tenant_id=tenant_id,
+                                 services_region='RegionOne')
+        return request
+
+    def _make_cached(self, **kwargs):
+        @memoized.memoized_with_ttl(**kwargs)
+        def cached(request, value=None):
+            self.calls.append(value)
+            return value
+        return cached
+
+    def test_cache_across_requests(self):
+        cached = self._make_cached()
+        cached(self._get_request(), 1)
+        cached(self._get_request(), 1)
+        cached(self._get_request(), 2)
+        self.assertEqual([1, 2], self.calls)
+        stats = cached.cache_stats()
+        self.assertEqual(1, stats['hits'])
+        self.assertEqual(2, stats['misses'])
+
+    def test_cache_scope(self):
+        token_cached = self._make_cached()
+        token_cached(self._get_request(token_id='a'))
+        token_cached(self._get_request(token_id='b'))
+        self.assertEqual(2, len(self.calls))
+
+        self.calls = []
+        project_cached = self._make_cached(scope='project')
+        project_cached(self._get_request(token_id='a'))
+        project_cached(self._get_request(token_id='b'))
+        self.assertEqual(1, len(self.calls))
+
+    def test_unhashable_arguments_are_canonical(self):
+        cached = self._make_cached()
+        cached(self._get_request(), {'a': [1, 2], 'b': None})
+        cached(self._get_request(), {'b': None, 'a': (1, 2)})
+        self.assertEqual(1, len(self.calls))
+
+    def test_ttl_expiry(self):
+        cached = self._make_cached(ttl=10)
+        with mock.patch('time.time', return_value=0):
+            cached(self._get_request())
+        with mock.patch('time.time', return_value=5):
+            cached(self._get_request())
+        with mock.patch('time.time', return_value=11):
+            cached(self._get_request())
+        self.assertEqual(2, len(self.calls))
+
+    def test_invalidates(self):
+        cached = self._make_cached()
+
+        @memoized.invalidates(cached)
+        def change():
+            pass
+
+        cached(self._get_request())
+        change()
+        cached(self._get_request())
+        self.assertEqual(2, len(self.calls))
+
+    def test_invalidates_dotted_path(self):
+        @memoized.invalidates('horizon.test.tests.utils.cached_value')
+        def change():
+            pass
+
+        request = self._get_request()
+        value = cached_value(request)
+        self.assertIs(value, cached_value(self._get_request()))
+        change()
+        self.assertIsNot(value, cached_value(self._get_request()))
+
+    def test_dump_and_load(self):
+        cached = self._make_cached(dump=lambda value: {'value': value},
+                                   load=lambda data, request, value: (
+                                       data['value'], request))
+        request = self._get_request()
+        self.assertEqual(1, cached(self._get_request(), 1))
+        self.assertEqual((1, request), cached(request, 1))
+        self.assertEqual([1], self.calls)
+
+    @override_settings(MEMOIZED_CACHE_BACKEND='default')
+    def test_unpicklable_result(self):
+        cached = self._make_cached(dump=lambda value: threading.Lock())
+        with mock.patch.object(memoized.LOG, 'warning') as warning:
+            cached(self._get_request())
+        self.assertTrue(warning.called)
+
+    def test_invalidate_increments_generation(self):
+        cached = self._make_cached()
+        backend = memoized.get_ttl_backend()
+        cached.invalidate()
+        cached.invalidate()
+        key = 'memoized-generation:%s.cached' % __name__
+        self.assertEqual(2, backend.get(key))
+
+    def test_disabled(self):
+        cached = self._make_cached()
+        with self.settings(MEMOIZED_CACHE_ENABLED=False):
+            cached(self._get_request())
+            cached(self._get_request())
+        self.assertEqual(2, len(self.calls))
+
+
+class ConcurrencyTests(test.TestCase):
+    def test_execute_runs_tasks_concurrently(self):
+        barrier = threading.Event()
+
+        def wait_for_barrier():
+            return barrier.wait(5)
+
+        tasks = [concurrency.Task(wait_for_barrier),
+                 concurrency.Task(barrier.set)]
+        concurrency.execute(tasks, max_workers=2)
+        self.assertTrue(tasks[0].get())
+
+    def test_execute_keeps_task_order(self):
+        tasks = concurrency.map_concurrently(lambda x: x * 2, range(20),
+                                             max_workers=4)
+        self.assertEqual([t.get() for t in tasks], list(range(0, 40, 2)))
+
+    def test_task_reraises_exception(self):
+        def fail():
+            raise ValueError("failed")
+
+        task, = concurrency.execute([concurrency.Task(fail)], max_workers=2)
+        self.assertRaises(ValueError, task.get)
+
+    def test_task_timeout(self):
+        tasks = [concurrency.Task(time.sleep, args=(0.5,), timeout=0.01),
+                 concurrency.Task(lambda: 'ok')]
+        concurrency.execute(tasks, max_workers=2)
+        self.assertRaises(exceptions.TimedOut, tasks[0].get)
+        self.assertEqual('ok', tasks[1].get())
+
+    def test_gather_handles_failures(self):
+        def fail():
+            raise exceptions.NotAvailable("not available")
+
+        request = self.factory.get('/')
+        gather = concurrency.Gather(request, max_workers=2)
+        gather.add('ok', lambda x: x, args=('value',))
+        gather.add('failed', fail, default=[], message="Failed.")
+        results = gather.run()
+        self.assertEqual({'ok': 'value', 'failed': []}, results)
+        self.assertEqual(1, len(request._messages._queued_messages))
+
+    def test_gather_duplicate_name(self):
+        gather = concurrency.Gather(self.request)
+        gather.add('name', lambda: None)
+        self.assertRaises(ValueError, gather.add, 'name', lambda: None)
+
 
 class GetPageSizeTests(test.TestCase):
     def test_bad_session_value(self):
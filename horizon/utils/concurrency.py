@@ -0,0 +1,233 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+Helpers for running independent API calls concurrently within a request.
+
+Most pages need data from several services which do not depend on each
+other (servers, flavors, images, ...). Fetching them one after another makes
+the page latency the sum of all round trips; running them on a small,
+request-scoped pool of threads brings it down to roughly the slowest call.
+"""
+
+import collections
+import logging
+import sys
+import threading
+import time
+
+from django.utils import translation
+import six
+from six.moves import queue
+
+from horizon import conf
+from horizon import exceptions
+
+
+LOG = logging.getLogger(__name__)
+
+
+def get_max_workers():
+    return conf.HORIZON_CONFIG['api_max_workers']
+
+
+def get_timeout():
+    return conf.HORIZON_CONFIG['api_call_timeout']
+
+
+class Task(object):
+    """A single call scheduled for concurrent execution.
+
+    Once the task has finished, :meth:`get` either returns the value of the
+    call or re-raises the exception it failed with in the calling thread.
+    """
+    def __init__(self, func, args=(), kwargs=None, timeout=None, name=None):
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs or {}
+        self.timeout = timeout
+        self.name = name or getattr(func, '__name__', repr(func))
+        self.result = None
+        self.exc_info = None
+        self.elapsed = None
+        self.cancelled = False
+        self._done = threading.Event()
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return '<%s: %s>' % (self.__class__.__name__, self.name)
+
+    @property
+    def done(self):
+        return self._done.is_set()
+
+    def run(self):
+        if self.cancelled:
+            return
+        result, exc_info = None, None
+        started = time.time()
+        try:
+            result = self.func(*self.args, **self.kwargs)
+        except Exception:
+            exc_info = sys.exc_info()
+        elapsed = time.time() - started
+        LOG.debug('%s finished in %.3fs', self.name, elapsed)
+        with self._lock:
+            # A cancelled task has already been reported as timed out.
+            if not self.cancelled:
+                self.result, self.exc_info = result, exc_info
+                self.elapsed = elapsed
+                self._done.set()
+
+    def wait(self, timeout=None):
+        """Waits for the task, cancelling it if it does not finish in time.
+
+        A task which times out is reported as failed with
+        :class:`~horizon.exceptions.TimedOut`.
+        """
+        if self._done.wait(timeout):
+            return True
+        with self._lock:
+            if not self._done.is_set():
+                self.cancelled = True
+                try:
+                    raise exceptions.TimedOut(self.name, timeout)
+                except exceptions.TimedOut:
+                    self.exc_info = sys.exc_info()
+                self._done.set()
+        return not self.cancelled
+
+    def get(self):
+        if self.exc_info:
+            six.reraise(*self.exc_info)
+        return self.result
+
+
+def _worker(tasks, language):
+    # Translations are activated per thread, so carry the language of the
+    # request over to keep lazily translated strings consistent.
+    if language:
+        translation.activate(language)
+    try:
+        while True:
+            try:
+                task = tasks.get_nowait()
+            except queue.Empty:
+                return
+            task.run()
+    finally:
+        translation.deactivate()
+
+
+def execute(tasks, max_workers=None, timeout=None):
+    """Runs the given :class:`Task` objects on a bounded pool of threads.
+
+    Blocks until every task has finished or run out of time. A task's own
+    ``timeout`` takes precedence over ``timeout``; both are counted from
+    the moment the batch is submitted. When only one worker is needed the
+    tasks run in the calling thread.
+
+    Returns the list of tasks, in the order they were given.
+    """
+    tasks = list(tasks)
+    if max_workers is None:
+        max_workers = get_max_workers()
+    if timeout is None:
+        timeout = get_timeout()
+    max_workers = min(max_workers, len(tasks))
+
+    if max_workers <= 1:
+        for task in tasks:
+            task.run()
+        return tasks
+
+    pending = queue.Queue()
+    for task in tasks:
+        pending.put(task)
+    language = translation.get_language()
+    for i in range(max_workers):
+        worker = threading.Thread(target=_worker, args=(pending, language))
+        # Threads which outlive a timed out call must not keep the
+        # process alive.
+        worker.daemon = True
+        worker.start()
+
+    started = time.time()
+    for task in tasks:
+        task_timeout = task.timeout if task.timeout is not None else timeout
+        if task_timeout is None:
+            task.wait()
+        else:
+            task.wait(max(0, started + task_timeout - time.time()))
+    return tasks
+
+
+def map_concurrently(func, items, max_workers=None, timeout=None):
+    """Calls ``func`` for every item concurrently and returns the tasks.
+
+    Like :func:`execute`, failures are not raised; inspect or ``get()``
+    the returned tasks, which are in the same order as ``items``.
+    """
+    name = getattr(func, '__name__', 'task')
+    tasks = [Task(func, args=(item,), name='%s(%s)' % (name, item))
+             for item in items]
+    return execute(tasks, max_workers=max_workers, timeout=timeout)
+
+
+_Call = collections.namedtuple('_Call', ['task', 'default', 'message',
+                                         'ignore', 'escalate'])
+
+
+class Gather(object):
+    """Collects independent API calls for a request and runs them together.
+
+    Each call is registered under a name with :meth:`add`; :meth:`run`
+    executes all of them concurrently and returns a dictionary of results
+    keyed by those names. A call which fails is passed through
+    :func:`horizon.exceptions.handle` in the request thread exactly like a
+    sequential ``try``/``except`` block would do, and its ``default`` is
+    used as the result. Example::
+
+        gather = Gather(self.request)
+        gather.add('flavors', api.nova.flavor_list, args=(self.request,),
+                   default=[], ignore=True)
+        gather.add('images', api.glance.image_list_detailed,
+                   args=(self.request,), default=([], False, False),
+                   message=_('Unable to retrieve images.'))
+        results = gather.run()
+    """
+    def __init__(self, request, max_workers=None, timeout=None):
+        self.request = request
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self._calls = collections.OrderedDict()
+
+    def add(self, name, func, args=(), kwargs=None, default=None,
+            message=None, ignore=False, escalate=False, timeout=None):
+        if name in self._calls:
+            raise ValueError('A call named "%s" was already added.' % name)
+        task = Task(func, args=args, kwargs=kwargs, timeout=timeout,
+                    name=name)
+        self._calls[name] = _Call(task, default, message, ignore, escalate)
+
+    def run(self):
+        execute([call.task for call in self._calls.values()],
+                max_workers=self.max_workers, timeout=self.timeout)
+        results = {}
+        for name, call in self._calls.items():
+            try:
+                results[name] = call.task.get()
+            except Exception:
+                results[name] = call.default
+                exceptions.handle(self.request, call.message,
+                                  ignore=call.ignore, escalate=call.escalate)
+        return results
@@ -12,19 +12,110 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import collections
 import functools
+import hashlib
+import logging
+import threading
+import time
 import warnings
 import weakref
 
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.module_loading import import_string
 import six
+from six.moves import cPickle as pickle
+
+
+LOG = logging.getLogger(__name__)
+
+
+# The default maximum number of results kept by each memoized function.
+DEFAULT_MAX_SIZE = 1000
+
+# Statistics of all memoized functions, keyed by their dotted paths.
+_registry = {}
+_registry_lock = threading.Lock()
 
 
 class UnhashableKeyWarning(RuntimeWarning):
     """Raised when trying to memoize a function with an unhashable argument."""
 
 
+class CacheStats(object):
+    """Thread-safe counters describing the cache of a memoized function."""
+    def __init__(self, max_size=None):
+        self.max_size = max_size
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+    def hit(self):
+        with self._lock:
+            self.hits += 1
+
+    def miss(self):
+        with self._lock:
+            self.misses += 1
+
+    def evict(self):
+        with self._lock:
+            self.evictions += 1
+
+    def as_dict(self):
+        return {'max_size': self.max_size, 'size': self.size,
+                'hits': self.hits, 'misses': self.misses,
+                'evictions': self.evictions}
+
+
+def _register(func, stats):
+    name = '%s.%s' % (func.__module__, func.__name__)
+    with _registry_lock:
+        _registry.setdefault(name, []).append(stats)
+
+
+def get_cache_stats():
+    """Returns the cache statistics of all memoized functions.
+
+    The result maps dotted function paths to the statistics returned by
+    their ``cache_stats()`` method, summed up if several functions share a
+    path, e.g. because a decorator was applied in a loop.
+    """
+    with _registry_lock:
+        registry = dict((name, list(stats_list))
+                        for name, stats_list in six.iteritems(_registry))
+    result = {}
+    for name, stats_list in six.iteritems(registry):
+        totals = {}
+        for stats in stats_list:
+            for counter, value in six.iteritems(stats.as_dict()):
+                if value is not None:
+                    totals[counter] = totals.get(counter, 0) + value
+        result[name] = totals
+    return result
+
+
 def _try_weakref(arg, remove_callback):
-    """Return a weak reference to arg if possible, or arg itself if not."""
+    """Return a weak reference to arg if possible, or arg itself if not.
+
+    Lists, tuples, sets and dictionaries are converted to equivalent
+    hashable tuples, with weak references to their items where possible.
+    """
+    if isinstance(arg, (list, tuple)):
+        return (type(arg),
+                tuple(_try_weakref(item, remove_callback) for item in arg))
+    if isinstance(arg, (set, frozenset)):
+        return (type(arg), frozenset(
+            _try_weakref(item, remove_callback) for item in arg))
+    if isinstance(arg, dict):
+        # Sort it, so that we don't depend on the order of keys.
+        return (type(arg), tuple(sorted(
+            ((key, _try_weakref(value, remove_callback))
+             for (key, value) in six.iteritems(arg)),
+            key=lambda item: repr(item[0]))))
     try:
         arg = weakref.ref(arg, remove_callback)
     except TypeError:
@@ -46,7 +137,7 @@ def _get_key(args, kwargs, remove_callback):
     return weak_args, weak_kwargs
 
 
-def memoized(func):
+def memoized(func=None, max_size=DEFAULT_MAX_SIZE):
     """Decorator that caches function calls.
 
     Caches the decorated function's return value the first time it is called
@@ -54,12 +145,31 @@ def memoized(func):
     cached value is returned instead of calling the decorated function again.
 
     The cache uses weak references to the passed arguments, so it doesn't keep
-    them alive in memory forever.
+    them alive in memory forever. Lists, tuples, sets and dictionaries are
+    compared by their content. The cache is safe to use from several threads
+    and keeps at most ``max_size`` results (``None`` for no limit), evicting
+    the least recently used ones first::
+
+        @memoized(max_size=100)
+        def get_thing(request, thing_id):
+            ...
+
+    The decorated function gains a ``cache_stats()`` method returning the
+    size of its cache and its hit, miss and eviction counters.
     """
-    # The dictionary in which all the data will be cached. This is a separate
-    # instance for every decorated function, and it's stored in a closure of
-    # the wrapped function.
-    cache = {}
+    if func is None:
+        return functools.partial(memoized, max_size=max_size)
+
+    # The dictionary in which all the data will be cached, ordered from the
+    # least to the most recently used entry. This is a separate instance for
+    # every decorated function, and it's stored in a closure of the wrapped
+    # function.
+    cache = collections.OrderedDict()
+    # The weak reference callbacks may be called by the garbage collector
+    # while the lock is held by the same thread, so it has to be reentrant.
+    lock = threading.RLock()
+    stats = CacheStats(max_size)
+    _register(func, stats)
 
     @functools.wraps(func)
     def wrapped(*args, **kwargs):
@@ -70,13 +180,15 @@ def memoized(func):
 
         def remove(ref):
             """A callback to remove outdated items from cache."""
-            try:
-                # The key here is from closure, and is calculated later.
-                del cache[key]
-            except KeyError:
-                # Some other weak reference might have already removed that
-                # key -- in that case we don't need to do anything.
-                pass
+            with lock:
+                try:
+                    # The key here is from closure, and is calculated later.
+                    del cache[key]
+                except KeyError:
+                    # Some other weak reference might have already removed
+                    # that key -- in that case we don't need to do anything.
+                    pass
+                stats.size = len(cache)
 
         key = _get_key(args, kwargs, remove)
         try:
@@ -85,22 +197,265 @@ def memoized(func):
             # happen once and likely calls some external API, database, or
             # some other slow thing. That's why the hit is in straightforward
             # code, and the miss is in an exception.
-            value = cache[key]
+            with lock:
+                # Re-insert the value to mark it as the most recently used.
+                value = cache[key] = cache.pop(key)
+            stats.hit()
+            return value
         except KeyError:
-            value = cache[key] = func(*args, **kwargs)
+            pass
         except TypeError:
             # The calculated key may be unhashable when an unhashable object,
-            # such as a list, is passed as one of the arguments. In that case,
-            # we can't cache anything and simply always call the decorated
-            # function.
+            # which is not a list, tuple, set or dictionary, is passed as one
+            # of the arguments. In that case, we can't cache anything and
+            # simply always call the decorated function.
             warnings.warn(
                 "The key %r is not hashable and cannot be memoized." % (key,),
                 UnhashableKeyWarning, 2)
-            value = func(*args, **kwargs)
+            return func(*args, **kwargs)
+
+        stats.miss()
+        # The lock is not held while calling the function, so concurrent
+        # misses may both call it; the last result wins.
+        value = func(*args, **kwargs)
+        with lock:
+            cache[key] = value
+            while max_size is not None and len(cache) > max_size:
+                cache.popitem(last=False)
+                stats.evict()
+            stats.size = len(cache)
         return value
+
+    wrapped.cache_stats = stats.as_dict
     return wrapped
 
 # We can use @memoized for methods now too, because it uses weakref and so
 # it doesn't keep the instances in memory forever. We might want to separate
 # them in the future, however.
 memoized_method = memoized
+
+
+# Marker for a value missing from a cache backend, as None may be a valid
+# cached result.
+_MISSING = object()
+
+# Types of arguments which have a stable representation across requests and
+# processes, and can therefore be part of a shared cache key.
+_KEYABLE_TYPES = six.string_types + six.integer_types + (
+    float, bool, type(None))
+
+
+class LocalMemoryBackend(object):
+    """Process local storage for :func:`memoized_with_ttl` results.
+
+    Values are stored as they are, so unlike Django's cache framework this
+    can keep objects which cannot be pickled, such as API client resources.
+    """
+    def __init__(self):
+        self._data = {}
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            value, expires = self._data.get(key, (default, None))
+            if expires is not None and expires <= time.time():
+                del self._data[key]
+                return default
+            return value
+
+    def set(self, key, value, timeout=None):
+        expires = time.time() + timeout if timeout else None
+        with self._lock:
+            self._data[key] = (value, expires)
+
+    def add(self, key, value, timeout=None):
+        with self._lock:
+            if key in self._data:
+                return False
+        self.set(key, value, timeout)
+        return True
+
+    def incr(self, key, delta=1):
+        with self._lock:
+            if key not in self._data:
+                raise ValueError("Key '%s' not found" % key)
+            value, expires = self._data[key]
+            self._data[key] = (value + delta, expires)
+            return value + delta
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+_local_backend = LocalMemoryBackend()
+
+
+def get_ttl_backend():
+    """Returns the storage used by :func:`memoized_with_ttl`.
+
+    This is the Django cache named by the ``MEMOIZED_CACHE_BACKEND`` setting,
+    or a process local store if that setting is ``None``.
+    """
+    alias = getattr(settings, 'MEMOIZED_CACHE_BACKEND', None)
+    if alias is None:
+        return _local_backend
+    return caches[alias]
+
+
+def _get_request_scope(request, scope):
+    user = getattr(request, 'user', None)
+    region = getattr(user, 'services_region', None)
+    if scope == 'project':
+        return ('project', getattr(user, 'tenant_id', None), region)
+    token = getattr(user, 'token', None)
+    return ('token', getattr(token, 'id', None), region)
+
+
+def _is_request(arg):
+    return hasattr(arg, 'user') and hasattr(arg, 'session')
+
+
+def _canonical(value, scope):
+    """Returns a representation of value which is stable across processes.
+
+    Requests are represented by their scope, and dictionaries are sorted.
+    Raises ``TypeError`` for values which cannot be represented reliably.
+    """
+    if isinstance(value, _KEYABLE_TYPES):
+        return value
+    if isinstance(value, (list, tuple)):
+        return tuple(_canonical(item, scope) for item in value)
+    if isinstance(value, dict):
+        return tuple(sorted((_canonical(k, scope), _canonical(v, scope))
+                            for k, v in six.iteritems(value)))
+    if _is_request(value):
+        return _get_request_scope(value, scope)
+    raise TypeError("%r cannot be part of a cache key." % (value,))
+
+
+def _get_ttl_key(name, generation, scope, args, kwargs):
+    """Calculates a cache key which is stable across processes.
+
+    Returns None when any argument cannot be represented reliably.
+    """
+    try:
+        parts = (_canonical(args, scope), _canonical(kwargs, scope))
+    except TypeError:
+        return None
+    digest = hashlib.md5(repr(parts).encode('utf-8')).hexdigest()
+    return 'memoized:%s:%s:%s' % (name, generation, digest)
+
+
+def memoized_with_ttl(ttl=300, scope='token', dump=None, load=None):
+    """Decorator that caches function calls across requests.
+
+    When the ``MEMOIZED_CACHE_ENABLED`` setting is ``True``, results are
+    stored in the backend returned by :func:`get_ttl_backend` for ``ttl``
+    seconds. The ``MEMOIZED_CACHE_TTLS`` setting may override the TTL of a
+    function by its dotted path; a TTL of ``0`` disables caching for it.
+
+    A Django cache backend only stores values which can be pickled, which
+    API client resources holding their client cannot. ``dump(value)``
+    converts a result to the plain data which is stored, and
+    ``load(data, *args, **kwargs)`` converts that data back for a call
+    with the given arguments; without them, results are stored as they are.
+
+    Request arguments are replaced in the cache key by the token (or the
+    project, when ``scope`` is ``'project'``) and the region of the
+    request's user. Calls with other arguments which cannot be represented
+    reliably in a key fall back to :func:`memoized`, which also remains in
+    effect for every call while the cache is disabled.
+
+    The decorated function gains an ``invalidate()`` method, which discards
+    all of its cached results (see :func:`invalidates`), and a
+    ``cache_stats()`` method returning its hit and miss counters. With the
+    process local backend, results are only discarded in the process which
+    invalidated them; other processes keep them until they expire.
+    """
+    def decorator(func):
+        name = '%s.%s' % (func.__module__, func.__name__)
+        generation_key = 'memoized-generation:%s' % name
+        stats = CacheStats()
+        per_request = memoized(func)
+
+        def get_ttl():
+            ttls = getattr(settings, 'MEMOIZED_CACHE_TTLS', {})
+            return ttls.get(name, ttl)
+
+        @functools.wraps(func)
+        def wrapped(*args, **kwargs):
+            timeout = get_ttl()
+            if not getattr(settings, 'MEMOIZED_CACHE_ENABLED', False) or \
+                    not timeout:
+                return per_request(*args, **kwargs)
+            backend = get_ttl_backend()
+            generation = backend.get(generation_key, 0)
+            key = _get_ttl_key(name, generation, scope, args, kwargs)
+            if key is None:
+                return per_request(*args, **kwargs)
+            data = backend.get(key, _MISSING)
+            if data is not _MISSING:
+                stats.hit()
+                return load(data, *args, **kwargs) if load else data
+            stats.miss()
+            value = per_request(*args, **kwargs)
+            try:
+                backend.set(key, dump(value) if dump else value, timeout)
+            except (pickle.PicklingError, TypeError, AttributeError):
+                LOG.warning("Unable to cache the result of %s.", name,
+                            exc_info=True)
+            return value
+
+        def invalidate():
+            backend = get_ttl_backend()
+            # Concurrent invalidations must all change the generation, so
+            # it is incremented atomically rather than read and written.
+            backend.add(generation_key, 0, None)
+            try:
+                backend.incr(generation_key)
+            except ValueError:
+                # The generation was evicted in the meantime.
+                backend.add(generation_key, 1, None)
+
+        wrapped.invalidate = invalidate
+        wrapped.cache_stats = stats.as_dict
+        return wrapped
+    return decorator
+
+
+def _invalidate(func, cached_funcs):
+    for cached_func in cached_funcs:
+        if isinstance(cached_func, six.string_types):
+            if '.' in cached_func:
+                cached_func = import_string(cached_func)
+            else:
+                cached_func = func.__globals__[cached_func]
+        cached_func.invalidate()
+
+
+def invalidates(*cached_funcs):
+    """Decorator for calls which change what ``cached_funcs`` return.
+
+    Every function decorated with :func:`memoized_with_ttl` listed in
+    ``cached_funcs`` is invalidated once the decorated call returns or
+    fails (a failed call may still have changed something). A function
+    may also be given by its name in the module of the decorated call, so
+    that it can be defined further down in that module, or by its dotted
+    path, which is only imported once needed and therefore works across
+    circular imports. Nothing is done while the cache is disabled.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapped(*args, **kwargs):
+            try:
+                return func(*args, **kwargs)
+            finally:
+                if getattr(settings, 'MEMOIZED_CACHE_ENABLED', False):
+                    _invalidate(func, cached_funcs)
+        return wrapped
+    return decorator
@@ -30,20 +30,15 @@ using only explicitly defined attributes and/or methods.
 In other words, Horizon developers not working on openstack_dashboard.api
 shouldn't need to understand the finer details of APIs for
 Keystone/Nova/Glance/Swift et. al.
+
+The service modules, and the client libraries they depend on, are only
+imported the first time they are accessed as attributes of this package,
+e.g. ``api.nova``, which keeps them out of the startup time of processes
+that never use them.
 """
-from openstack_dashboard.api import base
-from openstack_dashboard.api import ceilometer
-from openstack_dashboard.api import cinder
-from openstack_dashboard.api import fwaas
-from openstack_dashboard.api import glance
-from openstack_dashboard.api import heat
-from openstack_dashboard.api import keystone
-from openstack_dashboard.api import lbaas
-from openstack_dashboard.api import network
-from openstack_dashboard.api import neutron
-from openstack_dashboard.api import nova
-from openstack_dashboard.api import swift
-from openstack_dashboard.api import vpn
+import importlib
+import sys
+import types
 
 
 __all__ = [
@@ -61,3 +56,27 @@ __all__ = [
     "ceilometer",
     "vpn",
 ]
+
+
+class _LazyPackage(types.ModuleType):
+    """Package module which imports its service modules on first access."""
+
+    def __getattr__(self, name):
+        # Only called for attributes which are not set yet; importing the
+        # module also sets it as an attribute of the package.
+        if name not in __all__:
+            raise AttributeError("'module' object has no attribute '%s'"
+                                 % name)
+        return importlib.import_module('%s.%s' % (self.__name__, name))
+
+    def __dir__(self):
+        return sorted(set(self.__dict__) | set(__all__))
+
+
+_package = _LazyPackage(__name__, __doc__)
+_package.__dict__.update((key, value) for key, value in globals().items()
+                         if key.startswith('__'))
+# Keep a reference to this module, so that its globals used above are not
+# cleared when it is replaced in sys.modules.
+_package._module = sys.modules[__name__]
+sys.modules[__name__] = _package
@@ -16,7 +16,13 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import collections
 from collections import Sequence  # noqa
+import datetime
+import importlib
+import logging
+import threading
+import time
 
 from django.conf import settings
 
@@ -25,9 +31,15 @@ from horizon import exceptions
 import six
 
 
+LOG = logging.getLogger(__name__)
+
 __all__ = ('APIResourceWrapper', 'APIDictWrapper',
            'get_service_from_catalog', 'url_for',)
 
+# Dotted path of the cached quota usages, which calls creating or deleting
+# resources counted against a quota pass to ``invalidates``.
+QUOTA_USAGES = 'openstack_dashboard.usage.quotas.tenant_quota_usages'
+
 
 class APIVersionManager(object):
     """Object to store and manage API versioning data and utility methods."""
@@ -50,15 +62,26 @@ class APIVersionManager(object):
     @property
     def active(self):
         if self._active is None:
-            self.get_active_version()
+            self._active = self._get_active_key()
         return self._active
 
     def load_supported_version(self, version, data):
+        """Registers the data of a supported version.
+
+        The ``"client"`` of ``data`` may be given as the dotted path of the
+        client module, which is then only imported by the first call to
+        :meth:`get_active_version`, so that client libraries are not loaded
+        at startup.
+        """
         self.supported[version] = data
 
     def get_active_version(self):
-        if self._active is not None:
-            return self.supported[self._active]
+        data = self.supported[self.active]
+        if isinstance(data.get("client"), six.string_types):
+            data["client"] = importlib.import_module(data["client"])
+        return data
+
+    def _get_active_key(self):
         key = getattr(settings, self.SETTINGS_KEY, {}).get(self.service_type)
         if key is None:
             # TODO(gabriel): support API version discovery here; we'll leave
@@ -79,8 +102,7 @@ class APIVersionManager(object):
             msg = ('%s is not a supported API version for the %s service, '
                    ' choices are: %s' % (key, self.service_type, choices))
             raise exceptions.ConfigurationError(msg)
-        self._active = key
-        return self.supported[self._active]
+        return key
 
     def clear_active_cache(self):
         self._active = None
@@ -243,6 +265,139 @@ class QuotaSet(Sequence):
         return self.__add__(other)
 
 
+def dump_resources(resources):
+    """Returns the data of API client resources, which can be pickled.
+
+    Meant as the ``dump`` function of
+    :func:`~horizon.utils.memoized.memoized_with_ttl`, for a single resource
+    or a list of them; see :func:`resource_loader`.
+    """
+    if isinstance(resources, list):
+        return [resource.to_dict() for resource in resources]
+    return resources.to_dict()
+
+
+def resource_loader(get_manager):
+    """Returns a ``load`` function for the data of :func:`dump_resources`.
+
+    The resources are rebuilt with the client manager which
+    ``get_manager(request)`` returns for the request of the call.
+    """
+    def load(data, request, *args, **kwargs):
+        manager = get_manager(request)
+
+        def wrap(info):
+            return manager.resource_class(manager, info, loaded=True)
+
+        if isinstance(data, list):
+            return [wrap(info) for info in data]
+        return wrap(data)
+    return load
+
+
+class ClientPool(object):
+    """Process-wide pool of API clients shared by the requests of a token.
+
+    Building a client for every request also means opening new HTTP
+    sessions, i.e. a new TCP and TLS handshake to each endpoint. Clients
+    are kept for ``API_CLIENT_POOL_TTL`` seconds, but never past the expiry
+    of the token they were built with, and at most ``API_CLIENT_POOL_SIZE``
+    of them are kept, discarding the least recently used ones first.
+    Pooling is disabled when ``API_CLIENT_POOL_SIZE`` is ``0``.
+    """
+    def __init__(self):
+        self._clients = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {'created': 0, 'reused': 0, 'expired': 0, 'evicted': 0}
+
+    @property
+    def enabled(self):
+        return bool(getattr(settings, 'API_CLIENT_POOL_SIZE', 0))
+
+    def _count(self, counter):
+        with self._lock:
+            self._stats[counter] += 1
+
+    def get(self, service, endpoint, token, factory, extra=()):
+        """Returns a pooled client, calling ``factory()`` to build it.
+
+        Clients are keyed by ``service``, ``endpoint``, the id of ``token``
+        and any other ``extra`` values the client was built with.
+        """
+        max_size = getattr(settings, 'API_CLIENT_POOL_SIZE', 0)
+        ttl = getattr(settings, 'API_CLIENT_POOL_TTL', 300)
+        remaining = _get_token_lifetime(token)
+        if remaining is not None:
+            ttl = min(ttl, remaining)
+        if not self.enabled or not token.id or ttl <= 0:
+            return factory()
+
+        key = (service, endpoint, token.id) + tuple(extra)
+        now = time.time()
+        with self._lock:
+            entry = self._clients.pop(key, None)
+            if entry is not None:
+                if entry[1] > now:
+                    # Move the client to the end of the LRU order.
+                    self._clients[key] = entry
+                    self._stats['reused'] += 1
+                    return entry[0]
+                self._stats['expired'] += 1
+
+        # Build the client outside of the lock, it may take a while.
+        LOG.debug("Creating a new pooled %s client for %s.", service, endpoint)
+        client = factory()
+        self._count('created')
+        with self._lock:
+            self._clients[key] = (client, now + ttl)
+            while len(self._clients) > max_size:
+                self._clients.popitem(last=False)
+                self._stats['evicted'] += 1
+        return client
+
+    def clear(self):
+        with self._lock:
+            self._clients.clear()
+
+    def stats(self):
+        """Returns the counters of the pool.
+
+        ``created`` is the number of clients, and so of new connections,
+        built for the pool and ``reused`` the number of times a pooled
+        client was handed out again.
+        """
+        with self._lock:
+            stats = dict(self._stats, size=len(self._clients))
+        lookups = stats['created'] + stats['reused']
+        stats['reuse_rate'] = (float(stats['reused']) / lookups
+                               if lookups else 0.0)
+        return stats
+
+
+def _get_token_lifetime(token):
+    expires = getattr(token, 'expires', None)
+    if expires is None:
+        return None
+    if expires.tzinfo:
+        now = datetime.datetime.now(expires.tzinfo)
+    else:
+        now = datetime.datetime.utcnow()
+    return (expires - now).total_seconds()
+
+
+CLIENT_POOL = ClientPool()
+
+
+def get_pooled_client(request, service, endpoint, factory, extra=()):
+    """Returns a client for ``service`` from the process-wide pool.
+
+    See :class:`ClientPool`; the client is looked up by the token of the
+    user of ``request``.
+    """
+    return CLIENT_POOL.get(service, endpoint, request.user.token, factory,
+                           extra=extra)
+
+
 def get_service_from_catalog(catalog, service_type):
     if catalog:
         for service in catalog:
@@ -11,13 +11,13 @@
 # under the License.
 
 from collections import OrderedDict
-import threading
+import logging
 
-from ceilometerclient import client as ceilometer_client
 from django.conf import settings
 from django.utils.translation import ugettext_lazy as _
 
 from horizon import exceptions
+from horizon.utils import concurrency
 from horizon.utils.memoized import memoized  # noqa
 
 from openstack_dashboard.api import base
@@ -25,6 +25,9 @@ from openstack_dashboard.api import keystone
 from openstack_dashboard.api import nova
 
 
+LOG = logging.getLogger(__name__)
+
+
 def get_flavor_names(request):
     # TODO(lsmola) The flavors can be set per project,
     # so it should show only valid ones.
@@ -270,6 +273,7 @@ class Statistic(base.APIResourceWrapper):
 @memoized
 def ceilometerclient(request):
     """Initialization of Ceilometer client."""
+    from ceilometerclient import client as ceilometer_client
 
     endpoint = base.url_for(request, 'metering')
     insecure = getattr(settings, 'OPENSTACK_SSL_NO_VERIFY', False)
@@ -306,72 +310,9 @@ def statistic_list(request, meter_name, query=None, period=None):
     return [Statistic(s) for s in statistics]
 
 
-class ThreadedUpdateResourceWithStatistics(threading.Thread):
-    """Multithread wrapper for update_with_statistics method of
-    resource_usage.
-
-    A join logic is placed in process_list class method. All resources
-    will have its statistics attribute filled in separate threads.
-
-    The resource_usage object is shared between threads. Each thread is
-    updating one Resource.
-
-    :Parameters:
-      - `resource`: Resource or ResourceAggregate object, that will
-                    be filled by statistic data.
-      - `resources`: List of Resource or ResourceAggregate object,
-                     that will be filled by statistic data.
-      - `resource_usage`: Wrapping resource usage object, that holds
-                          all statistics data.
-      - `meter_names`: List of meter names of the statistics we want.
-      - `period`: In seconds. If no period is given, only one aggregate
-                  statistic is returned. If given, a faceted result will be
-                  returned, divided into given periods. Periods with no
-                  data are ignored.
-      - `stats_attr`: String representing the attribute name of the stats.
-                      E.g. (avg, max, min...) If None is given, whole
-                      statistic object is returned,
-      - `additional_query`: Additional query for the statistics.
-                            E.g. timespan, etc.
-    """
-    # TODO(lsmola) Can be removed once Ceilometer supports sample-api
-    # and group-by, so all of this optimization will not be necessary.
-    # It is planned somewhere to I.
-
-    def __init__(self, resource_usage, resource, meter_names=None,
-                 period=None, filter_func=None, stats_attr=None,
-                 additional_query=None):
-        super(ThreadedUpdateResourceWithStatistics, self).__init__()
-        self.resource_usage = resource_usage
-        self.resource = resource
-        self.meter_names = meter_names
-        self.period = period
-        self.stats_attr = stats_attr
-        self.additional_query = additional_query
-
-    def run(self):
-        # Run the job
-        self.resource_usage.update_with_statistics(
-            self.resource,
-            meter_names=self.meter_names, period=self.period,
-            stats_attr=self.stats_attr, additional_query=self.additional_query)
-
-    @classmethod
-    def process_list(cls, resource_usage, resources, meter_names=None,
-                     period=None, filter_func=None, stats_attr=None,
-                     additional_query=None):
-        threads = []
-
-        for resource in resources:
-            # add statistics data into resource
-            thread = cls(resource_usage, resource, meter_names=meter_names,
-                         period=period, stats_attr=stats_attr,
-                         additional_query=additional_query)
-            thread.start()
-            threads.append(thread)
-
-        for thread in threads:
-            thread.join()
+def get_max_workers():
+    """Returns how many statistics queries may run at the same time."""
+    return getattr(settings, 'CEILOMETER_MAX_WORKERS', 10)
 
 
 class CeilometerUsage(object):
@@ -558,6 +499,15 @@ class CeilometerUsage(object):
             raise ValueError("meter_names and resources must be defined to be "
                              "able to obtain the statistics.")
 
+        query = self._get_statistics_query(resource, additional_query)
+        for meter in meter_names:
+            statistics = statistic_list(self._request, meter,
+                                        query=query, period=period)
+            self._set_statistics(resource, meter, statistics, stats_attr)
+
+        return resource
+
+    def _get_statistics_query(self, resource, additional_query=None):
         # query for identifying one resource in meters
         query = resource.query
         if additional_query:
@@ -565,29 +515,72 @@ class CeilometerUsage(object):
                 raise ValueError("Additional query must be list of"
                                  " conditions. See the docs for format.")
             query = query + additional_query
-
-        # TODO(lsmola) thread for each meter will be probably overkill
-        # but I should test lets say thread pool with 100 of threads
-        # and apply it only to this code.
-        # Though I do expect Ceilometer will support bulk requests,
-        # so all of this optimization will not be necessary.
-        for meter in meter_names:
-            statistics = statistic_list(self._request, meter,
-                                        query=query, period=period)
-            meter = meter.replace(".", "_")
-            if statistics:
-                if stats_attr:
-                    # I want to load only a specific attribute
-                    resource.set_meter(
-                        meter,
-                        getattr(statistics[0], stats_attr, None))
-                else:
-                    # I want a dictionary of all statistics
-                    resource.set_meter(meter, statistics)
+        return query
+
+    def _set_statistics(self, resource, meter, statistics, stats_attr=None):
+        meter = meter.replace(".", "_")
+        if statistics:
+            if stats_attr:
+                # I want to load only a specific attribute
+                resource.set_meter(
+                    meter,
+                    getattr(statistics[0], stats_attr, None))
             else:
-                resource.set_meter(meter, None)
+                # I want a dictionary of all statistics
+                resource.set_meter(meter, statistics)
+        else:
+            resource.set_meter(meter, None)
 
-        return resource
+    def update_resources_with_statistics(self, resources, meter_names=None,
+                                         period=None, stats_attr=None,
+                                         additional_query=None):
+        """Adding statistical data into many resources at once.
+
+        Same as :meth:`update_with_statistics`, except that the statistics
+        of every meter of every resource are queried concurrently, by at
+        most ``CEILOMETER_MAX_WORKERS`` threads. Queries which fail or don't
+        finish within the ``api_call_timeout`` leave the meter empty.
+        """
+        # TODO(lsmola) Can be removed once Ceilometer supports sample-api
+        # and group-by, so all of this optimization will not be necessary.
+        # The statistics API only accepts one meter per query, so there is
+        # one query per meter and resource.
+        resources = list(resources)
+        if not resources:
+            return resources
+        if not meter_names:
+            raise ValueError("meter_names and resources must be defined to be "
+                             "able to obtain the statistics.")
+
+        calls = []
+        for resource in resources:
+            query = self._get_statistics_query(resource, additional_query)
+            for meter in meter_names:
+                task = concurrency.Task(statistic_list,
+                                        args=(self._request, meter),
+                                        kwargs={'query': query,
+                                                'period': period},
+                                        name='statistic_list(%s)' % meter)
+                calls.append((resource, meter, task))
+        concurrency.execute([call[2] for call in calls],
+                            max_workers=get_max_workers())
+
+        timings = OrderedDict((meter, [0, 0.0]) for meter in meter_names)
+        for resource, meter, task in calls:
+            try:
+                statistics = task.get()
+            except Exception:
+                LOG.warning("Unable to retrieve statistics of meter %s.",
+                            meter, exc_info=True)
+                statistics = None
+            else:
+                timings[meter][0] += 1
+                timings[meter][1] += task.elapsed
+            self._set_statistics(resource, meter, statistics, stats_attr)
+        for meter, (count, elapsed) in timings.items():
+            LOG.debug("Retrieved %d statistics of meter %s in %.3fs.",
+                      count, meter, elapsed)
+        return resources
 
     def resources(self, query=None, filter_func=None,
                   with_users_and_tenants=False):
@@ -647,8 +640,8 @@ class CeilometerUsage(object):
             query, filter_func=filter_func,
             with_users_and_tenants=with_users_and_tenants)
 
-        ThreadedUpdateResourceWithStatistics.process_list(
-            self, resources,
+        self.update_resources_with_statistics(
+            resources,
             meter_names=meter_names, period=period, stats_attr=stats_attr,
             additional_query=additional_query)
 
@@ -696,8 +689,7 @@ class CeilometerUsage(object):
         """
         resource_aggregates = self.resource_aggregates(queries)
 
-        ThreadedUpdateResourceWithStatistics.process_list(
-            self,
+        self.update_resources_with_statistics(
             resource_aggregates, meter_names=meter_names, period=period,
             stats_attr=stats_attr, additional_query=additional_query)
 
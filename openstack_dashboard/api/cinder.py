@@ -27,10 +27,12 @@ from django.utils.translation import pgettext_lazy
 from django.utils.translation import ugettext_lazy as _
 
 from cinderclient.exceptions import ClientException  # noqa
-from cinderclient.v2.contrib import list_extensions as cinder_list_extensions
 
 from horizon import exceptions
+from horizon.utils import functions as utils
+from horizon.utils.memoized import invalidates  # noqa
 from horizon.utils.memoized import memoized  # noqa
+from horizon.utils.memoized import memoized_with_ttl  # noqa
 
 from openstack_dashboard.api import base
 from openstack_dashboard.api import nova
@@ -51,12 +53,9 @@ CONSUMER_CHOICES = (
 
 VERSIONS = base.APIVersionManager("volume", preferred_version=2)
 
-try:
-    from cinderclient.v2 import client as cinder_client_v2
-    VERSIONS.load_supported_version(2, {"client": cinder_client_v2,
-                                        "version": 2})
-except ImportError:
-    pass
+# The client module is imported when the version is first used.
+VERSIONS.load_supported_version(2, {"client": "cinderclient.v2.client",
+                                    "version": 2})
 
 
 class BaseCinderAPIResourceWrapper(base.APIResourceWrapper):
@@ -168,16 +167,22 @@ def cinderclient(request):
     except exceptions.ServiceCatalogException:
         LOG.debug('no volume service configured.')
         raise
-    c = api_version['client'].Client(request.user.username,
-                                     request.user.token.id,
-                                     project_id=request.user.tenant_id,
-                                     auth_url=cinder_url,
-                                     insecure=insecure,
-                                     cacert=cacert,
-                                     http_log_debug=settings.DEBUG)
-    c.client.auth_token = request.user.token.id
-    c.client.management_url = cinder_url
-    return c
+
+    def create_client():
+        c = api_version['client'].Client(request.user.username,
+                                         request.user.token.id,
+                                         project_id=request.user.tenant_id,
+                                         auth_url=cinder_url,
+                                         insecure=insecure,
+                                         cacert=cacert,
+                                         http_log_debug=settings.DEBUG)
+        c.client.auth_token = request.user.token.id
+        c.client.management_url = cinder_url
+        return c
+
+    return base.get_pooled_client(request, 'volume', cinder_url,
+                                  create_client,
+                                  extra=(api_version['version'],))
 
 
 def _replace_v2_parameters(data):
@@ -194,29 +199,90 @@ def version_get():
     return api_version['version']
 
 
-def volume_list(request, search_opts=None):
-    """To see all volumes in the cloud as an admin you can pass in a special
+def _update_pagination(entities, page_size, marker, sort_dir):
+    """Trims a page fetched with one extra entity and tells whether there
+    are pages after and before it, like ``glance.image_list_detailed``.
+
+    Pages walked backwards are fetched in ascending order; they are put
+    back in the usual descending order here.
+    """
+    has_more_data, has_prev_data = False, False
+    if len(entities) > page_size:
+        has_more_data = True
+        entities.pop()
+        if marker is not None:
+            has_prev_data = True
+    # first page condition when reached via prev back
+    elif sort_dir == 'asc' and marker is not None:
+        has_more_data = True
+    # last page condition
+    elif marker is not None:
+        has_prev_data = True
+
+    if sort_dir == 'asc':
+        entities.reverse()
+
+    return entities, has_more_data, has_prev_data
+
+
+def _list_paged(request, manager, search_opts, marker, paginate, sort_dir):
+    if VERSIONS.active > 1 and paginate:
+        page_size = utils.get_page_size(request)
+        # Pages are ordered by creation time, newest first.
+        entities = list(manager.list(search_opts=search_opts,
+                                     limit=page_size + 1,
+                                     marker=marker,
+                                     sort='created_at:' + sort_dir))
+        return _update_pagination(entities, page_size, marker, sort_dir)
+    return list(manager.list(search_opts=search_opts)), False, False
+
+
+def volume_list_paged(request, search_opts=None, marker=None, paginate=False,
+                      sort_dir="desc"):
+    """Returns a page of volumes along with whether there are more pages
+    after and before it.
+
+    To see all volumes in the cloud as an admin you can pass in a special
     search option: {'all_tenants': 1}
     """
-
     c_client = cinderclient(request)
     if c_client is None:
-        return []
+        return [], False, False
+
+    volumes, has_more_data, has_prev_data = _list_paged(
+        request, c_client.volumes, search_opts, marker, paginate, sort_dir)
+
+    # Only volumes being transferred have a transfer, so the transfers are
+    # only listed when the volumes retrieved include any.
+    transfers = {}
+    if any(v.status == 'awaiting-transfer' for v in volumes):
+        transfers = {t.volume_id: t
+                     for t in transfer_list(request, search_opts=search_opts)}
+    for v in volumes:
+        v.transfer = transfers.get(v.id)
 
-    # build a dictionary of volume_id -> transfer
-    transfers = {t.volume_id: t
-                 for t in transfer_list(request, search_opts=search_opts)}
+    return ([Volume(v) for v in volumes], has_more_data, has_prev_data)
 
-    volumes = []
-    for v in c_client.volumes.list(search_opts=search_opts):
-        v.transfer = transfers.get(v.id)
-        volumes.append(Volume(v))
 
+def volume_list(request, search_opts=None):
+    """To see all volumes in the cloud as an admin you can pass in a special
+    search option: {'all_tenants': 1}
+    """
+    volumes, has_more, has_prev = volume_list_paged(request,
+                                                    search_opts=search_opts)
     return volumes
 
 
-def volume_get(request, volume_id):
+def volume_get(request, volume_id, details=True):
+    """Returns a volume.
+
+    When ``details`` is false, the names of the instances the volume is
+    attached to and the transfer of the volume are not looked up.
+    """
     volume_data = cinderclient(request).volumes.get(volume_id)
+    if not details:
+        volume_data.transfer = None
+        return Volume(volume_data)
 
     for attachment in volume_data.attachments:
         if "server_id" in attachment:
@@ -238,6 +304,7 @@ def volume_get(request, volume_id):
     return Volume(volume_data)
 
 
+@invalidates(base.QUOTA_USAGES)
 def volume_create(request, size, name, description, volume_type,
                   snapshot_id=None, metadata=None, image_id=None,
                   availability_zone=None, source_volid=None):
@@ -255,10 +322,12 @@ def volume_create(request, size, name, description, volume_type,
     return Volume(volume)
 
 
+@invalidates(base.QUOTA_USAGES)
 def volume_extend(request, volume_id, new_size):
     return cinderclient(request).volumes.extend(volume_id, new_size)
 
 
+@invalidates(base.QUOTA_USAGES)
 def volume_delete(request, volume_id):
     return cinderclient(request).volumes.delete(volume_id)
 
@@ -310,14 +379,25 @@ def volume_snapshot_get(request, snapshot_id):
     return VolumeSnapshot(snapshot)
 
 
-def volume_snapshot_list(request, search_opts=None):
+def volume_snapshot_list_paged(request, search_opts=None, marker=None,
+                               paginate=False, sort_dir="desc"):
     c_client = cinderclient(request)
     if c_client is None:
-        return []
-    return [VolumeSnapshot(s) for s in c_client.volume_snapshots.list(
-        search_opts=search_opts)]
+        return [], False, False
+    snapshots, has_more_data, has_prev_data = _list_paged(
+        request, c_client.volume_snapshots, search_opts, marker, paginate,
+        sort_dir)
+    return ([VolumeSnapshot(s) for s in snapshots],
+            has_more_data, has_prev_data)
+
+
+def volume_snapshot_list(request, search_opts=None):
+    snapshots, has_more, has_prev = volume_snapshot_list_paged(
+        request, search_opts=search_opts)
+    return snapshots
 
 
+@invalidates(base.QUOTA_USAGES)
 def volume_snapshot_create(request, volume_id, name,
                            description=None, force=False):
     data = {'name': name,
@@ -329,6 +409,7 @@ def volume_snapshot_create(request, volume_id, name,
         volume_id, **data))
 
 
+@invalidates(base.QUOTA_USAGES)
 def volume_snapshot_delete(request, snapshot_id):
     return cinderclient(request).volume_snapshots.delete(snapshot_id)
 
@@ -363,11 +444,20 @@ def volume_backup_get(request, backup_id):
     return VolumeBackup(backup)
 
 
-def volume_backup_list(request):
+def volume_backup_list_paged(request, marker=None, paginate=False,
+                             sort_dir="desc"):
     c_client = cinderclient(request)
     if c_client is None:
-        return []
-    return [VolumeBackup(b) for b in c_client.backups.list()]
+        return [], False, False
+    backups, has_more_data, has_prev_data = _list_paged(
+        request, c_client.backups, None, marker, paginate, sort_dir)
+    return ([VolumeBackup(b) for b in backups],
+            has_more_data, has_prev_data)
+
+
+def volume_backup_list(request):
+    backups, has_more, has_prev = volume_backup_list_paged(request)
+    return backups
 
 
 def volume_backup_create(request,
@@ -425,6 +515,7 @@ def tenant_quota_get(request, tenant_id):
     return base.QuotaSet(c_client.quotas.get(tenant_id))
 
 
+@invalidates(base.QUOTA_USAGES)
 def tenant_quota_update(request, tenant_id, **kwargs):
     return cinderclient(request).quotas.update(tenant_id, **kwargs)
 
@@ -481,21 +572,26 @@ def volume_type_list(request):
     return cinderclient(request).volume_types.list()
 
 
+@invalidates('volume_type_default')
 def volume_type_create(request, name, description=None):
     return cinderclient(request).volume_types.create(name, description)
 
 
+@invalidates('volume_type_default')
 def volume_type_update(request, volume_type_id, name=None, description=None):
     return cinderclient(request).volume_types.update(volume_type_id,
                                                      name,
                                                      description)
 
 
-@memoized
+@memoized_with_ttl(600, scope='project', dump=base.dump_resources,
+                   load=base.resource_loader(
+                       lambda request: cinderclient(request).volume_types))
 def volume_type_default(request):
     return cinderclient(request).volume_types.default()
 
 
+@invalidates('volume_type_default')
 def volume_type_delete(request, volume_type_id):
     return cinderclient(request).volume_types.delete(volume_type_id)
 
@@ -619,13 +715,19 @@ def availability_zone_list(request, detailed=False):
     return cinderclient(request).availability_zones.list(detailed=detailed)
 
 
-@memoized
+def _list_extensions_manager(request):
+    from cinderclient.v2.contrib import list_extensions
+
+    return list_extensions.ListExtManager(cinderclient(request))
+
+
+@memoized_with_ttl(3600, scope='project', dump=base.dump_resources,
+                   load=base.resource_loader(_list_extensions_manager))
 def list_extensions(request):
-    return cinder_list_extensions.ListExtManager(cinderclient(request))\
-        .show_all()
+    return _list_extensions_manager(request).show_all()
 
 
-@memoized
+@memoized_with_ttl(3600, scope='project')
 def extension_supported(request, extension_name):
     """This method will determine if Cinder supports a given extension name.
     """
@@ -19,10 +19,12 @@
 from __future__ import absolute_import
 
 import collections
+import copy
 import itertools
 import json
 import logging
 import os
+import time
 
 
 from django.conf import settings
@@ -35,6 +37,8 @@ import glanceclient as glance_client
 from six.moves import _thread as thread
 
 from horizon.utils import functions as utils
+from horizon.utils.memoized import get_ttl_backend  # noqa
+from horizon.utils.memoized import invalidates  # noqa
 from horizon.utils.memoized import memoized  # noqa
 from openstack_dashboard.api import base
 
@@ -42,19 +46,11 @@ from openstack_dashboard.api import base
 LOG = logging.getLogger(__name__)
 VERSIONS = base.APIVersionManager("image", preferred_version=2)
 
-try:
-    from glanceclient.v2 import client as glance_client_v2
-    VERSIONS.load_supported_version(2, {"client": glance_client_v2,
-                                        "version": 2})
-except ImportError:
-    pass
-
-try:
-    from glanceclient.v1 import client as glance_client_v1
-    VERSIONS.load_supported_version(1, {"client": glance_client_v1,
-                                        "version": 1})
-except ImportError:
-    pass
+# The client modules are imported when their version is first used.
+VERSIONS.load_supported_version(2, {"client": "glanceclient.v2.client",
+                                    "version": 2})
+VERSIONS.load_supported_version(1, {"client": "glanceclient.v1.client",
+                                    "version": 1})
 
 
 @memoized
@@ -62,10 +58,16 @@ def glanceclient(request, version='1'):
     url = base.url_for(request, 'image')
     insecure = getattr(settings, 'OPENSTACK_SSL_NO_VERIFY', False)
     cacert = getattr(settings, 'OPENSTACK_SSL_CACERT', None)
-    return glance_client.Client(version, url, token=request.user.token.id,
-                                insecure=insecure, cacert=cacert)
 
+    def create_client():
+        return glance_client.Client(version, url, token=request.user.token.id,
+                                    insecure=insecure, cacert=cacert)
+
+    return base.get_pooled_client(request, 'image', url, create_client,
+                                  extra=(version,))
 
+
+@invalidates('image_index')
 def image_delete(request, image_id):
     return glanceclient(request).images.delete(image_id)
 
@@ -121,6 +123,211 @@ def image_list_detailed(request, marker=None, sort_dir='desc',
     return (images, has_more_data, has_prev_data)
 
 
+# Filters selecting the images of each partition of the image index. The
+# owner filter of the 'project' partition is filled in with the project id.
+IMAGE_INDEX_PARTITIONS = {
+    'visible': {},
+    'public': {"is_public": True, "status": "active"},
+    'project': {"property-owner_id": None, "status": "active"},
+}
+# Cached indexes are only refreshed incrementally for this many seconds
+# before they are rebuilt from a full listing.
+IMAGE_INDEX_MAX_AGE = 3600
+
+
+class ImageIndex(object):
+    """Images of one partition of the image catalog, keyed by their id.
+
+    Indexes are built by :func:`image_index`. Besides the image objects
+    themselves, which carry the name, ``container_format`` and
+    ``min_disk`` used by the instance views and workflows, an index keeps
+    what it needs to be brought up to date with the changes made to the
+    catalog since it was built.
+    """
+    def __init__(self, images=(), filters=None, generation=0):
+        self.filters = filters or {}
+        self.generation = generation
+        self.built = self.refreshed = time.time()
+        self._changes_since = time.strftime('%Y-%m-%dT%H:%M:%S',
+                                            time.gmtime(self.built))
+        self._images = collections.OrderedDict()
+        self._update(images)
+
+    def __contains__(self, image_id):
+        return image_id in self._images
+
+    def __iter__(self):
+        return iter(self._images.values())
+
+    def __len__(self):
+        return len(self._images)
+
+    @property
+    def images(self):
+        return list(self._images.values())
+
+    def get(self, image_id, default=None):
+        return self._images.get(image_id, default)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_images'] = [(type(image), image.to_dict())
+                            for image in self._images.values()]
+        return state
+
+    def __setstate__(self, state):
+        images = state.pop('_images')
+        self.__dict__.update(state)
+        self._images = collections.OrderedDict(
+            (info['id'], resource_class(None, info, loaded=True))
+            for resource_class, info in images)
+
+    def _update(self, images):
+        status = self.filters.get('status')
+        for image in images:
+            updated_at = getattr(image, 'updated_at', None)
+            if updated_at and updated_at > self._changes_since:
+                self._changes_since = updated_at
+            if (getattr(image, 'deleted', False) or
+                    (status and getattr(image, 'status', None) != status)):
+                self._images.pop(image.id, None)
+            else:
+                # Indexes are shared by users, so the images are copied
+                # without the manager, and thus the client and token, of
+                # the user who listed them; they only serve their data.
+                image = copy.copy(image)
+                image.manager = None
+                image.set_loaded(True)
+                self._images[image.id] = image
+
+    def refresh(self, request, generation=0):
+        """Returns a copy of the index including the changes made since it
+        was last refreshed.
+
+        Only the images changed since then are listed. They are requested
+        regardless of their status, so that images which were deleted or
+        deactivated are dropped from the index.
+        """
+        filters = dict((key, value) for key, value in self.filters.items()
+                       if key != 'status')
+        filters['changes-since'] = self._changes_since
+        changed, _more, _prev = image_list_detailed(request, filters=filters)
+        index = ImageIndex(filters=self.filters, generation=generation)
+        index.built = self.built
+        index._changes_since = self._changes_since
+        index._images.update(self._images)
+        index._update(changed)
+        return index
+
+
+def _get_image_index_ttl():
+    if not getattr(settings, 'MEMOIZED_CACHE_ENABLED', False):
+        return 0
+    ttls = getattr(settings, 'MEMOIZED_CACHE_TTLS', {})
+    return ttls.get('%s.image_index' % __name__, 300)
+
+
+def _get_image_index_key(request, partition, filters):
+    user = request.user
+    key = ['image-index', getattr(user, 'services_region', None), partition]
+    if partition == 'visible':
+        # Which images are listed depends on the project and on whether
+        # the user is an administrator.
+        key += [user.tenant_id, getattr(user, 'is_superuser', False)]
+    elif partition == 'project':
+        key.append(filters['property-owner_id'])
+    return ':'.join(str(part) for part in key)
+
+
+def _image_index_generation():
+    return get_ttl_backend().get('image-index-generation', 0)
+
+
+def image_index(request, partition='visible', project_id=None):
+    """Returns an :class:`ImageIndex` of a partition of the image catalog.
+
+    The partitions are ``'visible'``, every image the user can see,
+    ``'public'``, the active public images, and ``'project'``, the active
+    images owned by ``project_id``.
+
+    While the ``MEMOIZED_CACHE_ENABLED`` setting is ``True``, indexes are
+    shared between requests: public images by every user of a region and
+    the other partitions by the users of a project. Once an index is older
+    than its TTL (by default 300 seconds, which ``MEMOIZED_CACHE_TTLS`` may
+    override for ``openstack_dashboard.api.glance.image_index``) it is
+    refreshed with the images changed since, instead of listing all of them
+    again. Creating, updating or deleting an image through the dashboard
+    triggers the refresh right away.
+    """
+    filters = dict(IMAGE_INDEX_PARTITIONS[partition])
+    if partition == 'project':
+        filters['property-owner_id'] = project_id
+    ttl = _get_image_index_ttl()
+    if not ttl:
+        images, _more, _prev = _list_index_images(request, filters)
+        return ImageIndex(images, filters)
+
+    backend = get_ttl_backend()
+    key = _get_image_index_key(request, partition, filters)
+    generation = _image_index_generation()
+    index = backend.get(key)
+    now = time.time()
+    if index is None or now - index.built > IMAGE_INDEX_MAX_AGE:
+        images, _more, _prev = _list_index_images(request, filters)
+        index = ImageIndex(images, filters, generation)
+    elif now - index.refreshed > ttl or index.generation != generation:
+        index = index.refresh(request, generation)
+    else:
+        return index
+    try:
+        backend.set(key, index, IMAGE_INDEX_MAX_AGE)
+    except Exception:
+        LOG.warning("Unable to cache the image index %s.", key,
+                    exc_info=True)
+    return index
+
+
+def _invalidate_image_index():
+    backend = get_ttl_backend()
+    backend.add('image-index-generation', 0, None)
+    try:
+        backend.incr('image-index-generation')
+    except ValueError:
+        # The generation was evicted in the meantime.
+        backend.add('image-index-generation', 1, None)
+
+
+image_index.invalidate = _invalidate_image_index
+
+
+def _list_index_images(request, filters):
+    if filters:
+        return image_list_detailed(request, filters=filters)
+    return image_list_detailed(request)
+
+
+def image_index_lookup(request, image_id):
+    """Looks an image up in the cached indexes of the request's user.
+
+    No API call is made; ``None`` is returned when the image isn't in any
+    of them, or while the cache is disabled.
+    """
+    if not _get_image_index_ttl():
+        return None
+    backend = get_ttl_backend()
+    user = request.user
+    for partition, project_id in (('visible', None),
+                                  ('project', user.tenant_id),
+                                  ('public', None)):
+        filters = {"property-owner_id": project_id}
+        index = backend.get(_get_image_index_key(request, partition,
+                                                 filters))
+        if index is not None and image_id in index:
+            return index.get(image_id)
+    return None
+
+
+@invalidates('image_index')
 def image_update(request, image_id, **kwargs):
     image_data = kwargs.get('data', None)
     try:
@@ -139,6 +346,7 @@ def image_update(request, image_id, **kwargs):
                 LOG.warn(msg)
 
 
+@invalidates('image_index')
 def image_create(request, **kwargs):
     """Create image.
 
@@ -177,6 +385,7 @@ def image_create(request, **kwargs):
     return image
 
 
+@invalidates('image_index')
 def image_update_properties(request, image_id, remove_props=None, **kwargs):
     """Add or update a custom property of an image."""
     return glanceclient(request, '2').images.update(image_id,
@@ -184,6 +393,7 @@ def image_update_properties(request, image_id, remove_props=None, **kwargs):
                                                     **kwargs)
 
 
+@invalidates('image_index')
 def image_delete_properties(request, image_id, keys):
     """Delete custom properties for an image."""
     return glanceclient(request, '2').images.update(image_id, keys)
@@ -17,10 +17,6 @@ from six.moves.urllib import request
 from django.conf import settings
 from oslo_serialization import jsonutils
 
-from heatclient import client as heat_client
-from heatclient.common import template_format
-from heatclient.common import template_utils
-from heatclient.common import utils as heat_utils
 from horizon import exceptions
 from horizon.utils import functions as utils
 from horizon.utils.memoized import memoized  # noqa
@@ -37,6 +33,8 @@ def format_parameters(params):
 
 @memoized
 def heatclient(request, password=None):
+    from heatclient import client as heat_client
+
     api_version = "1"
     insecure = getattr(settings, 'OPENSTACK_SSL_NO_VERIFY', False)
     cacert = getattr(settings, 'OPENSTACK_SSL_CACERT', None)
@@ -114,6 +112,8 @@ def get_template_files(template_data=None, template_url=None):
         return {}, None
     if isinstance(tpl, six.binary_type):
         tpl = tpl.decode('utf-8')
+    from heatclient.common import template_format
+
     template = template_format.parse(tpl)
     files = {}
     _get_file_contents(template, files)
@@ -121,6 +121,9 @@ def get_template_files(template_data=None, template_url=None):
 
 
 def _get_file_contents(from_data, files):
+    from heatclient.common import template_utils
+    from heatclient.common import utils as heat_utils
+
     if not isinstance(from_data, (dict, list)):
         return
     if isinstance(from_data, dict):
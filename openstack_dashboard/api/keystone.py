@@ -32,7 +32,9 @@ from openstack_auth import utils as auth_utils
 
 from horizon import exceptions
 from horizon import messages
+from horizon.utils import concurrency
 from horizon.utils import functions as utils
+from horizon.utils.memoized import memoized  # noqa
 
 from openstack_dashboard.api import base
 from openstack_dashboard import policy
@@ -64,17 +66,9 @@ VERSIONS = IdentityAPIVersionManager(
 
 
 # Import from oldest to newest so that "preferred" takes correct precedence.
-try:
-    from keystoneclient.v2_0 import client as keystone_client_v2
-    VERSIONS.load_supported_version(2.0, {"client": keystone_client_v2})
-except ImportError:
-    pass
-
-try:
-    from keystoneclient.v3 import client as keystone_client_v3
-    VERSIONS.load_supported_version(3, {"client": keystone_client_v3})
-except ImportError:
-    pass
+# The client modules are imported when their version is first used.
+VERSIONS.load_supported_version(2.0, {"client": "keystoneclient.v2_0.client"})
+VERSIONS.load_supported_version(3, {"client": "keystoneclient.v3.client"})
 
 
 @six.python_2_unicode_compatible
@@ -142,7 +136,9 @@ def keystoneclient(request, admin=False):
     as a keyword argument.
 
     The client is cached so that subsequent API calls during the same
-    request/response cycle don't have to be re-authenticated.
+    request/response cycle don't have to be re-authenticated, and is shared
+    with other requests using the same token through the client pool (see
+    :class:`~openstack_dashboard.api.base.ClientPool`).
     """
     user = request.user
     if admin:
@@ -168,15 +164,25 @@ def keystoneclient(request, admin=False):
         endpoint = _get_endpoint_url(request, endpoint_type)
         insecure = getattr(settings, 'OPENSTACK_SSL_NO_VERIFY', False)
         cacert = getattr(settings, 'OPENSTACK_SSL_CACERT', None)
-        LOG.debug("Creating a new keystoneclient connection to %s." % endpoint)
         remote_addr = request.environ.get('REMOTE_ADDR', '')
-        conn = api_version['client'].Client(token=user.token.id,
-                                            endpoint=endpoint,
-                                            original_ip=remote_addr,
-                                            insecure=insecure,
-                                            cacert=cacert,
-                                            auth_url=endpoint,
-                                            debug=settings.DEBUG)
+
+        def create_client():
+            LOG.debug("Creating a new keystoneclient connection to %s."
+                      % endpoint)
+            return api_version['client'].Client(token=user.token.id,
+                                                endpoint=endpoint,
+                                                original_ip=remote_addr,
+                                                insecure=insecure,
+                                                cacert=cacert,
+                                                auth_url=endpoint,
+                                                debug=settings.DEBUG)
+
+        # The original IP is sent along with every call, so it is part of
+        # the key of the pooled client.
+        conn = base.get_pooled_client(request, 'identity', endpoint,
+                                      create_client,
+                                      extra=(VERSIONS.active,
+                                             remote_addr))
         setattr(request, cache_attr, conn)
     return conn
 
@@ -415,7 +421,7 @@ def user_update_password(request, user, password, admin=True):
 def user_verify_admin_password(request, admin_password):
     # attempt to create a new client instance with admin password to
     # verify if it's correct.
-    client = keystone_client_v2 if VERSIONS.active < 3 else keystone_client_v3
+    client = VERSIONS.get_active_version()['client']
     try:
         endpoint = _get_endpoint_url(request, 'internalURL')
         insecure = getattr(settings, 'OPENSTACK_SSL_NO_VERIFY', False)
@@ -472,12 +478,8 @@ def group_list(request, domain=None, project=None, user=None):
     groups = manager.list(user=user, domain=domain)
 
     if project:
-        project_groups = []
-        for group in groups:
-            roles = roles_for_group(request, group=group.id, project=project)
-            if roles and len(roles) > 0:
-                project_groups.append(group)
-        groups = project_groups
+        groups_roles = get_project_groups_roles(request, project)
+        groups = [group for group in groups if groups_roles.get(group.id)]
 
     return groups
 
@@ -511,8 +513,7 @@ def get_project_groups_roles(request, project):
 
     """
     groups_roles = collections.defaultdict(list)
-    project_role_assignments = role_assignments_list(request,
-                                                     project=project)
+    project_role_assignments = _project_role_assignments(request, project)
     for role_assignment in project_role_assignments:
         if not hasattr(role_assignment, 'group'):
             continue
@@ -522,6 +523,13 @@ def get_project_groups_roles(request, project):
     return groups_roles
 
 
+@memoized
+def _project_role_assignments(request, project):
+    # The users and the groups of a project are usually both needed, from
+    # the same role assignments listing.
+    return role_assignments_list(request, project=project)
+
+
 def role_assignments_list(request, project=None, user=None, role=None,
                           group=None, domain=None, effective=False):
     if VERSIONS.active < 3:
@@ -552,6 +560,7 @@ def role_delete(request, role_id):
     return manager.delete(role_id)
 
 
+@memoized
 def role_list(request):
     """Returns a global list of available roles."""
     return keystoneclient(request, admin=True).roles.list()
@@ -596,13 +605,17 @@ def get_project_users_roles(request, project):
     if VERSIONS.active < 3:
         project_users = user_list(request, project=project)
 
-        for user in project_users:
-            roles = roles_for_user(request, user.id, project)
-            roles_ids = [role.id for role in roles]
+        # There are no role assignments on Identity API v2, the roles of the
+        # users are looked up concurrently instead.
+        def get_roles(user):
+            return roles_for_user(request, user.id, project)
+        tasks = concurrency.map_concurrently(get_roles, project_users)
+        for user, task in zip(project_users, tasks):
+            roles_ids = [role.id for role in task.get()]
             users_roles[user.id].extend(roles_ids)
     else:
-        project_role_assignments = role_assignments_list(request,
-                                                         project=project)
+        project_role_assignments = _project_role_assignments(request,
+                                                             project)
         for role_assignment in project_role_assignments:
             if not hasattr(role_assignment, 'user'):
                 continue
@@ -612,6 +625,59 @@ def get_project_users_roles(request, project):
     return users_roles
 
 
+def get_role_changes(current, desired):
+    """Computes the roles to grant and to revoke to get from the ``current``
+    role assignments to the ``desired`` ones.
+
+    Both are mappings of user or group ids to the ids of their roles. Returns
+    the lists of ``(user or group id, role id)`` pairs to grant and to revoke.
+    """
+    def pairs(actors_roles):
+        return set((actor_id, role_id)
+                   for actor_id, roles_ids in actors_roles.items()
+                   for role_id in roles_ids)
+    current, desired = pairs(current), pairs(desired)
+    return sorted(desired - current), sorted(current - desired)
+
+
+def update_project_roles(request, project, current, desired, group=False):
+    """Updates the roles of the users, or the groups, of a project.
+
+    Only the roles which differ between the ``current`` and the ``desired``
+    role assignments, as given to :func:`get_role_changes`, are granted or
+    revoked, concurrently. All the changes are attempted even if some of
+    them fail; a list of ``(user or group id, role id, exc_info)`` tuples
+    is returned for the failed ones.
+    """
+    to_grant, to_revoke = get_role_changes(current, desired)
+    if group:
+        actor = 'group'
+        funcs = {'grant': add_group_role, 'revoke': remove_group_role}
+    else:
+        actor = 'user'
+        funcs = {'grant': add_tenant_user_role,
+                 'revoke': remove_tenant_user_role}
+    changes = ([('grant', actor_id, role_id)
+                for actor_id, role_id in to_grant] +
+               [('revoke', actor_id, role_id)
+                for actor_id, role_id in to_revoke])
+
+    def apply_change(change):
+        action, actor_id, role_id = change
+        return funcs[action](request, project=project, role=role_id,
+                             **{actor: actor_id})
+
+    tasks = concurrency.map_concurrently(apply_change, changes)
+    failures = []
+    for (action, actor_id, role_id), task in zip(changes, tasks):
+        if task.exc_info:
+            LOG.warning('Unable to %s role %s for %s %s on project %s: %s',
+                        action, role_id, actor, actor_id, project,
+                        task.exc_info[1])
+            failures.append((actor_id, role_id, task.exc_info))
+    return failures
+
+
 def add_tenant_user_role(request, project=None, user=None, role=None,
                          group=None, domain=None):
     """Adds a role for a user on a tenant."""
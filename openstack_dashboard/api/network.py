@@ -19,6 +19,8 @@ introduced to abstract the differences between them for seamless consumption by
 different dashboard implementations.
 """
 
+from horizon.utils.memoized import invalidates  # noqa
+
 from openstack_dashboard.api import base
 from openstack_dashboard.api import neutron
 from openstack_dashboard.api import nova
@@ -52,10 +54,12 @@ def tenant_floating_ip_get(request, floating_ip_id):
     return NetworkClient(request).floating_ips.get(floating_ip_id)
 
 
+@invalidates(base.QUOTA_USAGES)
 def tenant_floating_ip_allocate(request, pool=None):
     return NetworkClient(request).floating_ips.allocate(pool)
 
 
+@invalidates(base.QUOTA_USAGES)
 def tenant_floating_ip_release(request, floating_ip_id):
     return NetworkClient(request).floating_ips.release(floating_ip_id)
 
@@ -99,10 +103,12 @@ def security_group_get(request, sg_id):
     return NetworkClient(request).secgroups.get(sg_id)
 
 
+@invalidates(base.QUOTA_USAGES)
 def security_group_create(request, name, desc):
     return NetworkClient(request).secgroups.create(name, desc)
 
 
+@invalidates(base.QUOTA_USAGES)
 def security_group_delete(request, sg_id):
     return NetworkClient(request).secgroups.delete(sg_id)
 
@@ -31,7 +31,10 @@ from neutronclient.v2_0 import client as neutron_client
 import six
 
 from horizon import messages
+from horizon.utils import concurrency
+from horizon.utils.memoized import invalidates  # noqa
 from horizon.utils.memoized import memoized  # noqa
+from horizon.utils.memoized import memoized_with_ttl  # noqa
 from openstack_dashboard.api import base
 from openstack_dashboard.api import network_base
 from openstack_dashboard.api import nova
@@ -533,11 +536,16 @@ def get_ipver_str(ip_version):
 def neutronclient(request):
     insecure = getattr(settings, 'OPENSTACK_SSL_NO_VERIFY', False)
     cacert = getattr(settings, 'OPENSTACK_SSL_CACERT', None)
-    c = neutron_client.Client(token=request.user.token.id,
-                              auth_url=base.url_for(request, 'identity'),
-                              endpoint_url=base.url_for(request, 'network'),
-                              insecure=insecure, ca_cert=cacert)
-    return c
+    url = base.url_for(request, 'network')
+
+    def create_client():
+        return neutron_client.Client(
+            token=request.user.token.id,
+            auth_url=base.url_for(request, 'identity'),
+            endpoint_url=url,
+            insecure=insecure, ca_cert=cacert)
+
+    return base.get_pooled_client(request, 'network', url, create_client)
 
 
 def list_resources_with_long_filters(list_method,
@@ -587,25 +595,35 @@ def list_resources_with_long_filters(list_method,
         filter_maxlen = len(filter_attr) + val_maxlen + 2
         chunk_size = allowed_filter_len / filter_maxlen
 
+        # The chunks are independent of each other, so request them
+        # concurrently.
+        def list_chunk(values):
+            chunk_params = dict(params)
+            chunk_params[filter_attr] = values
+            return list_method(**chunk_params)
+
+        chunks = [filter_values[i:i + chunk_size]
+                  for i in range(0, len(filter_values), chunk_size)]
         resources = []
-        for i in range(0, len(filter_values), chunk_size):
-            params[filter_attr] = filter_values[i:i + chunk_size]
-            resources.extend(list_method(**params))
+        for task in concurrency.map_concurrently(list_chunk, chunks):
+            resources.extend(task.get())
         return resources
 
 
 def network_list(request, **params):
     LOG.debug("network_list(): params=%s", params)
+    expand_subnet = params.pop('expand_subnet', True)
     networks = neutronclient(request).list_networks(**params).get('networks')
-    # Get subnet list to expand subnet info in network list.
-    subnets = subnet_list(request)
-    subnet_dict = dict([(s['id'], s) for s in subnets])
-    # Expand subnet list from subnet_id to values.
-    for n in networks:
-        # Due to potential timing issues, we can't assume the subnet_dict data
-        # is in sync with the network data.
-        n['subnets'] = [subnet_dict[s] for s in n.get('subnets', []) if
-                        s in subnet_dict]
+    if expand_subnet:
+        # Get subnet list to expand subnet info in network list.
+        subnets = subnet_list(request)
+        subnet_dict = dict([(s['id'], s) for s in subnets])
+        # Expand subnet list from subnet_id to values.
+        for n in networks:
+            # Due to potential timing issues, we can't assume the subnet_dict
+            # data is in sync with the network data.
+            n['subnets'] = [subnet_dict[s] for s in n.get('subnets', []) if
+                            s in subnet_dict]
     return [Network(n) for n in networks]
 
 
@@ -645,6 +663,7 @@ def network_get(request, network_id, expand_subnet=True, **params):
     return Network(network)
 
 
+@invalidates(base.QUOTA_USAGES)
 def network_create(request, **kwargs):
     """Create a  network object.
 
@@ -672,6 +691,7 @@ def network_update(request, network_id, **kwargs):
     return Network(network)
 
 
+@invalidates(base.QUOTA_USAGES)
 def network_delete(request, network_id):
     LOG.debug("network_delete(): netid=%s" % network_id)
     neutronclient(request).delete_network(network_id)
@@ -690,6 +710,7 @@ def subnet_get(request, subnet_id, **params):
     return Subnet(subnet)
 
 
+@invalidates(base.QUOTA_USAGES)
 def subnet_create(request, network_id, **kwargs):
     """Create a subnet on a specified network.
 
@@ -726,6 +747,7 @@ def subnet_update(request, subnet_id, **kwargs):
     return Subnet(subnet)
 
 
+@invalidates(base.QUOTA_USAGES)
 def subnet_delete(request, subnet_id):
     LOG.debug("subnet_delete(): subnetid=%s" % subnet_id)
     neutronclient(request).delete_subnet(subnet_id)
@@ -912,6 +934,7 @@ def profile_bindings_list(request, type_p, **params):
     return [Profile(n) for n in bindings]
 
 
+@invalidates(base.QUOTA_USAGES)
 def router_create(request, **kwargs):
     LOG.debug("router_create():, kwargs=%s" % kwargs)
     body = {'router': {}}
@@ -941,6 +964,7 @@ def router_list(request, **params):
     return [Router(r) for r in routers]
 
 
+@invalidates(base.QUOTA_USAGES)
 def router_delete(request, router_id):
     neutronclient(request).delete_router(router_id)
 
@@ -1010,6 +1034,7 @@ def tenant_quota_get(request, tenant_id):
     return base.QuotaSet(neutronclient(request).show_quota(tenant_id)['quota'])
 
 
+@invalidates(base.QUOTA_USAGES)
 def tenant_quota_update(request, tenant_id, **kwargs):
     quotas = {'quota': kwargs}
     return neutronclient(request).update_quota(tenant_id, quotas)
@@ -1041,6 +1066,35 @@ def provider_list(request):
     return providers['service_providers']
 
 
+def _network_names(request, network_ids):
+    # Only the names are needed, so don't expand the subnets of the
+    # networks like network_list() does.
+    def list_networks(**params):
+        return neutronclient(request).list_networks(
+            **params).get('networks')
+
+    if not network_ids:
+        return {}
+    networks = list_resources_with_long_filters(
+        list_networks, 'id', network_ids, fields=['id', 'name'])
+    return dict((network['id'], network['name']) for network in networks)
+
+
+def _floating_ips_by_port(request, port_ids, all_tenants=False):
+    # Unlike FloatingIpManager.list(), this doesn't look up the ports
+    # of the floating IPs, which the caller already has.
+    def list_floating_ips(**params):
+        return neutronclient(request).list_floatingips(
+            **params).get('floatingips')
+
+    params = {}
+    if not all_tenants:
+        params['tenant_id'] = request.user.tenant_id
+    floating_ips = list_resources_with_long_filters(
+        list_floating_ips, 'port_id', port_ids, **params)
+    return [FloatingIp(fip) for fip in floating_ips]
+
+
 def servers_update_addresses(request, servers, all_tenants=False):
     """Retrieve servers networking information from Neutron if enabled.
 
@@ -1048,21 +1102,23 @@ def servers_update_addresses(request, servers, all_tenants=False):
        and Nova's networking info caching mechanism is not fast enough.
     """
 
-    # Get all (filtered for relevant servers) information from Neutron
+    # Get all (filtered for relevant servers) information from Neutron.
+    # The networks and floating IPs of the ports are fetched concurrently
+    # once the ports are known.
     try:
         ports = list_resources_with_long_filters(
             port_list, 'device_id', [instance.id for instance in servers],
             request=request)
-        fips = FloatingIpManager(request)
-        if fips.is_supported():
-            floating_ips = list_resources_with_long_filters(
-                fips.list, 'port_id', [port.id for port in ports],
-                all_tenants=all_tenants)
-        else:
-            floating_ips = []
-        networks = list_resources_with_long_filters(
-            network_list, 'id', set([port.network_id for port in ports]),
-            request=request)
+        tasks = [concurrency.Task(
+            _network_names,
+            args=(request, set(port.network_id for port in ports)))]
+        if FloatingIpManager(request).is_supported() and ports:
+            tasks.append(concurrency.Task(
+                _floating_ips_by_port,
+                args=(request, [port.id for port in ports], all_tenants)))
+        tasks = concurrency.execute(tasks)
+        network_names = tasks[0].get()
+        floating_ips = tasks[1].get() if len(tasks) > 1 else []
     except Exception:
         error_message = _('Unable to connect to Neutron.')
         LOG.error(error_message)
@@ -1079,9 +1135,9 @@ def servers_update_addresses(request, servers, all_tenants=False):
     for fip in floating_ips:
         ports_floating_ips[fip.port_id].append(fip)
 
-    # Map network id to its name
-    network_names = dict(((network.id, network.name) for network in networks))
-
+    # IP versions, shared by all servers so that each address is only
+    # parsed once.
+    ip_versions = {}
     for server in servers:
         try:
             addresses = _server_get_addresses(
@@ -1089,22 +1145,31 @@ def servers_update_addresses(request, servers, all_tenants=False):
                 server,
                 instances_ports,
                 ports_floating_ips,
-                network_names)
+                network_names,
+                ip_versions)
         except Exception as e:
             LOG.error(e)
         else:
             server.addresses = addresses
 
 
-def _server_get_addresses(request, server, ports, floating_ips, network_names):
+def _server_get_addresses(request, server, ports, floating_ips, network_names,
+                          ip_versions=None):
+    if ip_versions is None:
+        ip_versions = {}
+
     def _format_address(mac, ip, type):
         try:
-            version = netaddr.IPAddress(ip).version
-        except Exception as e:
-            error_message = _('Unable to parse IP address %s.') % ip
-            LOG.error(error_message)
-            messages.error(request, error_message)
-            raise e
+            version = ip_versions[ip]
+        except KeyError:
+            try:
+                version = netaddr.IPAddress(ip).version
+            except Exception as e:
+                error_message = _('Unable to parse IP address %s.') % ip
+                LOG.error(error_message)
+                messages.error(request, error_message)
+                raise e
+            ip_versions[ip] = version
         return {u'OS-EXT-IPS-MAC:mac_addr': mac,
                 u'version': version,
                 u'addr': ip,
@@ -1130,7 +1195,7 @@ def _server_get_addresses(request, server, ports, floating_ips, network_names):
     return dict(addresses)
 
 
-@memoized
+@memoized_with_ttl(3600, scope='project')
 def list_extensions(request):
     extensions_list = neutronclient(request).list_extensions()
     if 'extensions' in extensions_list:
@@ -1139,7 +1204,7 @@ def list_extensions(request):
         return {}
 
 
-@memoized
+@memoized_with_ttl(3600, scope='project')
 def is_extension_supported(request, extension_alias):
     extensions = list_extensions(request)
 
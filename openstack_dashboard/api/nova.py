@@ -37,7 +37,9 @@ from novaclient.v2 import servers as nova_servers
 
 from horizon import conf
 from horizon.utils import functions as utils
+from horizon.utils.memoized import invalidates  # noqa
 from horizon.utils.memoized import memoized  # noqa
+from horizon.utils.memoized import memoized_with_ttl  # noqa
 
 from openstack_dashboard.api import base
 from openstack_dashboard.api import network_base
@@ -117,6 +119,9 @@ class Server(base.APIResourceWrapper):
             return self.image.name
         if 'name' in self.image:
             return self.image['name']
+        image = glance.image_index_lookup(self.request, self.image['id'])
+        if image is not None:
+            return image.name
         else:
             try:
                 image = glance.image_get(self.request, self.image['id'])
@@ -449,17 +454,24 @@ class FloatingIpManager(network_base.FloatingIpManager):
 def novaclient(request):
     insecure = getattr(settings, 'OPENSTACK_SSL_NO_VERIFY', False)
     cacert = getattr(settings, 'OPENSTACK_SSL_CACERT', None)
-    c = nova_client.Client(VERSIONS.get_active_version()['version'],
-                           request.user.username,
-                           request.user.token.id,
-                           project_id=request.user.tenant_id,
-                           auth_url=base.url_for(request, 'compute'),
-                           insecure=insecure,
-                           cacert=cacert,
-                           http_log_debug=settings.DEBUG)
-    c.client.auth_token = request.user.token.id
-    c.client.management_url = base.url_for(request, 'compute')
-    return c
+    url = base.url_for(request, 'compute')
+    version = VERSIONS.get_active_version()['version']
+
+    def create_client():
+        c = nova_client.Client(version,
+                               request.user.username,
+                               request.user.token.id,
+                               project_id=request.user.tenant_id,
+                               auth_url=url,
+                               insecure=insecure,
+                               cacert=cacert,
+                               http_log_debug=settings.DEBUG)
+        c.client.auth_token = request.user.token.id
+        c.client.management_url = url
+        return c
+
+    return base.get_pooled_client(request, 'compute', url, create_client,
+                                  extra=(version,))
 
 
 def server_vnc_console(request, instance_id, console_type='novnc'):
@@ -482,6 +494,7 @@ def server_serial_console(request, instance_id, console_type='serial'):
         instance_id, console_type)['console'])
 
 
+@invalidates('flavor_list')
 def flavor_create(request, name, memory, vcpu, disk, flavorid='auto',
                   ephemeral=0, swap=0, metadata=None, is_public=True):
     flavor = novaclient(request).flavors.create(name, memory, vcpu, disk,
@@ -493,6 +506,7 @@ def flavor_create(request, name, memory, vcpu, disk, flavorid='auto',
     return flavor
 
 
+@invalidates('flavor_list')
 def flavor_delete(request, flavor_id):
     novaclient(request).flavors.delete(flavor_id)
 
@@ -504,7 +518,23 @@ def flavor_get(request, flavor_id, get_extras=False):
     return flavor
 
 
-@memoized
+def _dump_flavors(flavors):
+    return [(flavor.to_dict(), getattr(flavor, 'extras', None))
+            for flavor in flavors]
+
+
+def _load_flavors(data, request, *args, **kwargs):
+    manager = novaclient(request).flavors
+    flavors = []
+    for info, extras in data:
+        flavor = manager.resource_class(manager, info, loaded=True)
+        if extras is not None:
+            flavor.extras = extras
+        flavors.append(flavor)
+    return flavors
+
+
+@memoized_with_ttl(600, dump=_dump_flavors, load=_load_flavors)
 def flavor_list(request, is_public=True, get_extras=False):
     """Get the list of available instance sizes (flavors)."""
     flavors = novaclient(request).flavors.list(is_public=is_public)
@@ -520,12 +550,14 @@ def flavor_access_list(request, flavor=None):
     return novaclient(request).flavor_access.list(flavor=flavor)
 
 
+@invalidates('flavor_list')
 def add_tenant_to_flavor(request, flavor, tenant):
     """Add a tenant to the given flavor access list."""
     return novaclient(request).flavor_access.add_tenant_access(
         flavor=flavor, tenant=tenant)
 
 
+@invalidates('flavor_list')
 def remove_tenant_from_flavor(request, flavor, tenant):
     """Remove a tenant from the given flavor access list."""
     return novaclient(request).flavor_access.remove_tenant_access(
@@ -543,12 +575,14 @@ def flavor_get_extras(request, flavor_id, raw=False, flavor=None):
             key, value in extras.items()]
 
 
+@invalidates('flavor_list')
 def flavor_extra_delete(request, flavor_id, keys):
     """Unset the flavor extra spec keys."""
     flavor = novaclient(request).flavors.get(flavor_id)
     return flavor.unset_keys(keys)
 
 
+@invalidates('flavor_list')
 def flavor_extra_set(request, flavor_id, metadata):
     """Set the flavor extra spec keys."""
     flavor = novaclient(request).flavors.get(flavor_id)
@@ -581,6 +615,7 @@ def keypair_get(request, keypair_id):
     return novaclient(request).keypairs.get(keypair_id)
 
 
+@invalidates(base.QUOTA_USAGES)
 def server_create(request, name, image, flavor, key_name, user_data,
                   security_groups, block_device_mapping=None,
                   block_device_mapping_v2=None, nics=None,
@@ -597,6 +632,7 @@ def server_create(request, name, image, flavor, key_name, user_data,
         meta=meta), request)
 
 
+@invalidates(base.QUOTA_USAGES)
 def server_delete(request, instance):
     novaclient(request).servers.delete(instance)
 
@@ -691,15 +727,18 @@ def server_live_migrate(request, instance_id, host, block_migration=False,
                                              disk_over_commit)
 
 
+@invalidates(base.QUOTA_USAGES)
 def server_resize(request, instance_id, flavor, disk_config=None, **kwargs):
     novaclient(request).servers.resize(instance_id, flavor,
                                        disk_config, **kwargs)
 
 
+@invalidates(base.QUOTA_USAGES)
 def server_confirm_resize(request, instance_id):
     novaclient(request).servers.confirm_resize(instance_id)
 
 
+@invalidates(base.QUOTA_USAGES)
 def server_revert_resize(request, instance_id):
     novaclient(request).servers.revert_resize(instance_id)
 
@@ -724,6 +763,7 @@ def tenant_quota_get(request, tenant_id):
     return base.QuotaSet(novaclient(request).quotas.get(tenant_id))
 
 
+@invalidates(base.QUOTA_USAGES)
 def tenant_quota_update(request, tenant_id, **kwargs):
     novaclient(request).quotas.update(tenant_id, **kwargs)
 
@@ -948,7 +988,10 @@ def interface_detach(request, server, port_id):
     return novaclient(request).servers.interface_detach(server, port_id)
 
 
-@memoized
+@memoized_with_ttl(3600, scope='project', dump=base.dump_resources,
+                   load=base.resource_loader(
+                       lambda request: nova_list_extensions.ListExtManager(
+                           novaclient(request))))
 def list_extensions(request):
     """List all nova extensions, except the ones in the blacklist."""
 
@@ -961,7 +1004,7 @@ def list_extensions(request):
     ]
 
 
-@memoized
+@memoized_with_ttl(3600, scope='project')
 def extension_supported(extension_name, request):
     """Determine if nova supports a given extension name.
 
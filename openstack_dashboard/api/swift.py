@@ -16,7 +16,17 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import collections
+import json
+import logging
+import re
+import sys
+import threading
+import uuid
+
 from oslo_utils import timeutils
+import requests
+import six
 import six.moves.urllib.parse as urlparse
 import swiftclient
 
@@ -24,13 +34,26 @@ from django.conf import settings
 from django.utils.translation import ugettext_lazy as _
 
 from horizon import exceptions
+from horizon.utils import concurrency
 from horizon.utils.memoized import memoized  # noqa
 
 from openstack_dashboard.api import base
 
 
+LOG = logging.getLogger(__name__)
+
 FOLDER_DELIMITER = "/"
 CHUNK_SIZE = getattr(settings, 'SWIFT_FILE_TRANSFER_CHUNK_SIZE', 512 * 1024)
+# Files larger than this are stored as static large objects made of
+# segments of this size, in a container named after the target container.
+SEGMENT_SIZE = getattr(settings, 'SWIFT_UPLOAD_SEGMENT_SIZE',
+                       16 * 1024 * 1024)
+SEGMENTS_CONTAINER_SUFFIX = "_segments"
+# Number of segments of a download fetched ahead while the current one is
+# sent; 0 streams the object from a single request.
+DOWNLOAD_PREFETCH = getattr(settings, 'SWIFT_DOWNLOAD_PREFETCH', 0)
+DOWNLOAD_SEGMENT_SIZE = getattr(settings, 'SWIFT_DOWNLOAD_SEGMENT_SIZE',
+                                8 * 1024 * 1024)
 # Swift ACL
 GLOBAL_READ_ACL = ".r:*"
 LIST_CONTENTS_ACL = ".rlistings"
@@ -103,12 +126,18 @@ def _metadata_to_header(metadata):
     return headers
 
 
-@memoized
-def swift_api(request):
+def _create_session():
+    session = requests.Session()
+    # Like swiftclient, don't send the default headers of requests.
+    session.headers = None
+    return session
+
+
+def _swift_connection(request):
     endpoint = base.url_for(request, 'object-store')
     cacert = getattr(settings, 'OPENSTACK_SSL_CACERT', None)
     insecure = getattr(settings, 'OPENSTACK_SSL_NO_VERIFY', False)
-    return swiftclient.client.Connection(None,
+    conn = swiftclient.client.Connection(None,
                                          request.user.username,
                                          None,
                                          preauthtoken=request.user.token.id,
@@ -116,6 +145,20 @@ def swift_api(request):
                                          cacert=cacert,
                                          insecure=insecure,
                                          auth_version="2.0")
+    if base.CLIENT_POOL.enabled:
+        # Connections are not thread-safe, so only their keep-alive HTTP
+        # session is shared with other requests and threads.
+        session = base.get_pooled_client(request, 'object-store', endpoint,
+                                         _create_session)
+        parsed, http_conn = conn.http_connection()
+        http_conn.request_session = session
+        conn.http_conn = parsed, http_conn
+    return conn
+
+
+@memoized
+def swift_api(request):
+    return _swift_connection(request)
 
 
 def swift_container_exists(request, container_name):
@@ -137,8 +180,7 @@ def swift_object_exists(request, container_name, object_name):
 def swift_get_containers(request, marker=None):
     limit = getattr(settings, 'API_RESULT_LIMIT', 1000)
     headers, containers = swift_api(request).get_account(limit=limit + 1,
-                                                         marker=marker,
-                                                         full_listing=True)
+                                                         marker=marker)
     container_objs = [Container(c) for c in containers]
     if(len(container_objs) > limit):
         return (container_objs[0:-1], True)
@@ -212,8 +254,7 @@ def swift_get_objects(request, container_name, prefix=None, marker=None,
     kwargs = dict(prefix=prefix,
                   marker=marker,
                   limit=limit + 1,
-                  delimiter=FOLDER_DELIMITER,
-                  full_listing=True)
+                  delimiter=FOLDER_DELIMITER)
     headers, objects = swift_api(request).get_container(container_name,
                                                         **kwargs)
     object_objs = _objectify(objects, container_name)
@@ -224,39 +265,63 @@ def swift_get_objects(request, container_name, prefix=None, marker=None,
         return (object_objs, False)
 
 
+def _iter_listing(request, container_name, prefix=None, marker=None,
+                  page_size=None):
+    """Yields the listing of a container one page at a time.
+
+    Each page is requested from Swift with the name of the last item of the
+    previous one as marker, so only the pages which are consumed are
+    fetched.
+    """
+    page_size = page_size or getattr(settings, 'API_RESULT_LIMIT', 1000)
+    while True:
+        headers, items = swift_api(request).get_container(
+            container_name, prefix=prefix, marker=marker, limit=page_size,
+            delimiter=FOLDER_DELIMITER)
+        if not items:
+            return
+        yield items
+        if len(items) < page_size:
+            return
+        last = items[-1]
+        marker = last.get('subdir') or last['name']
+
+
+def _compile_wildcard(q):
+    """Compiles a wildcard pattern into a case insensitive matcher.
+
+    ``*`` matches any sequence of characters, and the pattern matches
+    anywhere in a name, like :func:`wildcard_search`.
+    """
+    pattern = '.*'.join(re.escape(part) for part in q.split('*'))
+    return re.compile(pattern, re.IGNORECASE | re.DOTALL | re.UNICODE).search
+
+
 def swift_filter_objects(request, filter_string, container_name, prefix=None,
-                         marker=None):
-    # FIXME(kewu): Swift currently has no real filtering API, thus the marker
-    # parameter here won't actually help the pagination. For now I am just
-    # getting the largest number of objects from a container and filtering
-    # based on those objects.
-    limit = 9999
-    objects = swift_get_objects(request,
-                                container_name,
-                                prefix=prefix,
-                                marker=marker,
-                                limit=limit)
-    filter_string_list = filter_string.lower().strip().split(' ')
-
-    def matches_filter(obj):
-        for q in filter_string_list:
-            return wildcard_search(obj.name.lower(), q)
-
-    return filter(matches_filter, objects[0])
+                         marker=None, limit=None):
+    """Returns the objects of a folder whose name matches ``filter_string``.
+
+    The filter string holds one or more wildcard patterns separated by
+    spaces, all of which have to match. Swift has no filtering API, so the
+    folder is listed page by page and the listing stops once ``limit``
+    objects have matched.
+    """
+    limit = limit or getattr(settings, 'API_RESULT_LIMIT', 1000)
+    matchers = [_compile_wildcard(q)
+                for q in filter_string.strip().split(' ') if q]
+    matches = []
+    for items in _iter_listing(request, container_name, prefix=prefix,
+                               marker=marker):
+        for obj in _objectify(items, container_name):
+            if all(match(obj.name) for match in matchers):
+                matches.append(obj)
+                if len(matches) == limit:
+                    return matches
+    return matches
 
 
 def wildcard_search(string, q):
-    q_list = q.split('*')
-    if all(map(lambda x: x == '', q_list)):
-        return True
-    elif q_list[0] not in string:
-        return False
-    else:
-        if q_list[0] == '':
-            tail = string
-        else:
-            head, delimiter, tail = string.partition(q_list[0])
-        return wildcard_search(tail, '*'.join(q_list[1:]))
+    return _compile_wildcard(q)(string) is not None
 
 
 def swift_copy_object(request, orig_container_name, orig_object_name,
@@ -272,9 +337,169 @@ def swift_copy_object(request, orig_container_name, orig_object_name,
                                          headers=headers)
 
 
+class SegmentedUpload(object):
+    """Stores a file in Swift segment by segment while it is received.
+
+    Data passed to :meth:`write` is buffered until it fills a segment of
+    ``segment_size`` bytes, which is then stored by a separate thread while
+    the next one is received. At most ``max_workers`` segments are stored
+    at the same time; further writes wait for one of them to finish, which
+    bounds the memory used by an upload. Once :meth:`close` has returned,
+    :func:`swift_upload_object` stores the manifest of the static large
+    object.
+    """
+    def __init__(self, request, container_name, segment_size=None,
+                 max_workers=None):
+        self.request = request
+        self.segments_container = container_name + SEGMENTS_CONTAINER_SUFFIX
+        self.prefix = uuid.uuid4().hex
+        self.segment_size = segment_size or SEGMENT_SIZE
+        if max_workers is None:
+            max_workers = getattr(settings, 'SWIFT_UPLOAD_MAX_WORKERS', 4)
+        self.size = 0
+        self.segments = []
+        self.stored = False
+        self.exc_info = None
+        self._buffer = []
+        self._buffered = 0
+        self._tasks = []
+        self._slots = threading.BoundedSemaphore(max_workers)
+
+    def _put_segment(self, name, data):
+        # Connections cannot be shared between threads.
+        etag = _swift_connection(self.request).put_object(
+            self.segments_container, name, data, content_length=len(data))
+        return {'path': '/%s/%s' % (self.segments_container, name),
+                'etag': etag,
+                'size_bytes': len(data)}
+
+    def _run(self, task):
+        try:
+            task.run()
+        finally:
+            self._slots.release()
+
+    def _store_segment(self, data):
+        if not self._tasks:
+            swift_api(self.request).put_container(self.segments_container)
+        for task in self._tasks:
+            if task.done:
+                # Stop receiving the file as soon as a segment failed.
+                task.get()
+        self._slots.acquire()
+        name = '%s/%08d' % (self.prefix, len(self._tasks))
+        task = concurrency.Task(self._put_segment, args=(name, data),
+                                name=name)
+        self._tasks.append(task)
+        worker = threading.Thread(target=self._run, args=(task,))
+        worker.daemon = True
+        worker.start()
+
+    def write(self, data):
+        if self.exc_info:
+            return
+        self.size += len(data)
+        try:
+            self._buffer.append(data)
+            self._buffered += len(data)
+            while self._buffered >= self.segment_size:
+                data = b''.join(self._buffer)
+                self._store_segment(data[:self.segment_size])
+                self._buffer = [data[self.segment_size:]]
+                self._buffered -= self.segment_size
+        except Exception:
+            self._fail()
+
+    def close(self):
+        """Stores the last segment and waits for all of them."""
+        if self.exc_info:
+            return
+        try:
+            if self._buffered or not self._tasks:
+                self._store_segment(b''.join(self._buffer))
+            for task in self._tasks:
+                task.wait()
+            self.segments = [task.get() for task in self._tasks]
+        except Exception:
+            self._fail()
+        self._buffer, self._buffered = [], 0
+
+    def _fail(self):
+        # The rest of the file is discarded, and the error is raised by
+        # swift_upload_object() once the request has been read.
+        LOG.warning("Unable to store a segment of an upload to %s.",
+                    self.segments_container, exc_info=True)
+        self.exc_info = sys.exc_info()
+        self._buffer, self._buffered = [], 0
+        self.abort()
+
+    def abort(self):
+        """Deletes the segments stored so far."""
+        tasks, self._tasks = self._tasks, []
+        for task in tasks:
+            task.wait()
+            if task.exc_info is None:
+                try:
+                    swift_api(self.request).delete_object(
+                        self.segments_container, task.name)
+                except Exception:
+                    LOG.warning("Unable to delete segment %s of an "
+                                "aborted upload.", task.name, exc_info=True)
+
+    def get_manifest(self):
+        return json.dumps(self.segments)
+
+
+def _is_static_large_object(headers):
+    return headers.get('x-static-large-object', '').lower() == 'true'
+
+
+def _get_segments(request, container_name, object_name):
+    """Returns the paths of the segments of a static large object.
+
+    The list is empty if the object does not exist or is not a static
+    large object.
+    """
+    try:
+        headers = swift_api(request).head_object(container_name, object_name)
+    except swiftclient.client.ClientException:
+        return []
+    if not _is_static_large_object(headers):
+        return []
+    headers, manifest = swift_api(request).get_object(
+        container_name, object_name, query_string='multipart-manifest=get')
+    if isinstance(manifest, six.binary_type):
+        manifest = manifest.decode('utf-8')
+    return [segment['name'] for segment in json.loads(manifest)]
+
+
+def _delete_segments(request, paths):
+    for path in paths:
+        container_name, object_name = path.lstrip('/').split('/', 1)
+        try:
+            swift_api(request).delete_object(container_name, object_name)
+        except swiftclient.client.ClientException:
+            LOG.warning("Unable to delete segment %s of a replaced object.",
+                        path, exc_info=True)
+
+
 def swift_upload_object(request, container_name, object_name,
-                        object_file=None):
-    if swift_object_exists(request, container_name, object_name):
+                        object_file=None, overwrite=False):
+    """Stores a file as an object.
+
+    Unless ``overwrite`` is ``True``, an existing object is not replaced.
+    When a static large object is replaced, its segments are deleted once
+    the new object has been stored.
+    """
+    upload = getattr(object_file, 'segmented_upload', None)
+    if upload is not None and upload.exc_info:
+        six.reraise(*upload.exc_info)
+    old_segments = []
+    if overwrite:
+        old_segments = _get_segments(request, container_name, object_name)
+    elif swift_object_exists(request, container_name, object_name):
+        if upload is not None:
+            upload.abort()
         raise exceptions.AlreadyExists(object_name, 'object')
     headers = {}
     size = 0
@@ -282,11 +507,22 @@ def swift_upload_object(request, container_name, object_name,
         headers['X-Object-Meta-Orig-Filename'] = object_file.name
         size = object_file.size
 
-    etag = swift_api(request).put_object(container_name,
-                                         object_name,
-                                         object_file,
-                                         content_length=size,
-                                         headers=headers)
+    if upload is not None:
+        try:
+            etag = swift_api(request).put_object(
+                container_name, object_name, upload.get_manifest(),
+                headers=headers, query_string='multipart-manifest=put')
+        except Exception:
+            upload.abort()
+            raise
+        upload.stored = True
+    else:
+        etag = swift_api(request).put_object(container_name,
+                                             object_name,
+                                             object_file,
+                                             content_length=size,
+                                             headers=headers)
+    _delete_segments(request, old_segments)
 
     obj_info = {'name': object_name, 'bytes': size, 'etag': etag}
     return StorageObject(obj_info, container_name)
@@ -325,34 +561,97 @@ def swift_delete_object(request, container_name, object_name):
                       "since it is not empty.")
         exc = exceptions.Conflict(error_msg)
         raise exc
-    swift_api(request).delete_object(container_name, object_name)
+    query_string = None
+    if not object_name.endswith(FOLDER_DELIMITER):
+        headers = swift_api(request).head_object(container_name, object_name)
+        if _is_static_large_object(headers):
+            # Deletes the segments along with the manifest.
+            query_string = 'multipart-manifest=delete'
+    swift_api(request).delete_object(container_name, object_name,
+                                     query_string=query_string)
     return True
 
 
 def swift_get_object(request, container_name, object_name, with_data=True,
-                     resp_chunk_size=CHUNK_SIZE):
+                     resp_chunk_size=CHUNK_SIZE, headers=None):
     if with_data:
-        headers, data = swift_api(request).get_object(
-            container_name, object_name, resp_chunk_size=resp_chunk_size)
+        kwargs = {'resp_chunk_size': resp_chunk_size}
+        if headers:
+            kwargs['headers'] = headers
+        obj_headers, data = swift_api(request).get_object(
+            container_name, object_name, **kwargs)
     else:
         data = None
-        headers = swift_api(request).head_object(container_name,
-                                                 object_name)
-    orig_name = headers.get("x-object-meta-orig-filename")
+        obj_headers = swift_api(request).head_object(container_name,
+                                                     object_name)
+    orig_name = obj_headers.get("x-object-meta-orig-filename")
     timestamp = None
     try:
-        ts_float = float(headers.get('x-timestamp'))
+        ts_float = float(obj_headers.get('x-timestamp'))
         timestamp = timeutils.iso8601_from_timestamp(ts_float)
     except Exception:
         pass
     obj_info = {
         'name': object_name,
-        'bytes': headers.get('content-length'),
-        'content_type': headers.get('content-type'),
-        'etag': headers.get('etag'),
+        'bytes': obj_headers.get('content-length'),
+        'content_type': obj_headers.get('content-type'),
+        'content_range': obj_headers.get('content-range'),
+        'etag': obj_headers.get('etag'),
+        'last_modified': obj_headers.get('last-modified'),
         'timestamp': timestamp,
     }
     return StorageObject(obj_info,
                          container_name,
                          orig_name=orig_name,
                          data=data)
+
+
+def _get_object_segment(request, container_name, object_name, first, last,
+                        etag=None):
+    headers = {'Range': 'bytes=%d-%d' % (first, last)}
+    if etag:
+        # Fail rather than join segments of different versions of the
+        # object.
+        headers['If-Match'] = etag
+    # Connections cannot be shared between threads.
+    return _swift_connection(request).get_object(
+        container_name, object_name, headers=headers)[1]
+
+
+def swift_prefetch_object(request, container_name, object_name, first, last,
+                          etag=None, segment_size=None, prefetch=None):
+    """Yields the bytes ``first`` to ``last`` of an object, reading ahead.
+
+    The range is fetched as segments of ``segment_size`` bytes, each with a
+    ranged request of its own. While a segment is being sent, up to
+    ``prefetch`` of the following ones are fetched concurrently, so at most
+    ``prefetch + 1`` segments are held in memory. Passing the ``etag`` of
+    the object makes the download fail if the object is replaced meanwhile.
+    """
+    segment_size = segment_size or DOWNLOAD_SEGMENT_SIZE
+    if prefetch is None:
+        prefetch = DOWNLOAD_PREFETCH
+    offsets = iter(six.moves.range(first, last + 1, segment_size))
+    pending = collections.deque()
+    while True:
+        while len(pending) <= prefetch:
+            offset = next(offsets, None)
+            if offset is None:
+                break
+            end = min(offset + segment_size, last + 1) - 1
+            task = concurrency.Task(
+                _get_object_segment,
+                args=(request, container_name, object_name, offset, end, etag),
+                name='%s/%s[%d-%d]' % (container_name, object_name,
+                                       offset, end))
+            worker = threading.Thread(target=task.run)
+            worker.daemon = True
+            worker.start()
+            pending.append(task)
+        if not pending:
+            return
+        task = pending.popleft()
+        task.wait(concurrency.get_timeout())
+        data = task.get()
+        for i in six.moves.range(0, len(data), CHUNK_SIZE):
+            yield data[i:i + CHUNK_SIZE]
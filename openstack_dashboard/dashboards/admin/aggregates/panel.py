@@ -36,5 +36,6 @@ class Aggregates(horizon.Panel):
             LOG.error("Call to list supported extensions failed. This is "
                       "likely due to a problem communicating with the Nova "
                       "endpoint. Host Aggregates panel will not be displayed.")
+            horizon.base.access_check_failed(context['request'])
             return False
         return super(Aggregates, self).allowed(context)
@@ -84,6 +84,10 @@ class LiveMigrateInstance(policy.PolicyTargetMixin,
 
 
 class AdminUpdateRow(project_tables.UpdateRow):
+    # Listing the instances of all projects to refresh a few rows costs
+    # more than fetching them one by one.
+    ajax_batch = False
+
     def get_data(self, request, instance_id):
         instance = super(AdminUpdateRow, self).get_data(request, instance_id)
         tenant = api.keystone.tenant_get(request,
@@ -174,6 +178,7 @@ class AdminInstancesTable(tables.DataTable):
         table_actions = (project_tables.DeleteInstance,
                          AdminInstanceFilterAction)
         row_class = AdminUpdateRow
+        row_renderer = tables.RowRenderer
         row_actions = (project_tables.ConfirmResize,
                        project_tables.RevertResize,
                        AdminEditInstance,
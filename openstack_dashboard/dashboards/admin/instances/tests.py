@@ -171,7 +171,8 @@ class InstanceViewTest(test.BaseAdminViewTests):
         res = self.client.get(url, {},
                               HTTP_X_REQUESTED_WITH='XMLHttpRequest')
 
-        self.assertTemplateUsed(res, "horizon/common/_data_table_row.html")
+        # The rows of this table are rendered without the row template.
+        self.assertTemplateNotUsed(res, "horizon/common/_data_table_row.html")
         self.assertContains(res, "test_tenant", 1, 200)
         self.assertContains(res, "instance-host", 1, 200)
         # two instances of name, other name comes from row data-display
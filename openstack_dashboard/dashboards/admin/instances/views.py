@@ -25,6 +25,7 @@ from django.utils.translation import ugettext_lazy as _
 from horizon import exceptions
 from horizon import forms
 from horizon import tables
+from horizon.utils import concurrency
 from horizon.utils import memoized
 
 from openstack_dashboard import api
@@ -70,20 +71,24 @@ class AdminIndexView(tables.DataTableView):
     def has_more_data(self, table):
         return self._more
 
-    def get_data(self):
-        instances = []
-        marker = self.request.GET.get(
-            project_tables.AdminInstancesTable._meta.pagination_param, None)
-        search_opts = self.get_filters({'marker': marker, 'paginate': True})
-        # Gather our tenants to correlate against IDs
+    def _get_tenants(self):
         try:
             tenants, has_more = api.keystone.tenant_list(self.request)
         except Exception:
             tenants = []
             msg = _('Unable to retrieve instance project information.')
             exceptions.handle(self.request, msg)
+        return tenants
 
+    def get_data(self):
+        instances = []
+        marker = self.request.GET.get(
+            project_tables.AdminInstancesTable._meta.pagination_param, None)
+        search_opts = self.get_filters({'marker': marker, 'paginate': True})
+        tenants = None
         if 'project' in search_opts:
+            # The project filter needs the tenants before listing servers.
+            tenants = self._get_tenants()
             ten_filter_ids = [t.id for t in tenants
                               if t.name == search_opts['project']]
             del search_opts['project']
@@ -103,21 +108,29 @@ class AdminIndexView(tables.DataTableView):
             exceptions.handle(self.request,
                               _('Unable to retrieve instance list.'))
         if instances:
-            try:
-                api.network.servers_update_addresses(self.request, instances,
-                                                     all_tenants=True)
-            except Exception:
-                exceptions.handle(
-                    self.request,
-                    message=_('Unable to retrieve IP addresses from Neutron.'),
-                    ignore=True)
-
-            # Gather our flavors to correlate against IDs
-            try:
-                flavors = api.nova.flavor_list(self.request)
-            except Exception:
-                # If fails to retrieve flavor list, creates an empty list.
-                flavors = []
+            # Addresses, flavors and tenants are independent of each other,
+            # so fetch them concurrently.
+            gather = concurrency.Gather(self.request)
+            gather.add(
+                'addresses', api.network.servers_update_addresses,
+                args=(self.request, instances), kwargs={'all_tenants': True},
+                message=_('Unable to retrieve IP addresses from Neutron.'),
+                ignore=True)
+            # Gather our flavors to correlate against IDs. If it fails to
+            # retrieve flavor list, an empty list is used.
+            gather.add('flavors', api.nova.flavor_list, args=(self.request,),
+                       default=[], ignore=True)
+            if tenants is None:
+                # Gather our tenants to correlate against IDs
+                gather.add(
+                    'tenants', api.keystone.tenant_list,
+                    args=(self.request,), default=([], False),
+                    message=_('Unable to retrieve instance project '
+                              'information.'))
+            results = gather.run()
+            flavors = results['flavors']
+            if tenants is None:
+                tenants, has_more = results['tenants']
 
             full_flavors = OrderedDict([(f.id, f) for f in flavors])
             tenant_dict = OrderedDict([(t.id, t) for t in tenants])
@@ -10,14 +10,18 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import collections
+
 from django.core.urlresolvers import reverse
 from django import http
 
+import mock
 from mox3.mox import IsA  # noqa
 from oslo_serialization import jsonutils
 import six
 
 from openstack_dashboard import api
+from openstack_dashboard.dashboards.admin.metering import views
 from openstack_dashboard.test import helpers as test
 from openstack_dashboard.test.test_data import utils as test_utils
 
@@ -55,6 +59,60 @@ class MeteringViewTests(test.BaseAdminViewTests):
         self.assertFormError(res, "form", "date_from",
                              ['Must specify start of period'])
 
+    def test_report_csv_streams_rows(self):
+        consumed = []
+
+        def rows():
+            for project in ('project_1', 'project_2'):
+                consumed.append(project)
+                yield {"project": project, "meter": "cpu",
+                       "description": "CPU time", "service": "Nova",
+                       "time": "2014-01-01T00:00:00", "value": 1.5,
+                       "unit": "ns"}
+
+        res = views.ReportCsvRenderer(request=self.request, template=None,
+                                      context={'usage': rows()},
+                                      content_type='csv')
+        # Nothing is fetched until the response is streamed.
+        self.assertEqual([], consumed)
+        content = b''.join(res.streaming_content).decode('utf-8')
+        self.assertEqual(['project_1', 'project_2'], consumed)
+        self.assertIn('project_2,cpu,CPU time,Nova,2014-01-01T00:00:00,1.5,ns',
+                      content)
+
+    def _mock_report_queries(self, meters_class, query_class, query):
+        meters = [mock.Mock(description=name, unit='ns')
+                  for name in ('cpu', 'memory')]
+        for meter in meters:
+            meter.name = meter.description
+        meters_class.return_value._cached_meters = collections.OrderedDict(
+            (meter.name, meter) for meter in meters)
+        query_class.return_value.query.side_effect = query
+
+    @mock.patch.object(views.metering_utils, 'ProjectAggregatesQuery')
+    @mock.patch.object(api.ceilometer, 'Meters')
+    def test_report_csv_first_meter_error(self, meters_class, query_class):
+        self._mock_report_queries(meters_class, query_class,
+                                  self.exceptions.ceilometer)
+        res = self.client.get(reverse('horizon:admin:metering:csvreport'))
+        # The error is handled before the download starts.
+        self.assertRedirectsNoFollow(res, INDEX_URL)
+
+    @mock.patch.object(views.metering_utils, 'ProjectAggregatesQuery')
+    @mock.patch.object(api.ceilometer, 'Meters')
+    def test_report_rows_interrupted(self, meters_class, query_class):
+        project = mock.Mock(id='project_1')
+        project.get_meter.return_value = [
+            mock.Mock(_apiresource=mock.Mock(period_end='2014-01-01',
+                                             avg=1.5))]
+        self._mock_report_queries(meters_class, query_class,
+                                  [([project], 'ns'),
+                                   self.exceptions.ceilometer])
+        rows = views.iter_report_rows(self.request)
+        self.assertEqual('cpu', next(rows)['meter'])
+        # The report is interrupted rather than silently truncated.
+        self.assertRaises(self.exceptions.ceilometer.__class__, list, rows)
+
 
 class MeteringLineChartTabTests(test.BaseAdminViewTests):
     def setUp(self):
@@ -11,7 +11,9 @@
 # under the License.
 
 import json
+import logging
 
+from django.core.urlresolvers import reverse
 from django.core.urlresolvers import reverse_lazy
 from django.http import HttpResponse  # noqa
 from django.utils.translation import ugettext_lazy as _
@@ -31,6 +33,9 @@ from openstack_dashboard.dashboards.admin.metering import tabs as \
 from openstack_dashboard.utils import metering as metering_utils
 
 
+LOG = logging.getLogger(__name__)
+
+
 class IndexView(tabs.TabbedTableView):
     tab_group_class = metering_tabs.CeilometerOverviewTabs
     template_name = 'admin/metering/index.html'
@@ -88,7 +93,9 @@ class CsvReportView(django.views.generic.View):
     def get(self, request, **response_kwargs):
         render_class = ReportCsvRenderer
         response_kwargs.setdefault("filename", "usage.csv")
-        context = {'usage': load_report_data(request)}
+        # The rows are generated while the response is streamed, so the
+        # download starts as soon as the first meter has been queried.
+        context = {'usage': iter_report_rows(request)}
         resp = render_class(request=request,
                             template=None,
                             context=context,
@@ -97,25 +104,38 @@ class CsvReportView(django.views.generic.View):
         return resp
 
 
-class ReportCsvRenderer(csvbase.BaseCsvResponse):
+class ReportCsvRenderer(csvbase.BaseCsvStreamingResponse):
 
     columns = [_("Project Name"), _("Meter"), _("Description"),
                _("Service"), _("Time"), _("Value (Avg)"), _("Unit")]
 
     def get_row_data(self):
 
-        for p in self.context['usage'].values():
-            for u in p:
-                yield (u["project"],
-                       u["meter"],
-                       u["description"],
-                       u["service"],
-                       u["time"],
-                       u["value"],
-                       u["unit"])
+        for u in self.context['usage']:
+            yield (u["project"],
+                   u["meter"],
+                   u["description"],
+                   u["service"],
+                   u["time"],
+                   u["value"],
+                   u["unit"])
 
 
 def load_report_data(request):
+    """Returns the rows of the usage report grouped by project."""
+    project_rows = {}
+    for row in iter_report_rows(request):
+        project_rows.setdefault(row["project"], []).append(row)
+    return project_rows
+
+
+def iter_report_rows(request):
+    """Returns an iterator over the rows of the usage report.
+
+    The rows are generated one meter at a time. The meters, the projects
+    and the usage of the first meter are retrieved before returning, so
+    that errors show up before a streamed response has started.
+    """
     meters = ceilometer.Meters(request)
     services = {
         _('Nova'): meters.list_nova(),
@@ -126,7 +146,6 @@ def load_report_data(request):
         _('Kwapi'): meters.list_kwapi(),
         _('IPMI'): meters.list_ipmi(),
     }
-    project_rows = {}
     date_options = request.GET.get('date_options', 7)
     date_from = request.GET.get('date_from')
     date_to = request.GET.get('date_to')
@@ -144,18 +163,44 @@ def load_report_data(request):
     except Exception:
         exceptions.handle(request,
                           _('Unable to retrieve project list.'))
-    for meter in meters._cached_meters.values():
+        return iter([])
+    report_meters = list(meters._cached_meters.values())
+    if not report_meters:
+        return iter([])
+    try:
+        first_usage, unit = project_aggregates.query(report_meters[0].name)
+    except Exception:
+        exceptions.handle(request,
+                          _('Unable to retrieve the usage report.'),
+                          redirect=reverse('horizon:admin:metering:index'))
+    return _generate_report_rows(report_meters, services, project_aggregates,
+                                 first_usage)
+
+
+def _generate_report_rows(report_meters, services, project_aggregates,
+                          first_usage):
+    for index, meter in enumerate(report_meters):
         service = None
         for name, m_list in services.items():
             if meter in m_list:
                 service = name
                 break
-        res, unit = project_aggregates.query(meter.name)
+        if not index:
+            res = first_usage
+        else:
+            try:
+                res, unit = project_aggregates.query(meter.name)
+            except Exception:
+                # The response has already started, so the download can
+                # only be interrupted rather than end with a partial report.
+                LOG.exception("Unable to retrieve the usage of meter %s, "
+                              "the usage report is interrupted.", meter.name)
+                raise
         for r in res:
             values = r.get_meter(meter.name.replace(".", "_"))
             if values:
                 for value in values:
-                    row = {"name": 'none',
+                    yield {"name": 'none',
                            "project": r.id,
                            "meter": meter.name,
                            "description": meter.description,
@@ -163,8 +208,3 @@ def load_report_data(request):
                            "time": value._apiresource.period_end,
                            "value": value._apiresource.avg,
                            "unit": meter.unit}
-                    if r.id not in project_rows:
-                        project_rows[r.id] = [row]
-                    else:
-                        project_rows[r.id].append(row)
-    return project_rows
@@ -67,6 +67,8 @@ class VolumeSnapshotsTable(volumes_tables.VolumesTableBase):
     class Meta(object):
         name = "volume_snapshots"
         verbose_name = _("Volume Snapshots")
+        pagination_param = 'snapshot_marker'
+        prev_pagination_param = 'prev_snapshot_marker'
         table_actions = (snapshots_tables.VolumeSnapshotsFilterAction,
                          snapshots_tables.DeleteVolumeSnapshot,)
         row_actions = (snapshots_tables.DeleteVolumeSnapshot,
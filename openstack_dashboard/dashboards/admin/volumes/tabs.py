@@ -30,7 +30,8 @@ from openstack_dashboard.dashboards.project.volumes \
     import tabs as volumes_tabs
 
 
-class VolumeTab(tabs.TableTab, volumes_tabs.VolumeTableMixIn):
+class VolumeTab(volumes_tabs.PagedTableMixin, tabs.TableTab,
+                volumes_tabs.VolumeTableMixIn):
     table_classes = (volumes_tables.VolumesTable,)
     name = _("Volumes")
     slug = "volumes_tab"
@@ -39,9 +40,12 @@ class VolumeTab(tabs.TableTab, volumes_tabs.VolumeTableMixIn):
 
     def get_volumes_data(self):
         volumes = self._get_volumes(search_opts={'all_tenants': True})
-        instances = self._get_instances(search_opts={'all_tenants': True})
+        instances = self._get_instances(
+            search_opts={'all_tenants': True},
+            instance_ids=self._get_attached_instance_ids(volumes))
         volume_ids_with_snapshots = self._get_volumes_ids_with_snapshots(
-            search_opts={'all_tenants': True})
+            search_opts={'all_tenants': True},
+            volume_ids=[volume.id for volume in volumes])
         self._set_volume_attributes(
             volumes, instances, volume_ids_with_snapshots)
 
@@ -110,7 +114,8 @@ class VolumeTypesTab(tabs.TableTab, volumes_tabs.VolumeTableMixIn):
         return qos_specs
 
 
-class SnapshotTab(tabs.TableTab):
+class SnapshotTab(volumes_tabs.PagedTableMixin, tabs.TableTab,
+                  volumes_tabs.VolumeTableMixIn):
     table_classes = (snapshots_tables.VolumeSnapshotsTable,)
     name = _("Volume Snapshots")
     slug = "snapshots_tab"
@@ -119,14 +124,15 @@ class SnapshotTab(tabs.TableTab):
 
     def get_volume_snapshots_data(self):
         if api.base.is_service_enabled(self.request, 'volume'):
+            marker, sort_dir = self._get_marker()
             try:
-                snapshots = cinder.volume_snapshot_list(
-                    self.request,
+                snapshots, self._has_more_data, self._has_prev_data = \
+                    cinder.volume_snapshot_list_paged(
+                        self.request, paginate=True, marker=marker,
+                        sort_dir=sort_dir, search_opts={'all_tenants': True})
+                volumes = self._get_volumes_by_ids(
+                    sorted(set(s.volume_id for s in snapshots)),
                     search_opts={'all_tenants': True})
-                volumes = cinder.volume_list(
-                    self.request,
-                    search_opts={'all_tenants': True})
-                volumes = dict((v.id, v) for v in volumes)
             except Exception:
                 snapshots = []
                 volumes = {}
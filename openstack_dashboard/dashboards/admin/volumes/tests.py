@@ -14,6 +14,7 @@
 
 from django.core.urlresolvers import reverse
 from django import http
+from django.test.utils import override_settings
 from mox3.mox import IsA  # noqa
 
 from openstack_dashboard import api
@@ -23,13 +24,66 @@ from openstack_dashboard.test import helpers as test
 
 
 class VolumeTests(test.BaseAdminViewTests):
-    @test.create_stubs({api.nova: ('server_list',),
-                        cinder: ('volume_list',
+    @test.create_stubs({api.nova: ('server_get',),
+                        cinder: ('volume_list_paged',
                                  'volume_snapshot_list'),
                         keystone: ('tenant_list',)})
+    def _test_index(self, marker=None, sort_dir='desc', has_more=False,
+                    has_prev=False):
+        volumes = self.cinder_volumes.list()
+        cinder.volume_list_paged(IsA(http.HttpRequest), search_opts={
+            'all_tenants': True}, marker=marker, sort_dir=sort_dir,
+            paginate=True).AndReturn([volumes, has_more, has_prev])
+        for volume in volumes:
+            cinder.volume_snapshot_list(IsA(http.HttpRequest), search_opts={
+                'all_tenants': True, 'volume_id': volume.id}) \
+                .InAnyOrder().AndReturn([])
+        for server_id in ('1', '2'):
+            api.nova.server_get(IsA(http.HttpRequest), server_id) \
+                .InAnyOrder().AndReturn(self.servers.get(id=server_id))
+        keystone.tenant_list(IsA(http.HttpRequest)) \
+            .AndReturn([self.tenants.list(), False])
+
+        self.mox.ReplayAll()
+        url = reverse('horizon:admin:volumes:index')
+        if marker is not None:
+            param = 'prev_volume_marker' if sort_dir == 'asc' \
+                else 'volume_marker'
+            url += '?%s=%s' % (param, marker)
+        res = self.client.get(url)
+
+        self.assertTemplateUsed(res, 'admin/volumes/index.html')
+        table = res.context['volumes_table']
+        self.assertItemsEqual(table.data, self.cinder_volumes.list())
+        self.assertEqual(has_more, table.has_more_data())
+        self.assertEqual(has_prev, table.has_prev_data())
+        return res
+
     def test_index(self):
-        cinder.volume_list(IsA(http.HttpRequest), search_opts={
-            'all_tenants': True}).AndReturn(self.cinder_volumes.list())
+        self._test_index()
+
+    def test_index_paginated(self):
+        volumes = self.cinder_volumes.list()
+        res = self._test_index(marker=volumes[0].id, has_more=True,
+                               has_prev=True)
+        self.assertContains(res, 'volume_marker=%s' % volumes[-1].id)
+        self.assertContains(res, 'prev_volume_marker=%s' % volumes[0].id)
+
+    def test_index_paginated_prev_page(self):
+        volumes = self.cinder_volumes.list()
+        self._test_index(marker=volumes[0].id, sort_dir='asc',
+                         has_more=True)
+
+    @override_settings(API_RESULT_PAGE_SIZE=1)
+    @test.create_stubs({api.nova: ('server_list',),
+                        cinder: ('volume_list_paged',
+                                 'volume_snapshot_list'),
+                        keystone: ('tenant_list',)})
+    def test_index_many_volumes(self):
+        cinder.volume_list_paged(IsA(http.HttpRequest), search_opts={
+            'all_tenants': True}, marker=None, sort_dir='desc',
+            paginate=True).AndReturn([self.cinder_volumes.list(), False,
+                                      False])
         cinder.volume_snapshot_list(IsA(http.HttpRequest), search_opts={
             'all_tenants': True}).AndReturn([])
         api.nova.server_list(IsA(http.HttpRequest), search_opts={
@@ -75,16 +129,20 @@ class VolumeTests(test.BaseAdminViewTests):
         qos_specs = res.context['qos_specs_table'].data
         self.assertItemsEqual(qos_specs, self.cinder_qos_specs.list())
 
-    @test.create_stubs({cinder: ('volume_list',
-                                 'volume_snapshot_list',),
+    @test.create_stubs({cinder: ('volume_get',
+                                 'volume_snapshot_list_paged',),
                         keystone: ('tenant_list',)})
     def test_snapshots_tab(self):
-        cinder.volume_snapshot_list(IsA(http.HttpRequest), search_opts={
-            'all_tenants': True}). \
-            AndReturn(self.cinder_volume_snapshots.list())
-        cinder.volume_list(IsA(http.HttpRequest), search_opts={
-            'all_tenants': True}).\
-            AndReturn(self.cinder_volumes.list())
+        snapshots = self.cinder_volume_snapshots.list()
+        cinder.volume_snapshot_list_paged(
+            IsA(http.HttpRequest), paginate=True, marker=None,
+            sort_dir='desc', search_opts={'all_tenants': True}). \
+            AndReturn([snapshots, False, False])
+        # Only the volumes of the snapshots listed are retrieved.
+        for snapshot in snapshots:
+            cinder.volume_get(IsA(http.HttpRequest), snapshot.volume_id,
+                              details=False).InAnyOrder(). \
+                AndReturn(self.cinder_volumes.get(id=snapshot.volume_id))
         keystone.tenant_list(IsA(http.HttpRequest)). \
             AndReturn([self.tenants.list(), False])
 
@@ -16,11 +16,14 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import collections
 
 from django.conf import settings
 from django.core.urlresolvers import reverse
 from django.utils.translation import ugettext_lazy as _
+import six
 
+import horizon
 from horizon import exceptions
 from horizon import forms
 from horizon import messages
@@ -42,6 +45,27 @@ PROJECT_GROUP_MEMBER_SLUG = "update_group_members"
 COMMON_HORIZONTAL_TEMPLATE = "identity/projects/_common_horizontal_form.html"
 
 
+def _get_members_roles(step, data, roles):
+    """Maps the members selected in a membership step to their roles."""
+    members_roles = collections.defaultdict(set)
+    for role in roles:
+        field_name = step.get_member_field_name(role.id)
+        for member_id in data[field_name]:
+            members_roles[member_id].add(role.id)
+    return members_roles
+
+
+def _count_failed_members(failures):
+    return len(set(member_id for member_id, role_id, exc_info in failures))
+
+
+def _raise_first_failure(failures):
+    # The role changes of a step are all attempted before they are reported
+    # at once, with the first error.
+    if failures:
+        six.reraise(*failures[0][2])
+
+
 class ProjectQuotaAction(workflows.Action):
     ifcb_label = _("Injected File Content (Bytes)")
     metadata_items = forms.IntegerField(min_value=-1,
@@ -455,23 +479,14 @@ class CreateProject(CommonQuotaWorkflow):
         try:
             available_roles = api.keystone.role_list(request)
             member_step = self.get_step(PROJECT_USER_MEMBER_SLUG)
-            # count how many users are to be added
-            for role in available_roles:
-                field_name = member_step.get_member_field_name(role.id)
-                role_list = data[field_name]
-                users_to_add += len(role_list)
+            users_roles = _get_members_roles(member_step, data,
+                                             available_roles)
+            users_to_add = len(users_roles)
             # add new users to project
-            for role in available_roles:
-                field_name = member_step.get_member_field_name(role.id)
-                role_list = data[field_name]
-                users_added = 0
-                for user in role_list:
-                    api.keystone.add_tenant_user_role(request,
-                                                      project=project_id,
-                                                      user=user,
-                                                      role=role.id)
-                    users_added += 1
-                users_to_add -= users_added
+            failures = api.keystone.update_project_roles(
+                request, project_id, {}, users_roles)
+            users_to_add = _count_failed_members(failures)
+            _raise_first_failure(failures)
         except Exception:
             if PROJECT_GROUP_ENABLED:
                 group_msg = _(", add project groups")
@@ -489,24 +504,14 @@ class CreateProject(CommonQuotaWorkflow):
         try:
             available_roles = api.keystone.role_list(request)
             member_step = self.get_step(PROJECT_GROUP_MEMBER_SLUG)
-
-            # count how many groups are to be added
-            for role in available_roles:
-                field_name = member_step.get_member_field_name(role.id)
-                role_list = data[field_name]
-                groups_to_add += len(role_list)
+            groups_roles = _get_members_roles(member_step, data,
+                                              available_roles)
+            groups_to_add = len(groups_roles)
             # add new groups to project
-            for role in available_roles:
-                field_name = member_step.get_member_field_name(role.id)
-                role_list = data[field_name]
-                groups_added = 0
-                for group in role_list:
-                    api.keystone.add_group_role(request,
-                                                role=role.id,
-                                                group=group,
-                                                project=project_id)
-                    groups_added += 1
-                groups_to_add -= groups_added
+            failures = api.keystone.update_project_roles(
+                request, project_id, {}, groups_roles, group=True)
+            groups_to_add = _count_failed_members(failures)
+            _raise_first_failure(failures)
         except Exception:
             exceptions.handle(request,
                               _('Failed to add %s project groups '
@@ -625,39 +630,6 @@ class UpdateProject(CommonQuotaWorkflow):
             exceptions.handle(request, ignore=True)
             return
 
-    def _add_roles_to_users(self, request, data, project_id, user_id,
-                            role_ids, available_roles):
-        member_step = self.get_step(PROJECT_USER_MEMBER_SLUG)
-        current_role_ids = list(role_ids)
-
-        for role in available_roles:
-            field_name = member_step.get_member_field_name(role.id)
-            # Check if the user is in the list of users with this role.
-            if user_id in data[field_name]:
-                # Add it if necessary
-                if role.id not in current_role_ids:
-                    # user role has changed
-                    api.keystone.add_tenant_user_role(
-                        request,
-                        project=project_id,
-                        user=user_id,
-                        role=role.id)
-                else:
-                    # User role is unchanged, so remove it from the
-                    # remaining roles list to avoid removing it later.
-                    index = current_role_ids.index(role.id)
-                    current_role_ids.pop(index)
-        return current_role_ids
-
-    def _remove_roles_from_user(self, request, project_id, user_id,
-                                current_role_ids):
-        for id_to_delete in current_role_ids:
-            api.keystone.remove_tenant_user_role(
-                request,
-                project=project_id,
-                user=user_id,
-                role=id_to_delete)
-
     def _is_removing_self_admin_role(self, request, project_id, user_id,
                                      available_roles, current_role_ids):
         is_current_user = user_id == request.user.id
@@ -696,41 +668,30 @@ class UpdateProject(CommonQuotaWorkflow):
             # can diff against it.
             users_roles = api.keystone.get_project_users_roles(
                 request, project=project_id)
-            users_to_modify = len(users_roles)
-
-            for user_id in users_roles.keys():
-                # Check if there have been any changes in the roles of
-                # Existing project members.
-                current_role_ids = list(users_roles[user_id])
-                modified_role_ids = self._add_roles_to_users(
-                    request, data, project_id, user_id,
-                    current_role_ids, available_roles)
-                # Prevent admins from doing stupid things to themselves.
-                removing_admin = self._is_removing_self_admin_role(
-                    request, project_id, user_id, available_roles,
-                    modified_role_ids)
-                # Otherwise go through and revoke any removed roles.
-                if not removing_admin:
-                    self._remove_roles_from_user(request, project_id, user_id,
-                                                 modified_role_ids)
-                users_to_modify -= 1
-
-            # Grant new roles on the project.
-            for role in available_roles:
-                field_name = member_step.get_member_field_name(role.id)
-                # Count how many users may be added for exception handling.
-                users_to_modify += len(data[field_name])
-            for role in available_roles:
-                users_added = 0
-                field_name = member_step.get_member_field_name(role.id)
-                for user_id in data[field_name]:
-                    if user_id not in users_roles:
-                        api.keystone.add_tenant_user_role(request,
-                                                          project=project_id,
-                                                          user=user_id,
-                                                          role=role.id)
-                    users_added += 1
-                users_to_modify -= users_added
+            new_users_roles = _get_members_roles(member_step, data,
+                                                 available_roles)
+            users_to_modify = len(set(users_roles) | set(new_users_roles))
+
+            # Prevent admins from doing stupid things to themselves.
+            user_id = request.user.id
+            if user_id in users_roles:
+                removed_role_ids = (set(users_roles[user_id]) -
+                                    new_users_roles[user_id])
+                if self._is_removing_self_admin_role(
+                        request, project_id, user_id, available_roles,
+                        removed_role_ids):
+                    new_users_roles[user_id].update(users_roles[user_id])
+
+            # Grant and revoke the roles which have changed.
+            failures = api.keystone.update_project_roles(
+                request, project_id, users_roles, new_users_roles)
+            if (project_id == request.user.tenant_id and
+                    set(users_roles.get(user_id, ())) !=
+                    new_users_roles.get(user_id, set())):
+                # The panels shown to the user depend on their roles.
+                horizon.base.invalidate_access_cache(request)
+            users_to_modify = _count_failed_members(failures)
+            _raise_first_failure(failures)
             return True
         except Exception:
             if PROJECT_GROUP_ENABLED:
@@ -752,64 +713,26 @@ class UpdateProject(CommonQuotaWorkflow):
         try:
             available_roles = self._get_available_roles(request)
             # Get the groups currently associated with this project so we
-            # can diff against it.
-            project_groups = api.keystone.group_list(request,
-                                                     domain=domain_id,
-                                                     project=project_id)
-            groups_to_modify = len(project_groups)
-            for group in project_groups:
-                # Check if there have been any changes in the roles of
-                # Existing project members.
-                current_roles = api.keystone.roles_for_group(
-                    self.request,
-                    group=group.id,
-                    project=project_id)
-                current_role_ids = [role.id for role in current_roles]
-                for role in available_roles:
-                    # Check if the group is in the list of groups with
-                    # this role.
-                    field_name = member_step.get_member_field_name(role.id)
-                    if group.id in data[field_name]:
-                        # Add it if necessary
-                        if role.id not in current_role_ids:
-                            # group role has changed
-                            api.keystone.add_group_role(
-                                request,
-                                role=role.id,
-                                group=group.id,
-                                project=project_id)
-                        else:
-                            # Group role is unchanged, so remove it from
-                            # the remaining roles list to avoid removing it
-                            # later.
-                            index = current_role_ids.index(role.id)
-                            current_role_ids.pop(index)
-
-                # Revoke any removed roles.
-                for id_to_delete in current_role_ids:
-                    api.keystone.remove_group_role(request,
-                                                   role=id_to_delete,
-                                                   group=group.id,
-                                                   project=project_id)
-                groups_to_modify -= 1
-
-            # Grant new roles on the project.
-            for role in available_roles:
-                field_name = member_step.get_member_field_name(role.id)
-                # Count how many groups may be added for error handling.
-                groups_to_modify += len(data[field_name])
-            for role in available_roles:
-                groups_added = 0
-                field_name = member_step.get_member_field_name(role.id)
-                for group_id in data[field_name]:
-                    if not filter(lambda x: group_id == x.id,
-                                  project_groups):
-                        api.keystone.add_group_role(request,
-                                                    role=role.id,
-                                                    group=group_id,
-                                                    project=project_id)
-                    groups_added += 1
-                groups_to_modify -= groups_added
+            # can diff against it. Only the groups of the domain of the
+            # project can be selected, the others are left untouched.
+            domain_groups = set(group.id for group in
+                                api.keystone.group_list(request,
+                                                        domain=domain_id))
+            groups_roles = dict(
+                (group_id, roles_ids) for group_id, roles_ids in
+                api.keystone.get_project_groups_roles(
+                    request, project_id).items()
+                if group_id in domain_groups)
+            new_groups_roles = _get_members_roles(member_step, data,
+                                                  available_roles)
+            groups_to_modify = len(set(groups_roles) | set(new_groups_roles))
+
+            # Grant and revoke the roles which have changed.
+            failures = api.keystone.update_project_roles(
+                request, project_id, groups_roles, new_groups_roles,
+                group=True)
+            groups_to_modify = _count_failed_members(failures)
+            _raise_first_failure(failures)
             return True
         except Exception:
             exceptions.handle(request,
@@ -831,10 +754,6 @@ class UpdateProject(CommonQuotaWorkflow):
             return False
 
     def handle(self, request, data):
-        # FIXME(gabriel): This should be refactored to use Python's built-in
-        # sets and do this all in a single "roles to add" and "roles to remove"
-        # pass instead of the multi-pass thing happening now.
-
         project = self._update_project(request, data)
         if not project:
             return False
@@ -379,14 +379,16 @@ class FloatingIpNeutronViewTests(FloatingIpViewTests):
             .AndReturn(True)
         api.neutron.tenant_quota_get(IsA(http.HttpRequest), self.tenant.id) \
             .AndReturn(self.neutron_quotas.first())
-        api.neutron.router_list(IsA(http.HttpRequest)) \
+        api.neutron.router_list(IsA(http.HttpRequest),
+                                tenant_id=self.tenant.id) \
             .AndReturn(self.routers.list())
         api.neutron.subnet_list(IsA(http.HttpRequest)) \
             .AndReturn(self.subnets.list())
-        api.neutron.network_list(IsA(http.HttpRequest), shared=False) \
+        # Shared and unshared networks of the project are counted together.
+        api.neutron.network_list(IsA(http.HttpRequest),
+                                 tenant_id=self.tenant.id,
+                                 expand_subnet=False) \
             .AndReturn(self.networks.list())
-        api.neutron.network_list(IsA(http.HttpRequest), shared=True) \
-            .AndReturn(list())
         api.network.floating_ip_supported(IsA(http.HttpRequest)) \
             .AndReturn(True)
         api.network.tenant_floating_ip_list(IsA(http.HttpRequest)) \
@@ -437,13 +439,15 @@ class FloatingIpNeutronViewTests(FloatingIpViewTests):
             .AndReturn(True)
         api.neutron.tenant_quota_get(IsA(http.HttpRequest), self.tenant.id) \
             .AndReturn(self.neutron_quotas.first())
-        api.neutron.router_list(IsA(http.HttpRequest)) \
+        api.neutron.router_list(IsA(http.HttpRequest),
+                                tenant_id=self.tenant.id) \
             .AndReturn(self.routers.list())
         api.neutron.subnet_list(IsA(http.HttpRequest)) \
             .AndReturn(self.subnets.list())
-        api.neutron.network_list(IsA(http.HttpRequest), shared=False) \
-            .AndReturn(list())
-        api.neutron.network_list(IsA(http.HttpRequest), shared=True) \
+        # Shared and unshared networks of the project are counted together.
+        api.neutron.network_list(IsA(http.HttpRequest),
+                                 tenant_id=self.tenant.id,
+                                 expand_subnet=False) \
             .AndReturn(self.networks.list())
         api.network.floating_ip_supported(IsA(http.HttpRequest)) \
             .AndReturn(True)
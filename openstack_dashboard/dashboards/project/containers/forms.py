@@ -144,7 +144,8 @@ class UpdateObject(UploadObject):
                 obj = api.swift.swift_upload_object(request,
                                                     data['container_name'],
                                                     object_path,
-                                                    object_file)
+                                                    object_file,
+                                                    overwrite=True)
                 messages.success(
                     request, _("Object was successfully updated."))
                 return obj
@@ -0,0 +1,96 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+from django.core.files import uploadedfile
+from django.core.files import uploadhandler
+from django.utils.decorators import method_decorator
+from django.views.decorators import csrf
+
+from openstack_dashboard.api import swift
+
+
+class SegmentedUploadedFile(uploadedfile.UploadedFile):
+    """A file which has already been stored in Swift as segments."""
+    def __init__(self, upload, name, content_type, charset,
+                 content_type_extra=None):
+        super(SegmentedUploadedFile, self).__init__(
+            None, name, content_type, upload.size, charset,
+            content_type_extra)
+        self.segmented_upload = upload
+
+    def close(self):
+        pass
+
+
+class SwiftUploadHandler(uploadhandler.FileUploadHandler):
+    """Streams large files into Swift while the request body is read.
+
+    Requests whose body is larger than one segment have their files
+    passed to :class:`~openstack_dashboard.api.swift.SegmentedUpload`
+    instead of being spooled to memory or to a temporary file first.
+    Smaller requests are left to the default upload handlers.
+    """
+    def __init__(self, request, container_name):
+        super(SwiftUploadHandler, self).__init__(request)
+        self.container_name = container_name
+        self.activated = False
+        self.upload = None
+
+    def handle_raw_input(self, input_data, META, content_length, boundary,
+                         encoding=None):
+        self.activated = content_length > swift.SEGMENT_SIZE
+
+    def new_file(self, *args, **kwargs):
+        super(SwiftUploadHandler, self).new_file(*args, **kwargs)
+        if self.activated:
+            self.upload = swift.SegmentedUpload(self.request,
+                                                self.container_name)
+            raise uploadhandler.StopFutureHandlers()
+
+    def receive_data_chunk(self, raw_data, start):
+        if not self.activated:
+            return raw_data
+        self.upload.write(raw_data)
+
+    def file_complete(self, file_size):
+        if not self.activated:
+            return None
+        self.upload.close()
+        return SegmentedUploadedFile(self.upload, self.file_name,
+                                     self.content_type, self.charset,
+                                     self.content_type_extra)
+
+    def upload_interrupted(self):
+        if self.upload is not None:
+            self.upload.abort()
+
+
+class StreamingUploadMixin(object):
+    """Makes a form view stream uploaded files into Swift.
+
+    The upload handler has to be installed before the request body is
+    read, which the CSRF middleware would otherwise do, so the protection
+    is applied once the handler is in place.
+    """
+    @method_decorator(csrf.csrf_exempt)
+    def dispatch(self, request, *args, **kwargs):
+        request.upload_handlers.insert(
+            0, SwiftUploadHandler(request, kwargs['container_name']))
+        dispatch = super(StreamingUploadMixin, self).dispatch
+        response = csrf.csrf_protect(dispatch)(request, *args, **kwargs)
+        # Discard the segments of a file which did not end up in an object,
+        # e.g. because the form was invalid.
+        for uploaded_file in request.FILES.values():
+            upload = getattr(uploaded_file, 'segmented_upload', None)
+            if upload is not None and not upload.stored:
+                upload.abort()
+        return response
@@ -24,11 +24,13 @@ from django.core.files.uploadedfile import InMemoryUploadedFile  # noqa
 from django import http
 from django.utils import http as utils_http
 
+import mock
 from mox3.mox import IsA  # noqa
 import six
 
 from openstack_dashboard import api
 from openstack_dashboard.dashboards.project.containers import forms
+from openstack_dashboard.dashboards.project.containers import handlers
 from openstack_dashboard.dashboards.project.containers import tables
 from openstack_dashboard.dashboards.project.containers import utils
 from openstack_dashboard.dashboards.project.containers import views
@@ -231,6 +233,49 @@ class SwiftTests(test.TestCase):
         index_url = reverse('horizon:project:containers:index', args=args)
         self.assertRedirectsNoFollow(res, index_url)
 
+    @test.create_stubs({api.swift: ('swift_upload_object',)})
+    def test_upload_streamed(self):
+        container = self.containers.first()
+        obj = self.objects.first()
+        OBJECT_DATA = b'objectData' * 100
+
+        temp_file = tempfile.NamedTemporaryFile()
+        temp_file.write(OBJECT_DATA)
+        temp_file.flush()
+        temp_file.seek(0)
+
+        api.swift.swift_upload_object(IsA(http.HttpRequest),
+                                      container.name,
+                                      obj.name,
+                                      IsA(handlers.SegmentedUploadedFile)) \
+            .AndReturn(obj)
+        self.mox.ReplayAll()
+
+        upload_url = reverse('horizon:project:containers:object_upload',
+                             args=[container.name])
+        formData = {'method': forms.UploadObject.__name__,
+                    'container_name': container.name,
+                    'name': obj.name,
+                    'object_file': temp_file}
+        with mock.patch.object(api.swift, 'SEGMENT_SIZE', 256), \
+                mock.patch.object(api.swift, 'SegmentedUpload') as upload:
+            upload.return_value.size = len(OBJECT_DATA)
+            upload.return_value.stored = False
+            res = self.client.post(upload_url, formData)
+
+        upload.assert_called_once_with(IsA(http.HttpRequest), container.name)
+        written = b''.join(call[0][0] for call
+                           in upload.return_value.write.call_args_list)
+        self.assertEqual(OBJECT_DATA, written)
+        upload.return_value.close.assert_called_once_with()
+        # The stubbed upload did not store the object, so the segments are
+        # deleted.
+        upload.return_value.abort.assert_called_once_with()
+
+        args = (utils.wrap_delimiter(container.name),)
+        index_url = reverse('horizon:project:containers:index', args=args)
+        self.assertRedirectsNoFollow(res, index_url)
+
     @test.create_stubs({api.swift: ('swift_upload_object',)})
     def test_upload_without_file(self):
         container = self.containers.first()
@@ -375,6 +420,137 @@ class SwiftTests(test.TestCase):
                     'attachment; filename=%s' % expected_name
                 )
 
+    @test.create_stubs({api.swift: ('swift_get_object',)})
+    def test_download_range(self):
+        container = self.containers.first()
+        obj = copy.copy(self.objects.first())
+        obj.data = iter([obj.data[:4]])
+        obj.bytes = 4
+        obj.content_range = 'bytes 0-3/9'
+        obj.etag = 'object_hash'
+        api.swift.swift_get_object(
+            IsA(http.HttpRequest),
+            container.name,
+            obj.name,
+            resp_chunk_size=api.swift.CHUNK_SIZE,
+            headers={'Range': 'bytes=0-3',
+                     'If-Match': '"object_hash"'}).AndReturn(obj)
+        self.mox.ReplayAll()
+
+        download_url = reverse('horizon:project:containers:object_download',
+                               args=[container.name, obj.name])
+        res = self.client.get(download_url, HTTP_RANGE='bytes=0-3',
+                              HTTP_IF_RANGE='"object_hash"')
+
+        self.assertEqual(206, res.status_code)
+        self.assertEqual(b'Fake', b''.join(res.streaming_content))
+        self.assertEqual('bytes 0-3/9', res['Content-Range'])
+        self.assertEqual('4', res['Content-Length'])
+        self.assertEqual('bytes', res['Accept-Ranges'])
+        self.assertEqual('"object_hash"', res['ETag'])
+
+    @test.create_stubs({api.swift: ('swift_get_object',)})
+    def test_download_range_object_changed(self):
+        container = self.containers.first()
+        obj = copy.copy(self.objects.first())
+        _data = obj.data
+        obj.data = iter([_data])
+        exc = copy.copy(self.exceptions.swift)
+        exc.http_status = 412
+        api.swift.swift_get_object(
+            IsA(http.HttpRequest),
+            container.name,
+            obj.name,
+            resp_chunk_size=api.swift.CHUNK_SIZE,
+            headers={'Range': 'bytes=4-',
+                     'If-Match': '"old_hash"'}).AndRaise(exc)
+        api.swift.swift_get_object(
+            IsA(http.HttpRequest),
+            container.name,
+            obj.name,
+            resp_chunk_size=api.swift.CHUNK_SIZE).AndReturn(obj)
+        self.mox.ReplayAll()
+
+        download_url = reverse('horizon:project:containers:object_download',
+                               args=[container.name, obj.name])
+        res = self.client.get(download_url, HTTP_RANGE='bytes=4-',
+                              HTTP_IF_RANGE='"old_hash"')
+
+        self.assertEqual(200, res.status_code)
+        self.assertEqual(_data, b''.join(res.streaming_content))
+        self.assertFalse(res.has_header('Content-Range'))
+
+    @test.create_stubs({api.swift: ('swift_get_object',)})
+    def test_download_several_ranges(self):
+        container = self.containers.first()
+        obj = copy.copy(self.objects.first())
+        _data = obj.data
+        obj.data = iter([_data])
+        # Swift would answer with a multipart body, so the whole object is
+        # requested instead.
+        api.swift.swift_get_object(
+            IsA(http.HttpRequest),
+            container.name,
+            obj.name,
+            resp_chunk_size=api.swift.CHUNK_SIZE).AndReturn(obj)
+        self.mox.ReplayAll()
+
+        download_url = reverse('horizon:project:containers:object_download',
+                               args=[container.name, obj.name])
+        res = self.client.get(download_url, HTTP_RANGE='bytes=0-1,5-6')
+
+        self.assertEqual(200, res.status_code)
+        self.assertEqual(_data, b''.join(res.streaming_content))
+        self.assertFalse(res.has_header('Content-Range'))
+
+    @test.create_stubs({api.swift: ('swift_get_object',
+                                    'swift_prefetch_object')})
+    def test_download_prefetch(self):
+        container = self.containers.first()
+        obj = copy.copy(self.objects.first())
+        _data = obj.data
+        obj.data = None
+        obj.bytes = '9'
+        obj.etag = 'object_hash'
+        api.swift.swift_get_object(IsA(http.HttpRequest),
+                                   container.name,
+                                   obj.name,
+                                   with_data=False).AndReturn(obj)
+        api.swift.swift_prefetch_object(
+            IsA(http.HttpRequest), container.name, obj.name, 5, 8,
+            etag='object_hash').AndReturn(iter([_data[5:]]))
+        self.mox.ReplayAll()
+
+        download_url = reverse('horizon:project:containers:object_download',
+                               args=[container.name, obj.name])
+        with mock.patch.object(api.swift, 'DOWNLOAD_PREFETCH', 2):
+            res = self.client.get(download_url, HTTP_RANGE='bytes=-4')
+
+        self.assertEqual(206, res.status_code)
+        self.assertEqual(b'Data', b''.join(res.streaming_content))
+        self.assertEqual('bytes 5-8/9', res['Content-Range'])
+        self.assertEqual('4', res['Content-Length'])
+
+    @test.create_stubs({api.swift: ('swift_get_object',)})
+    def test_download_range_not_satisfiable(self):
+        container = self.containers.first()
+        obj = self.objects.first()
+        exc = copy.copy(self.exceptions.swift)
+        exc.http_status = 416
+        api.swift.swift_get_object(
+            IsA(http.HttpRequest),
+            container.name,
+            obj.name,
+            resp_chunk_size=api.swift.CHUNK_SIZE,
+            headers={'Range': 'bytes=100-'}).AndRaise(exc)
+        self.mox.ReplayAll()
+
+        download_url = reverse('horizon:project:containers:object_download',
+                               args=[container.name, obj.name])
+        res = self.client.get(download_url, HTTP_RANGE='bytes=100-')
+
+        self.assertEqual(416, res.status_code)
+
     @test.create_stubs({api.swift: ('swift_get_containers',)})
     def test_copy_index(self):
         ret = (self.containers.list(), False)
@@ -455,7 +631,8 @@ class SwiftTests(test.TestCase):
         api.swift.swift_upload_object(IsA(http.HttpRequest),
                                       container.name,
                                       obj.name,
-                                      IsA(InMemoryUploadedFile)).AndReturn(obj)
+                                      IsA(InMemoryUploadedFile),
+                                      overwrite=True).AndReturn(obj)
         self.mox.ReplayAll()
 
         update_url = reverse('horizon:project:containers:object_update',
@@ -549,3 +726,20 @@ class SwiftTests(test.TestCase):
         }
         for name, expected_name in expected.items():
             self.assertEqual(utils.wrap_delimiter(name), expected_name)
+
+    def test_parse_range(self):
+        expected = {
+            None: None,
+            'bytes=0-3': (0, 3),
+            'bytes=4-': (4, 8),
+            'bytes=5-100': (5, 8),
+            'bytes=-4': (5, 8),
+            'bytes=-100': (0, 8),
+            'bytes=3-2': None,        # invalid, the whole object is sent
+            'bytes=0-1,4-5': None,    # several ranges are not supported
+            'items=0-3': None,
+        }
+        for header, expected_range in expected.items():
+            self.assertEqual(utils.parse_range(header, 9), expected_range)
+        for header in ('bytes=9-', 'bytes=-0'):
+            self.assertRaises(ValueError, utils.parse_range, header, 9)
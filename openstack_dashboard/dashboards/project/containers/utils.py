@@ -17,3 +17,76 @@ def wrap_delimiter(name):
     if name and not name.endswith(swift.FOLDER_DELIMITER):
         return name + swift.FOLDER_DELIMITER
     return name
+
+
+def _is_single_range(range_header):
+    unit, _sep, byte_range = range_header.partition('=')
+    return unit.strip() == 'bytes' and ',' not in byte_range
+
+
+def get_range_headers(request):
+    """Returns the headers passing the Range of a download on to Swift.
+
+    Swift is asked for the range only if the object still matches the
+    ``If-Range`` validator sent by the client. If it does not, Swift fails
+    the request with a 412 status and the whole object has to be sent
+    instead. Requests for several ranges, which Swift would answer with a
+    multipart body, get the whole object as well.
+    """
+    range_header = request.META.get('HTTP_RANGE')
+    if not range_header or not _is_single_range(range_header):
+        return {}
+    headers = {'Range': range_header}
+    if_range = request.META.get('HTTP_IF_RANGE')
+    if if_range:
+        if if_range.startswith('W/'):
+            # Weak entity tags never match a range request.
+            return {}
+        elif if_range.startswith('"'):
+            headers['If-Match'] = if_range
+        else:
+            headers['If-Unmodified-Since'] = if_range
+    return headers
+
+
+def if_range_matches(request, obj):
+    if_range = request.META.get('HTTP_IF_RANGE')
+    if not if_range:
+        return True
+    if if_range.startswith('"'):
+        return if_range.strip('"') == (obj.etag or '').strip('"')
+    return if_range == obj.last_modified
+
+
+def parse_range(range_header, size):
+    """Returns the first and last byte requested by a Range header.
+
+    ``None`` is returned when the whole object has to be sent, which is the
+    case for invalid headers and requests for several ranges. A
+    ``ValueError`` is raised when the range cannot be satisfied.
+    """
+    if not range_header:
+        return None
+    if not _is_single_range(range_header):
+        return None
+    byte_range = range_header.partition('=')[2]
+    first, sep, last = byte_range.strip().partition('-')
+    if not sep or not (first or last):
+        return None
+    try:
+        first = int(first) if first else None
+        last = int(last) if last else None
+    except ValueError:
+        return None
+    if first is None:
+        # A suffix range, for the last ``last`` bytes of the object.
+        if not last or not size:
+            raise ValueError(range_header)
+        return max(size - last, 0), size - 1
+    if last is not None and last < first:
+        return None
+    if first >= size:
+        raise ValueError(range_header)
+    if last is None or last >= size:
+        last = size - 1
+    return first, last
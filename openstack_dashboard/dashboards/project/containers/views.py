@@ -40,6 +40,7 @@ from openstack_dashboard.dashboards.project.containers \
     import browsers as project_browsers
 from openstack_dashboard.dashboards.project.containers \
     import forms as project_forms
+from openstack_dashboard.dashboards.project.containers import handlers
 from openstack_dashboard.dashboards.project.containers import utils
 
 
@@ -170,7 +171,7 @@ class CreatePseudoFolderView(forms.ModalFormView):
         return context
 
 
-class UploadView(forms.ModalFormView):
+class UploadView(handlers.StreamingUploadMixin, forms.ModalFormView):
     form_class = project_forms.UploadObject
     template_name = 'project/containers/upload.html'
     success_url = "horizon:project:containers:index"
@@ -192,11 +193,52 @@ class UploadView(forms.ModalFormView):
         return context
 
 
+def _get_object(request, container_name, object_path, headers):
+    kwargs = {'resp_chunk_size': swift.CHUNK_SIZE}
+    if headers:
+        kwargs['headers'] = headers
+    try:
+        return api.swift.swift_get_object(request, container_name,
+                                          object_path, **kwargs)
+    except Exception as exc:
+        if headers and getattr(exc, 'http_status', None) == 412:
+            # The object has changed since the client began downloading
+            # it, so the whole object is sent again.
+            return _get_object(request, container_name, object_path, None)
+        raise
+
+
+def _get_prefetched_object(request, container_name, object_path):
+    obj = api.swift.swift_get_object(request, container_name, object_path,
+                                     with_data=False)
+    size = int(obj.bytes)
+    byte_range = None
+    if utils.if_range_matches(request, obj):
+        byte_range = utils.parse_range(request.META.get('HTTP_RANGE'), size)
+    if byte_range is None:
+        first, last = 0, size - 1
+    else:
+        first, last = byte_range
+        obj.content_range = 'bytes %d-%d/%d' % (first, last, size)
+        obj.bytes = last - first + 1
+    obj.data = api.swift.swift_prefetch_object(
+        request, container_name, object_path, first, last, etag=obj.etag)
+    return obj
+
+
 def object_download(request, container_name, object_path):
     try:
-        obj = api.swift.swift_get_object(request, container_name, object_path,
-                                         resp_chunk_size=swift.CHUNK_SIZE)
-    except Exception:
+        if swift.DOWNLOAD_PREFETCH:
+            obj = _get_prefetched_object(request, container_name,
+                                         object_path)
+        else:
+            obj = _get_object(request, container_name, object_path,
+                              utils.get_range_headers(request))
+    except Exception as exc:
+        if (isinstance(exc, ValueError) or
+                getattr(exc, 'http_status', None) == 416):
+            # The requested range is not satisfiable.
+            return http.HttpResponse(status=416)
         redirect = reverse("horizon:project:containers:index")
         exceptions.handle(request,
                           _("Unable to retrieve object."),
@@ -214,6 +256,16 @@ def object_download(request, container_name, object_path):
     response['Content-Disposition'] = 'attachment; filename="%s"' % safe_name
     response['Content-Type'] = 'application/octet-stream'
     response['Content-Length'] = obj.bytes
+    # Let clients resume interrupted downloads.
+    response['Accept-Ranges'] = 'bytes'
+    etag = getattr(obj, 'etag', None)
+    if etag:
+        response['ETag'] = '"%s"' % etag.strip('"')
+    if getattr(obj, 'last_modified', None):
+        response['Last-Modified'] = obj.last_modified
+    if getattr(obj, 'content_range', None):
+        response.status_code = 206
+        response['Content-Range'] = obj.content_range
     return response
 
 
@@ -312,7 +364,8 @@ class ObjectDetailView(forms.ModalFormMixin, generic.TemplateView):
         return context
 
 
-class UpdateObjectView(forms.ModalFormView):
+class UpdateObjectView(handlers.StreamingUploadMixin,
+                       forms.ModalFormView):
     form_class = project_forms.UpdateObject
     template_name = 'project/containers/update.html'
     success_url = "horizon:project:containers:index"
@@ -39,6 +39,7 @@ class Firewall(horizon.Panel):
             LOG.error("Call to list enabled services failed. This is likely "
                       "due to a problem communicating with the Neutron "
                       "endpoint. Firewalls panel will not be displayed.")
+            horizon.base.access_check_failed(context['request'])
             return False
         if not super(Firewall, self).allowed(context):
             return False
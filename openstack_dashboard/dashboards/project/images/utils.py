@@ -10,6 +10,8 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import collections
+
 from django.utils.translation import ugettext_lazy as _
 
 from horizon import exceptions
@@ -32,12 +34,8 @@ def get_available_images(request, project_id=None, images_cache=None):
     public_images = images_cache.get('public_images', [])
     images_by_project = images_cache.get('images_by_project', {})
     if 'public_images' not in images_cache:
-        public = {"is_public": True,
-                  "status": "active"}
         try:
-            images, _more, _prev = glance.image_list_detailed(
-                request, filters=public)
-            [public_images.append(image) for image in images]
+            public_images = glance.image_index(request, 'public').images
             images_cache['public_images'] = public_images
         except Exception:
             exceptions.handle(request,
@@ -48,11 +46,9 @@ def get_available_images(request, project_id=None, images_cache=None):
         images_by_project[project_id] = []
 
     if project_id not in images_by_project:
-        owner = {"property-owner_id": project_id,
-                 "status": "active"}
         try:
-            owned_images, _more, _prev = glance.image_list_detailed(
-                request, filters=owner)
+            owned_images = glance.image_index(request, 'project',
+                                              project_id).images
             images_by_project[project_id] = owned_images
         except Exception:
             owned_images = []
@@ -65,16 +61,11 @@ def get_available_images(request, project_id=None, images_cache=None):
     if 'images_by_project' not in images_cache:
         images_cache['images_by_project'] = images_by_project
 
-    images = owned_images + public_images
-
     # Remove duplicate images
-    image_ids = []
-    final_images = []
-    for image in images:
-        if image.id not in image_ids:
-            image_ids.append(image.id)
-            final_images.append(image)
-    return [image for image in final_images
+    images = collections.OrderedDict()
+    for image in owned_images + public_images:
+        images.setdefault(image.id, image)
+    return [image for image in images.values()
             if image.container_format not in ('aki', 'ari')]
 
 
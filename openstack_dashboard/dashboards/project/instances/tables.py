@@ -34,7 +34,9 @@ from horizon import exceptions
 from horizon import messages
 from horizon import tables
 from horizon.templatetags import sizeformat
+from horizon.utils import concurrency
 from horizon.utils import filters
+from horizon.utils import functions as utils
 
 from openstack_dashboard import api
 from openstack_dashboard.dashboards.project.access_and_security.floating_ips \
@@ -87,6 +89,7 @@ class DeleteInstance(policy.PolicyTargetMixin, tables.BatchAction):
     icon = "remove"
     policy_rules = (("compute", "compute:delete"),)
     help_text = _("Deleted instances are not recoverable.")
+    concurrency = 8
 
     @staticmethod
     def action_present(count):
@@ -118,6 +121,7 @@ class RebootInstance(policy.PolicyTargetMixin, tables.BatchAction):
     policy_rules = (("compute", "compute:reboot"),)
     help_text = _("Restarted instances will lose any data"
                   " not saved in persistent storage.")
+    concurrency = 8
 
     @staticmethod
     def action_present(count):
@@ -744,21 +748,68 @@ def get_instance_error(instance):
 
 class UpdateRow(tables.Row):
     ajax = True
+    ajax_batch = True
 
     def get_data(self, request, instance_id):
         instance = api.nova.server_get(request, instance_id)
+        self._load_details(request, instance)
+        return instance
+
+    def get_data_batch(self, request, instance_ids):
+        # The instances of a page are fetched concurrently, one call each,
+        # rather than by listing every instance of the project, which only
+        # pays off for more instances than fit in a page. Instances which
+        # failed to load are reported with their error rather than fetched
+        # again, while those missing from the listing go through get_data.
+        flavors_task = concurrency.Task(api.nova.flavor_list,
+                                        args=(request,))
+        instances = {}
+        if len(instance_ids) > utils.get_page_size(request):
+            servers_task = concurrency.Task(api.nova.server_list,
+                                            args=(request,))
+            concurrency.execute([flavors_task, servers_task])
+            servers = servers_task.get()[0]
+        else:
+            server_tasks = [concurrency.Task(api.nova.server_get,
+                                             args=(request, instance_id))
+                            for instance_id in instance_ids]
+            concurrency.execute([flavors_task] + server_tasks)
+            servers = []
+            for instance_id, task in zip(instance_ids, server_tasks):
+                if task.exc_info:
+                    instances[instance_id] = task.exc_info[1]
+                else:
+                    servers.append(task.result)
         try:
-            instance.full_flavor = api.nova.flavor_get(request,
-                                                       instance.flavor["id"])
+            flavors = dict((flavor.id, flavor)
+                           for flavor in flavors_task.get())
+        except Exception:
+            flavors = {}
+            exceptions.handle(request, ignore=True)
+
+        instance_ids = set(instance_ids)
+        for instance in servers:
+            if instance.id in instance_ids:
+                self._load_details(request, instance, flavors)
+                instances[instance.id] = instance
+        return instances
+
+    def _load_details(self, request, instance, flavors=None):
+        flavor_id = instance.flavor["id"]
+        try:
+            if flavors and flavor_id in flavors:
+                instance.full_flavor = flavors[flavor_id]
+            else:
+                instance.full_flavor = api.nova.flavor_get(request,
+                                                           flavor_id)
         except Exception:
             exceptions.handle(request,
                               _('Unable to retrieve flavor information '
-                                'for instance "%s".') % instance_id,
+                                'for instance "%s".') % instance.id,
                               ignore=True)
         error = get_instance_error(instance)
         if error:
             messages.error(request, error)
-        return instance
 
 
 class StartInstance(policy.PolicyTargetMixin, tables.BatchAction):
@@ -4622,6 +4622,65 @@ class InstanceAjaxTests(helpers.TestCase):
         self.assertContains(res, server.name)
         self.assertContains(res, "Not available")
 
+    def _test_rows_update(self, servers_stub):
+        servers = self.servers.list()[:2]
+        instance_ids = [server.id for server in servers]
+
+        api.nova.extension_supported('AdminActions', IsA(http.HttpRequest))\
+            .MultipleTimes().AndReturn(True)
+        api.nova.extension_supported('Shelve', IsA(http.HttpRequest)) \
+            .MultipleTimes().AndReturn(True)
+        api.neutron.is_extension_supported(IsA(http.HttpRequest),
+                                           'security-group')\
+            .MultipleTimes().AndReturn(True)
+        api.nova.flavor_list(IsA(http.HttpRequest)).InAnyOrder() \
+            .AndReturn(self.flavors.list())
+        servers_stub(servers)
+
+        self.mox.ReplayAll()
+
+        params = [('action', 'rows_update'),
+                  ('table', 'instances')]
+        params += [('obj_ids', obj_id) for obj_id in instance_ids + ['gone']]
+        res = self.client.get('?'.join((INDEX_URL, urlencode(params))),
+                              HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+        data = json.loads(res.content.decode('utf-8'))
+        self.assertItemsEqual(instance_ids, data['rows'])
+        for server in servers:
+            self.assertIn(server.name, data['rows'][server.id])
+        self.assertEqual(['gone'], list(data['errors']))
+
+    @helpers.create_stubs({api.nova: ("server_get",
+                                      "flavor_list",
+                                      "extension_supported"),
+                           api.neutron: ("is_extension_supported",)})
+    def test_rows_update(self):
+        def servers_stub(servers):
+            # The instances of the rows are fetched one by one, and those
+            # which failed to load aren't fetched again.
+            for server in servers:
+                api.nova.server_get(IsA(http.HttpRequest), server.id) \
+                    .InAnyOrder().AndReturn(server)
+            api.nova.server_get(IsA(http.HttpRequest), 'gone').InAnyOrder() \
+                .AndRaise(self.exceptions.nova)
+        self._test_rows_update(servers_stub)
+
+    @django.test.utils.override_settings(API_RESULT_PAGE_SIZE=2)
+    @helpers.create_stubs({api.nova: ("server_list",
+                                      "server_get",
+                                      "flavor_list",
+                                      "extension_supported"),
+                           api.neutron: ("is_extension_supported",)})
+    def test_rows_update_more_than_a_page(self):
+        def servers_stub(servers):
+            # More rows than fit in a page are found in a single listing,
+            # and those missing from it are fetched on their own.
+            api.nova.server_list(IsA(http.HttpRequest)).InAnyOrder() \
+                .AndReturn([self.servers.list(), False])
+            api.nova.server_get(IsA(http.HttpRequest), 'gone') \
+                .AndRaise(self.exceptions.nova)
+        self._test_rows_update(servers_stub)
+
 
 class ConsoleManagerTests(helpers.TestCase):
 
@@ -34,6 +34,7 @@ from horizon import forms
 from horizon import messages
 from horizon import tables
 from horizon import tabs
+from horizon.utils import concurrency
 from horizon.utils import memoized
 from horizon import workflows
 
@@ -78,33 +79,27 @@ class IndexView(tables.DataTableView):
                               _('Unable to retrieve instances.'))
 
         if instances:
-            try:
-                api.network.servers_update_addresses(self.request, instances)
-            except Exception:
-                exceptions.handle(
-                    self.request,
-                    message=_('Unable to retrieve IP addresses from Neutron.'),
-                    ignore=True)
-
+            # Addresses, flavors and images are independent of each other,
+            # so fetch them concurrently.
+            gather = concurrency.Gather(self.request)
+            gather.add(
+                'addresses', api.network.servers_update_addresses,
+                args=(self.request, instances),
+                message=_('Unable to retrieve IP addresses from Neutron.'),
+                ignore=True)
             # Gather our flavors and images and correlate our instances to them
-            try:
-                flavors = api.nova.flavor_list(self.request)
-            except Exception:
-                flavors = []
-                exceptions.handle(self.request, ignore=True)
-
-            try:
-                # TODO(gabriel): Handle pagination.
-                images, more, prev = api.glance.image_list_detailed(
-                    self.request)
-            except Exception:
-                images = []
-                exceptions.handle(self.request, ignore=True)
+            gather.add('flavors', api.nova.flavor_list, args=(self.request,),
+                       default=[], ignore=True)
+            # TODO(gabriel): Handle pagination.
+            gather.add('images', api.glance.image_index,
+                       args=(self.request,), default=api.glance.ImageIndex(),
+                       ignore=True)
+            results = gather.run()
+            flavors = results['flavors']
+            image_map = results['images']
 
             full_flavors = OrderedDict([(str(flavor.id), flavor)
                                        for flavor in flavors])
-            image_map = OrderedDict([(str(image.id), image)
-                                    for image in images])
 
             # Loop through instances to get flavor info.
             for instance in instances:
@@ -112,7 +107,8 @@ class IndexView(tables.DataTableView):
                     # Instance from image returns dict
                     if isinstance(instance.image, dict):
                         if instance.image.get('id') in image_map:
-                            instance.image = image_map[instance.image['id']]
+                            instance.image = image_map.get(
+                                instance.image['id'])
 
                 try:
                     flavor_id = instance.flavor["id"]
@@ -39,6 +39,7 @@ class LoadBalancer(horizon.Panel):
             LOG.error("Call to list enabled services failed. This is likely "
                       "due to a problem communicating with the Neutron "
                       "endpoint. Load Balancers panel will not be displayed.")
+            horizon.base.access_check_failed(context['request'])
             return False
         if not super(LoadBalancer, self).allowed(context):
             return False
@@ -45,7 +45,7 @@ class NetworkTopologyTests(test.TestCase):
     def test_json_view_router_disabled(self):
         self._test_json_view(router_enable=False)
 
-    def _test_json_view(self, router_enable=True):
+    def _stub_json_view_calls(self, router_enable=True, ports=None):
         api.nova.server_list(
             IsA(http.HttpRequest)).AndReturn([self.servers.list(), False])
         tenant_networks = [net for net in self.networks.list()
@@ -68,9 +68,15 @@ class NetworkTopologyTests(test.TestCase):
             api.neutron.router_list(
                 IsA(http.HttpRequest),
                 tenant_id=self.tenant.id).AndReturn(routers)
+        if ports is None:
+            ports = self.ports.list()
         api.neutron.port_list(
-            IsA(http.HttpRequest)).AndReturn(self.ports.list())
+            IsA(http.HttpRequest)).AndReturn(ports)
+        return tenant_networks, external_networks, routers
 
+    def _test_json_view(self, router_enable=True):
+        tenant_networks, external_networks, routers = \
+            self._stub_json_view_calls(router_enable)
         self.mox.ReplayAll()
 
         res = self.client.get(JSON_URL)
@@ -84,7 +90,6 @@ class NetworkTopologyTests(test.TestCase):
             {'id': server.id,
              'name': server.name,
              'status': server.status,
-             'task': None,
              'url': '/project/instances/%s/' % server.id}
             for server in self.servers.list()]
         self.assertEqual(expect_server_urls, data['servers'])
@@ -95,8 +100,6 @@ class NetworkTopologyTests(test.TestCase):
         if router_enable:
             expect_router_urls = [
                 {'id': router.id,
-                 'external_gateway_info':
-                 router.external_gateway_info,
                  'name': router.name,
                  'status': router.status,
                  'url': '/project/routers/%s/' % router.id}
@@ -137,7 +140,9 @@ class NetworkTopologyTests(test.TestCase):
             {'id': port.id,
              'device_id': port.device_id,
              'device_owner': port.device_owner,
-             'fixed_ips': port.fixed_ips,
+             'fixed_ips': [{'ip_address': ip['ip_address'],
+                            'subnet_id': ip['subnet_id']}
+                           for ip in port.fixed_ips],
              'network_id': port.network_id,
              'status': port.status,
              'url': '/project/networks/ports/%s/detail' % port.id}
@@ -152,6 +157,51 @@ class NetworkTopologyTests(test.TestCase):
                  'network_id': ext_net.id,
                  'fixed_ips': []})
         self.assertEqual(expect_port_urls, data['ports'])
+        self.assertTrue(res.has_header('ETag'))
+
+    @django.test.utils.override_settings(CONSOLE_TYPE=None)
+    @test.create_stubs({api.nova: ('server_list',),
+                        api.neutron: ('network_list_for_tenant',
+                                      'network_list',
+                                      'router_list',
+                                      'port_list')})
+    def test_json_view_not_modified(self):
+        self._stub_json_view_calls()
+        self._stub_json_view_calls()
+        self.mox.ReplayAll()
+
+        res = self.client.get(JSON_URL)
+        self.assertEqual(200, res.status_code)
+        res = self.client.get(JSON_URL, HTTP_IF_NONE_MATCH=res['ETag'])
+        self.assertEqual(304, res.status_code)
+        self.assertEqual(b'', res.content)
+
+    @django.test.utils.override_settings(CONSOLE_TYPE=None)
+    @test.create_stubs({api.nova: ('server_list',),
+                        api.neutron: ('network_list_for_tenant',
+                                      'network_list',
+                                      'router_list',
+                                      'port_list')})
+    def test_json_view_changes(self):
+        ports = self.ports.list()
+        self._stub_json_view_calls()
+        self._stub_json_view_calls(ports=ports[1:])
+        self.mox.ReplayAll()
+
+        res = self.client.get(JSON_URL)
+        etag = res['ETag']
+        res = self.client.get(JSON_URL, {'since': etag})
+        self.assertEqual(200, res.status_code)
+        self.assertNotEqual(etag, res['ETag'])
+        data = jsonutils.loads(res.content)
+
+        self.assertEqual(etag, data['since'])
+        for kind in ('servers', 'networks', 'routers'):
+            self.assertEqual({'added': [], 'changed': [], 'removed': []},
+                             data['changes'][kind])
+        self.assertEqual({'added': [], 'changed': [],
+                          'removed': [ports[0].id + ports[0].device_id]},
+                         data['changes']['ports'])
 
 
 class NetworkTopologyCreateTests(test.TestCase):
@@ -16,16 +16,21 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import hashlib
 import json
 
 from django.conf import settings
+from django.core.cache import cache
 from django.core.urlresolvers import reverse
 from django.core.urlresolvers import reverse_lazy
 from django.http import HttpResponse  # noqa
+from django.http import HttpResponseNotModified  # noqa
+from django.utils.encoding import force_bytes
 from django.utils.translation import ugettext_lazy as _
 from django.views.generic import View  # noqa
 
 from horizon import exceptions
+from horizon.utils import concurrency
 from horizon import views
 
 from openstack_dashboard import api
@@ -222,7 +227,6 @@ class JSONView(View):
 
             server_data = {'name': server.name,
                            'status': server.status,
-                           'task': getattr(server, 'OS-EXT-STS:task_state'),
                            'id': server.id}
             if console:
                 server_data['console'] = console
@@ -318,7 +322,9 @@ class JSONView(View):
         ports = [{'id': port.id,
                   'network_id': port.network_id,
                   'device_id': port.device_id,
-                  'fixed_ips': port.fixed_ips,
+                  'fixed_ips': [{'ip_address': ip['ip_address'],
+                                 'subnet_id': ip['subnet_id']}
+                                for ip in port.fixed_ips],
                   'device_owner': port.device_owner,
                   'status': port.status}
                  for port in neutron_ports
@@ -348,11 +354,70 @@ class JSONView(View):
                          'fixed_ips': []}
             ports.append(fake_port)
 
+    def _get_cache_key(self, request, etag):
+        token = hashlib.md5(request.user.token.id.encode('utf-8'))
+        return 'network_topology:%s:%s' % (token.hexdigest(), etag)
+
+    def _get_changes(self, previous, data):
+        """Returns the nodes added, changed and removed since ``previous``.
+
+        Ports are identified by their id and device, as the fake gateway
+        ports of routers sharing an external network have the same id.
+        """
+        changes = {}
+        for kind, nodes in data.items():
+            def key(node):
+                if kind == 'ports':
+                    return node['id'] + node['device_id']
+                return node['id']
+            old_nodes = dict((key(node), node)
+                             for node in previous.get(kind, []))
+            added, changed = [], []
+            for node in nodes:
+                old_node = old_nodes.pop(key(node), None)
+                if old_node is None:
+                    added.append(node)
+                elif old_node != node:
+                    changed.append(node)
+            changes[kind] = {'added': added,
+                             'changed': changed,
+                             'removed': list(old_nodes)}
+        return changes
+
     def get(self, request, *args, **kwargs):
-        data = {'servers': self._get_servers(request),
-                'networks': self._get_networks(request),
-                'ports': self._get_ports(request),
-                'routers': self._get_routers(request)}
+        gather = concurrency.Gather(request)
+        for kind, func in (('servers', self._get_servers),
+                           ('networks', self._get_networks),
+                           ('ports', self._get_ports),
+                           ('routers', self._get_routers)):
+            gather.add(kind, func, args=(request,), default=[], ignore=True)
+        data = gather.run()
         self._prepare_gateway_ports(data['routers'], data['ports'])
-        json_string = json.dumps(data, ensure_ascii=False)
-        return HttpResponse(json_string, content_type='text/json')
+        # The renderer only needs the gateway ports added above.
+        for router in data['routers']:
+            router.pop('external_gateway_info', None)
+
+        json_string = json.dumps(data, ensure_ascii=False, sort_keys=True)
+        etag = '"%s"' % hashlib.md5(force_bytes(json_string)).hexdigest()
+        since = request.GET.get('since')
+        if etag in (since, request.META.get('HTTP_IF_NONE_MATCH')):
+            response = HttpResponseNotModified()
+            response['ETag'] = etag
+            return response
+
+        # Keep this version of the topology for a while, so that the next
+        # poll only has to receive what changed since.
+        timeout = getattr(settings, 'NETWORK_TOPOLOGY_CACHE_TIMEOUT', 60)
+        if timeout:
+            previous = None
+            if since:
+                previous = cache.get(self._get_cache_key(request, since))
+            if previous is not None:
+                json_string = json.dumps(
+                    {'since': since,
+                     'changes': self._get_changes(previous, data)},
+                    ensure_ascii=False)
+            cache.set(self._get_cache_key(request, etag), data, timeout)
+        response = HttpResponse(json_string, content_type='text/json')
+        response['ETag'] = etag
+        return response
@@ -42,20 +42,23 @@ class UsageViewTests(test.TestCase):
                                    'extension_supported')})
     def _stub_nova_api_calls(self, nova_stu_enabled=True,
                              tenant_limits_exception=False,
-                             stu_exception=False):
+                             stu_exception=False, csv=False):
         api.nova.extension_supported(
             'SimpleTenantUsage', IsA(http.HttpRequest)) \
             .AndReturn(nova_stu_enabled)
-        api.nova.extension_supported(
-            'SimpleTenantUsage', IsA(http.HttpRequest)) \
-            .AndReturn(nova_stu_enabled)
-
-        if tenant_limits_exception:
-            api.nova.tenant_absolute_limits(IsA(http.HttpRequest))\
-                .AndRaise(tenant_limits_exception)
-        else:
-            api.nova.tenant_absolute_limits(IsA(http.HttpRequest)) \
-                .AndReturn(self.limits['absolute'])
+        # The CSV export neither shows the limits nor builds the context
+        # of the page, which checks the extension once more.
+        if not csv:
+            api.nova.extension_supported(
+                'SimpleTenantUsage', IsA(http.HttpRequest)) \
+                .AndReturn(nova_stu_enabled)
+
+            if tenant_limits_exception:
+                api.nova.tenant_absolute_limits(IsA(http.HttpRequest))\
+                    .AndRaise(tenant_limits_exception)
+            else:
+                api.nova.tenant_absolute_limits(IsA(http.HttpRequest)) \
+                    .AndReturn(self.limits['absolute'])
 
         if nova_stu_enabled:
             self._nova_stu_enabled(stu_exception)
@@ -177,14 +180,13 @@ class UsageViewTests(test.TestCase):
         self._test_usage_csv(nova_stu_enabled=False)
 
     def _test_usage_csv(self, nova_stu_enabled=True):
-        self._stub_nova_api_calls(nova_stu_enabled)
-        self._stub_neutron_api_calls()
-        self._stub_cinder_api_calls()
+        self._stub_nova_api_calls(nova_stu_enabled, csv=True)
         self.mox.ReplayAll()
         res = self.client.get(reverse('horizon:project:overview:index') +
                               "?format=csv")
         self.assertTemplateUsed(res, 'project/overview/usage.csv')
         self.assertTrue(isinstance(res.context['usage'], usage.ProjectUsage))
+        self.assertTrue(res.streaming)
 
     def test_usage_exception_usage(self):
         self._stub_nova_api_calls(stu_exception=self.exceptions.nova)
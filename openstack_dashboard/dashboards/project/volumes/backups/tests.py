@@ -52,27 +52,32 @@ class VolumeBackupsViewTests(test.TestCase):
         self.assertMessageCount(error=0, warning=0)
         self.assertRedirectsNoFollow(res, VOLUME_BACKUPS_TAB_URL)
 
-    @test.create_stubs({api.cinder: ('volume_list',
+    def _stub_volume_get(self, backups):
+        for backup in backups:
+            api.cinder.volume_get(IsA(http.HttpRequest), backup.volume_id,
+                                  details=False).InAnyOrder(). \
+                AndReturn(self.cinder_volumes.get(id=backup.volume_id))
+
+    @test.create_stubs({api.cinder: ('volume_get',
                                      'volume_backup_supported',
-                                     'volume_backup_list',
+                                     'volume_backup_list_paged',
                                      'volume_backup_delete')})
     def test_delete_volume_backup(self):
         vol_backups = self.cinder_volume_backups.list()
-        volumes = self.cinder_volumes.list()
         backup = self.cinder_volume_backups.first()
 
         api.cinder.volume_backup_supported(IsA(http.HttpRequest)). \
             MultipleTimes().AndReturn(True)
-        api.cinder.volume_backup_list(IsA(http.HttpRequest)). \
-            AndReturn(vol_backups)
-        api.cinder.volume_list(IsA(http.HttpRequest)). \
-            AndReturn(volumes)
+        api.cinder.volume_backup_list_paged(
+            IsA(http.HttpRequest), marker=None, sort_dir='desc',
+            paginate=True).AndReturn([vol_backups, False, False])
+        self._stub_volume_get(vol_backups)
         api.cinder.volume_backup_delete(IsA(http.HttpRequest), backup.id)
 
-        api.cinder.volume_backup_list(IsA(http.HttpRequest)). \
-            AndReturn(vol_backups)
-        api.cinder.volume_list(IsA(http.HttpRequest)). \
-            AndReturn(volumes)
+        api.cinder.volume_backup_list_paged(
+            IsA(http.HttpRequest), marker=None, sort_dir='desc',
+            paginate=True).AndReturn([vol_backups, False, False])
+        self._stub_volume_get(vol_backups)
         self.mox.ReplayAll()
 
         formData = {'action':
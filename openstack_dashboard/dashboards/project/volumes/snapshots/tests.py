@@ -105,27 +105,29 @@ class VolumeSnapshotsViewTests(test.TestCase):
         res = self.client.post(url, formData)
         self.assertRedirectsNoFollow(res, VOLUME_SNAPSHOTS_TAB_URL)
 
-    @test.create_stubs({api.cinder: ('volume_snapshot_list',
-                                     'volume_list',
+    @test.create_stubs({api.cinder: ('volume_snapshot_list_paged',
+                                     'volume_get',
                                      'volume_backup_supported',
                                      'volume_snapshot_delete')})
     def test_delete_volume_snapshot(self):
         vol_snapshots = self.cinder_volume_snapshots.list()
-        volumes = self.cinder_volumes.list()
         snapshot = self.cinder_volume_snapshots.first()
 
         api.cinder.volume_backup_supported(IsA(http.HttpRequest)). \
             MultipleTimes().AndReturn(True)
-        api.cinder.volume_snapshot_list(IsA(http.HttpRequest)). \
-            AndReturn(vol_snapshots)
-        api.cinder.volume_list(IsA(http.HttpRequest)). \
-            AndReturn(volumes)
+        api.cinder.volume_snapshot_list_paged(
+            IsA(http.HttpRequest), paginate=True, marker=None,
+            sort_dir='desc').AndReturn([vol_snapshots, False, False])
+        for vol_snapshot in vol_snapshots:
+            api.cinder.volume_get(IsA(http.HttpRequest),
+                                  vol_snapshot.volume_id,
+                                  details=False).InAnyOrder(). \
+                AndReturn(self.cinder_volumes.get(id=vol_snapshot.volume_id))
 
         api.cinder.volume_snapshot_delete(IsA(http.HttpRequest), snapshot.id)
-        api.cinder.volume_snapshot_list(IsA(http.HttpRequest)). \
-            AndReturn([])
-        api.cinder.volume_list(IsA(http.HttpRequest)). \
-            AndReturn(volumes)
+        api.cinder.volume_snapshot_list_paged(
+            IsA(http.HttpRequest), paginate=True, marker=None,
+            sort_dir='desc').AndReturn([[], False, False])
         self.mox.ReplayAll()
 
         formData = {'action':
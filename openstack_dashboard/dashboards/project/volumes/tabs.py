@@ -18,6 +18,9 @@ from django.utils.translation import ugettext_lazy as _
 
 from horizon import exceptions
 from horizon import tabs
+from horizon.utils import concurrency
+from horizon.utils import functions as utils
+from horizon.utils import memoized
 
 from openstack_dashboard import api
 
@@ -29,17 +32,91 @@ from openstack_dashboard.dashboards.project.volumes.volumes \
     import tables as volume_tables
 
 
+# The volume tabs of a page may be loaded in the same request, so they
+# share the volumes and snapshots they retrieve.
+@memoized.memoized
+def volume_list(request, search_opts=None):
+    return api.cinder.volume_list(request, search_opts=search_opts)
+
+
+@memoized.memoized
+def volume_snapshot_list(request, search_opts=None):
+    return api.cinder.volume_snapshot_list(request, search_opts=search_opts)
+
+
+class PagedTableMixin(object):
+    """Pages the table of a tab with the markers of its request.
+
+    Tabs using it set ``_has_prev_data`` and ``_has_more_data`` from the
+    paged API call which retrieves their table data.
+    """
+    def __init__(self, *args, **kwargs):
+        super(PagedTableMixin, self).__init__(*args, **kwargs)
+        self._has_prev_data = False
+        self._has_more_data = False
+
+    def has_prev_data(self, table):
+        return self._has_prev_data
+
+    def has_more_data(self, table):
+        return self._has_more_data
+
+    def _get_marker(self):
+        """Returns the marker of the page requested and the sort direction
+        to retrieve it with.
+        """
+        meta = self.table_classes[0]._meta
+        prev_marker = self.request.GET.get(meta.prev_pagination_param, None)
+        if prev_marker:
+            return prev_marker, 'asc'
+        return self.request.GET.get(meta.pagination_param, None), 'desc'
+
+
 class VolumeTableMixIn(object):
     def _get_volumes(self, search_opts=None):
+        marker, sort_dir = self._get_marker()
         try:
-            return api.cinder.volume_list(self.request,
-                                          search_opts=search_opts)
+            volumes, self._has_more_data, self._has_prev_data = \
+                api.cinder.volume_list_paged(self.request, marker=marker,
+                                             search_opts=search_opts,
+                                             sort_dir=sort_dir,
+                                             paginate=True)
+            return volumes
         except Exception:
             exceptions.handle(self.request,
                               _('Unable to retrieve volume list.'))
             return []
 
-    def _get_instances(self, search_opts=None):
+    def _get_max_lookups(self):
+        # Looking up the resources of a page of volumes one by one is
+        # cheaper than listing all of them, but not for many more volumes.
+        return utils.get_page_size(self.request)
+
+    def _get_instances(self, search_opts=None, instance_ids=None):
+        """Returns the instances the volumes are attached to.
+
+        When ``instance_ids`` is given and there are few of them, only
+        these instances are retrieved, concurrently. Otherwise all the
+        instances matching ``search_opts`` are listed.
+        """
+        if (instance_ids is not None and
+                len(instance_ids) <= self._get_max_lookups()):
+            def server_get(instance_id):
+                return api.nova.server_get(self.request, instance_id)
+            instances = []
+            for task in concurrency.map_concurrently(server_get,
+                                                     instance_ids):
+                try:
+                    instances.append(task.get())
+                except Exception as e:
+                    # The instance may have been deleted meanwhile.
+                    if getattr(e, 'code', None) == 404:
+                        continue
+                    exceptions.handle(self.request,
+                                      _("Unable to retrieve volume/instance "
+                                        "attachment information"))
+                    break
+            return instances
         try:
             instances, has_more = api.nova.server_list(self.request,
                                                        search_opts=search_opts)
@@ -50,19 +127,71 @@ class VolumeTableMixIn(object):
                                 "attachment information"))
             return []
 
-    def _get_volumes_ids_with_snapshots(self, search_opts=None):
+    def _get_volumes_ids_with_snapshots(self, search_opts=None,
+                                        volume_ids=None):
+        """Returns the ids of the volumes which have snapshots.
+
+        Like :meth:`_get_instances`, the snapshots of a few volumes given by
+        ``volume_ids`` are looked up volume by volume, concurrently.
+        """
         try:
-            volume_ids = []
-            snapshots = api.cinder.volume_snapshot_list(
-                self.request, search_opts=search_opts)
-            if snapshots:
-                # extract out the volume ids
-                volume_ids = set([(s.volume_id) for s in snapshots])
+            volume_ids_with_snapshots = []
+            if (volume_ids is not None and
+                    len(volume_ids) <= self._get_max_lookups()):
+                def has_snapshots(volume_id):
+                    opts = dict(search_opts or {}, volume_id=volume_id)
+                    return bool(volume_snapshot_list(self.request,
+                                                     search_opts=opts))
+                tasks = concurrency.map_concurrently(has_snapshots,
+                                                     volume_ids)
+                volume_ids_with_snapshots = set(
+                    volume_id for volume_id, task in zip(volume_ids, tasks)
+                    if task.get())
+            else:
+                snapshots = volume_snapshot_list(self.request,
+                                                 search_opts=search_opts)
+                if snapshots:
+                    # extract out the volume ids
+                    volume_ids_with_snapshots = set(
+                        [(s.volume_id) for s in snapshots])
         except Exception:
             exceptions.handle(self.request,
                               _("Unable to retrieve snapshot list."))
 
-        return volume_ids
+        return volume_ids_with_snapshots
+
+    def _get_volumes_by_ids(self, volume_ids, search_opts=None):
+        """Returns the volumes with the given ids, keyed by their id.
+
+        Like :meth:`_get_instances`, a few volumes are retrieved one by
+        one, concurrently. Otherwise all the volumes matching
+        ``search_opts`` are listed.
+        """
+        if len(volume_ids) > self._get_max_lookups():
+            volumes = volume_list(self.request, search_opts=search_opts)
+            return dict((v.id, v) for v in volumes)
+
+        def volume_get(volume_id):
+            return api.cinder.volume_get(self.request, volume_id,
+                                         details=False)
+        tasks = concurrency.map_concurrently(volume_get, volume_ids)
+        volumes = {}
+        for volume_id, task in zip(volume_ids, tasks):
+            try:
+                volumes[volume_id] = task.get()
+            except Exception as e:
+                # The volume may have been deleted meanwhile.
+                if getattr(e, 'code', None) != 404:
+                    raise
+        return volumes
+
+    def _get_attached_instance_ids(self, volumes):
+        instance_ids = set()
+        for volume in volumes:
+            for att in volume.attachments:
+                if att.get('server_id'):
+                    instance_ids.add(att['server_id'])
+        return sorted(instance_ids)
 
     # set attachment string and if volume has snapshots
     def _set_volume_attributes(self,
@@ -79,7 +208,7 @@ class VolumeTableMixIn(object):
                 att['instance'] = instances.get(server_id, None)
 
 
-class VolumeTab(tabs.TableTab, VolumeTableMixIn):
+class VolumeTab(PagedTableMixin, tabs.TableTab, VolumeTableMixIn):
     table_classes = (volume_tables.VolumesTable,)
     name = _("Volumes")
     slug = "volumes_tab"
@@ -88,14 +217,16 @@ class VolumeTab(tabs.TableTab, VolumeTableMixIn):
 
     def get_volumes_data(self):
         volumes = self._get_volumes()
-        instances = self._get_instances()
-        volume_ids_with_snapshots = self._get_volumes_ids_with_snapshots()
+        instances = self._get_instances(
+            instance_ids=self._get_attached_instance_ids(volumes))
+        volume_ids_with_snapshots = self._get_volumes_ids_with_snapshots(
+            volume_ids=[volume.id for volume in volumes])
         self._set_volume_attributes(
             volumes, instances, volume_ids_with_snapshots)
         return volumes
 
 
-class SnapshotTab(tabs.TableTab):
+class SnapshotTab(PagedTableMixin, tabs.TableTab, VolumeTableMixIn):
     table_classes = (vol_snapshot_tables.VolumeSnapshotsTable,)
     name = _("Volume Snapshots")
     slug = "snapshots_tab"
@@ -104,10 +235,14 @@ class SnapshotTab(tabs.TableTab):
 
     def get_volume_snapshots_data(self):
         if api.base.is_service_enabled(self.request, 'volume'):
+            marker, sort_dir = self._get_marker()
             try:
-                snapshots = api.cinder.volume_snapshot_list(self.request)
-                volumes = api.cinder.volume_list(self.request)
-                volumes = dict((v.id, v) for v in volumes)
+                snapshots, self._has_more_data, self._has_prev_data = \
+                    api.cinder.volume_snapshot_list_paged(
+                        self.request, paginate=True, marker=marker,
+                        sort_dir=sort_dir)
+                volumes = self._get_volumes_by_ids(
+                    sorted(set(s.volume_id for s in snapshots)))
             except Exception:
                 snapshots = []
                 volumes = {}
@@ -123,7 +258,7 @@ class SnapshotTab(tabs.TableTab):
         return snapshots
 
 
-class BackupsTab(tabs.TableTab, VolumeTableMixIn):
+class BackupsTab(PagedTableMixin, tabs.TableTab, VolumeTableMixIn):
     table_classes = (backups_tables.BackupsTable,)
     name = _("Volume Backups")
     slug = "backups_tab"
@@ -134,10 +269,14 @@ class BackupsTab(tabs.TableTab, VolumeTableMixIn):
         return api.cinder.volume_backup_supported(self.request)
 
     def get_volume_backups_data(self):
+        marker, sort_dir = self._get_marker()
         try:
-            backups = api.cinder.volume_backup_list(self.request)
-            volumes = api.cinder.volume_list(self.request)
-            volumes = dict((v.id, v) for v in volumes)
+            backups, self._has_more_data, self._has_prev_data = \
+                api.cinder.volume_backup_list_paged(
+                    self.request, marker=marker, sort_dir=sort_dir,
+                    paginate=True)
+            volumes = self._get_volumes_by_ids(
+                sorted(set(b.volume_id for b in backups)))
             for backup in backups:
                 backup.volume = volumes.get(backup.volume_id)
         except Exception:
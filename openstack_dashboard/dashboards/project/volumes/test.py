@@ -27,13 +27,22 @@ VOLUME_BACKUPS_TAB_URL = reverse('horizon:project:volumes:backups_tab')
 
 
 class VolumeAndSnapshotsTests(test.TestCase):
+    def _stub_volume_get(self, resources):
+        # Only the volumes of the snapshots or backups listed are retrieved.
+        for volume_id in set(r.volume_id for r in resources):
+            api.cinder.volume_get(IsA(http.HttpRequest), volume_id,
+                                  details=False).InAnyOrder(). \
+                AndReturn(self.cinder_volumes.get(id=volume_id))
+
     @test.create_stubs({api.cinder: ('tenant_absolute_limits',
-                                     'volume_list',
+                                     'volume_get',
+                                     'volume_list_paged',
                                      'volume_snapshot_list',
+                                     'volume_snapshot_list_paged',
                                      'volume_backup_supported',
-                                     'volume_backup_list',
+                                     'volume_backup_list_paged',
                                      ),
-                        api.nova: ('server_list',)})
+                        api.nova: ('server_get',)})
     def _test_index(self, backup_supported=True):
         vol_backups = self.cinder_volume_backups.list()
         vol_snaps = self.cinder_volume_snapshots.list()
@@ -41,19 +50,28 @@ class VolumeAndSnapshotsTests(test.TestCase):
 
         api.cinder.volume_backup_supported(IsA(http.HttpRequest)).\
             MultipleTimes().AndReturn(backup_supported)
-        api.cinder.volume_list(IsA(http.HttpRequest), search_opts=None).\
-            AndReturn(volumes)
-        api.nova.server_list(IsA(http.HttpRequest), search_opts=None).\
-            AndReturn([self.servers.list(), False])
-        api.cinder.volume_snapshot_list(
-            IsA(http.HttpRequest), search_opts=None).AndReturn(vol_snaps)
-        api.cinder.volume_snapshot_list(IsA(http.HttpRequest)).\
-            AndReturn(vol_snaps)
-        api.cinder.volume_list(IsA(http.HttpRequest)).AndReturn(volumes)
+        api.cinder.volume_list_paged(
+            IsA(http.HttpRequest), marker=None, search_opts=None,
+            sort_dir='desc', paginate=True).AndReturn([volumes, False, False])
+        for server_id in ('1', '2'):
+            api.nova.server_get(IsA(http.HttpRequest), server_id).InAnyOrder()\
+                .AndReturn(self.servers.get(id=server_id))
+        for volume in volumes:
+            snapshots = [snap for snap in vol_snaps
+                         if snap.volume_id == volume.id]
+            api.cinder.volume_snapshot_list(
+                IsA(http.HttpRequest),
+                search_opts={'volume_id': volume.id}).InAnyOrder()\
+                .AndReturn(snapshots)
+        api.cinder.volume_snapshot_list_paged(
+            IsA(http.HttpRequest), paginate=True, marker=None,
+            sort_dir='desc').AndReturn([vol_snaps, False, False])
+        self._stub_volume_get(vol_snaps)
         if backup_supported:
-            api.cinder.volume_backup_list(IsA(http.HttpRequest)).\
-                AndReturn(vol_backups)
-            api.cinder.volume_list(IsA(http.HttpRequest)).AndReturn(volumes)
+            api.cinder.volume_backup_list_paged(
+                IsA(http.HttpRequest), marker=None, sort_dir='desc',
+                paginate=True).AndReturn([vol_backups, False, False])
+            self._stub_volume_get(vol_backups)
         api.cinder.tenant_absolute_limits(IsA(http.HttpRequest)).\
             MultipleTimes().AndReturn(self.cinder_limits['absolute'])
         self.mox.ReplayAll()
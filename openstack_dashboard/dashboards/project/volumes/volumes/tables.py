@@ -80,6 +80,7 @@ class DeleteVolume(VolumePolicyTargetMixin, tables.DeleteAction):
         )
 
     policy_rules = (("volume", "volume:delete"),)
+    concurrency = 8
 
     def delete(self, request, obj_id):
         cinder.volume_delete(request, obj_id)
@@ -448,6 +449,8 @@ class VolumesTable(VolumesTableBase):
         verbose_name = _("Volumes")
         status_columns = ["status"]
         row_class = UpdateRow
+        pagination_param = 'volume_marker'
+        prev_pagination_param = 'prev_volume_marker'
         table_actions = (CreateVolume, AcceptTransfer, DeleteVolume,
                          VolumesFilterAction)
         row_actions = (EditVolume, ExtendVolume, LaunchVolume, EditAttachments,
@@ -853,11 +853,11 @@ class VolumeViewTests(test.TestCase):
         self.assertEqual(res.context['form'].errors['__all__'], expected_error)
 
     @test.create_stubs({cinder: ('tenant_absolute_limits',
-                                 'volume_list',
+                                 'volume_list_paged',
                                  'volume_snapshot_list',
                                  'volume_backup_supported',
                                  'volume_delete',),
-                        api.nova: ('server_list',)})
+                        api.nova: ('server_get',)})
     def test_delete_volume(self):
         volumes = self.cinder_volumes.list()
         volume = self.cinder_volumes.first()
@@ -866,21 +866,11 @@ class VolumeViewTests(test.TestCase):
 
         cinder.volume_backup_supported(IsA(http.HttpRequest)). \
             MultipleTimes().AndReturn(True)
-        cinder.volume_list(IsA(http.HttpRequest), search_opts=None).\
-            AndReturn(volumes)
-        cinder.volume_snapshot_list(IsA(http.HttpRequest),
-                                    search_opts=None).\
-            AndReturn([])
+        self._stub_volume_list_paged(volumes)
         cinder.volume_delete(IsA(http.HttpRequest), volume.id)
-        api.nova.server_list(IsA(http.HttpRequest), search_opts=None).\
-            AndReturn([self.servers.list(), False])
-        cinder.volume_list(IsA(http.HttpRequest), search_opts=None).\
-            AndReturn(volumes)
-        cinder.volume_snapshot_list(IsA(http.HttpRequest),
-                                    search_opts=None).\
-            AndReturn([])
-        api.nova.server_list(IsA(http.HttpRequest), search_opts=None).\
-            AndReturn([self.servers.list(), False])
+        self._stub_volume_attributes(volumes)
+        self._stub_volume_list_paged(volumes)
+        self._stub_volume_attributes(volumes)
         cinder.tenant_absolute_limits(IsA(http.HttpRequest)).MultipleTimes().\
             AndReturn(self.cinder_limits['absolute'])
 
@@ -1019,6 +1009,28 @@ class VolumeViewTests(test.TestCase):
                          server.id)
         self.assertEqual(res.status_code, 200)
 
+    def _stub_volume_list_paged(self, volumes, marker=None, sort_dir='desc',
+                                has_more=False, has_prev=False):
+        cinder.volume_list_paged(
+            IsA(http.HttpRequest), marker=marker, search_opts=None,
+            sort_dir=sort_dir, paginate=True).AndReturn(
+                [volumes, has_more, has_prev])
+
+    def _stub_volume_attributes(self, volumes, snapshots=()):
+        # The volumes tab looks up the instances and snapshots of each of
+        # the volumes concurrently.
+        server_ids = set(att['server_id'] for volume in volumes
+                         for att in volume.attachments)
+        for server_id in server_ids:
+            api.nova.server_get(IsA(http.HttpRequest), server_id) \
+                .InAnyOrder().AndReturn(self.servers.get(id=server_id))
+        for volume in volumes:
+            cinder.volume_snapshot_list(
+                IsA(http.HttpRequest),
+                search_opts={'volume_id': volume.id}).InAnyOrder() \
+                .AndReturn([snapshot for snapshot in snapshots
+                            if snapshot.volume_id == volume.id])
+
     def _get_volume_row_action_from_ajax(self, res, action_name, row_id):
         def _matches_row_id(context_row):
             return (len(context_row.dicts) > 1 and
@@ -1086,10 +1098,10 @@ class VolumeViewTests(test.TestCase):
                         'The create snapshot button should be disabled')
 
     @test.create_stubs({cinder: ('tenant_absolute_limits',
-                                 'volume_list',
+                                 'volume_list_paged',
                                  'volume_snapshot_list',
                                  'volume_backup_supported',),
-                        api.nova: ('server_list',)})
+                        api.nova: ('server_get',)})
     def test_create_button_attributes(self):
         limits = self.cinder_limits['absolute']
         limits['maxTotalVolumes'] = 10
@@ -1098,13 +1110,8 @@ class VolumeViewTests(test.TestCase):
 
         api.cinder.volume_backup_supported(IsA(http.HttpRequest)). \
             MultipleTimes().AndReturn(True)
-        cinder.volume_list(IsA(http.HttpRequest), search_opts=None)\
-            .AndReturn(volumes)
-        cinder.volume_snapshot_list(IsA(http.HttpRequest),
-                                    search_opts=None).\
-            AndReturn([])
-        api.nova.server_list(IsA(http.HttpRequest), search_opts=None)\
-            .AndReturn([self.servers.list(), False])
+        self._stub_volume_list_paged(volumes)
+        self._stub_volume_attributes(volumes)
         cinder.tenant_absolute_limits(IsA(http.HttpRequest))\
             .MultipleTimes().AndReturn(limits)
         self.mox.ReplayAll()
@@ -1127,10 +1134,10 @@ class VolumeViewTests(test.TestCase):
                          create_action.policy_rules)
 
     @test.create_stubs({cinder: ('tenant_absolute_limits',
-                                 'volume_list',
+                                 'volume_list_paged',
                                  'volume_snapshot_list',
                                  'volume_backup_supported',),
-                        api.nova: ('server_list',)})
+                        api.nova: ('server_get',)})
     def test_create_button_disabled_when_quota_exceeded(self):
         limits = self.cinder_limits['absolute']
         limits['totalVolumesUsed'] = limits['maxTotalVolumes']
@@ -1138,13 +1145,8 @@ class VolumeViewTests(test.TestCase):
 
         api.cinder.volume_backup_supported(IsA(http.HttpRequest)). \
             MultipleTimes().AndReturn(True)
-        cinder.volume_list(IsA(http.HttpRequest), search_opts=None)\
-            .AndReturn(volumes)
-        cinder.volume_snapshot_list(IsA(http.HttpRequest),
-                                    search_opts=None).\
-            AndReturn([])
-        api.nova.server_list(IsA(http.HttpRequest), search_opts=None)\
-            .AndReturn([self.servers.list(), False])
+        self._stub_volume_list_paged(volumes)
+        self._stub_volume_attributes(volumes)
         cinder.tenant_absolute_limits(IsA(http.HttpRequest))\
             .MultipleTimes().AndReturn(limits)
         self.mox.ReplayAll()
@@ -1517,11 +1519,11 @@ class VolumeViewTests(test.TestCase):
     def test_encryption_true(self):
         self._test_encryption(True)
 
-    @test.create_stubs({cinder: ('volume_list',
+    @test.create_stubs({cinder: ('volume_list_paged',
                                  'volume_snapshot_list',
                                  'volume_backup_supported',
                                  'tenant_absolute_limits'),
-                        api.nova: ('server_list',)})
+                        api.nova: ('server_get',)})
     def _test_encryption(self, encryption):
         volumes = self.volumes.list()
         for volume in volumes:
@@ -1530,13 +1532,9 @@ class VolumeViewTests(test.TestCase):
 
         cinder.volume_backup_supported(IsA(http.HttpRequest))\
             .MultipleTimes('backup_supported').AndReturn(False)
-        cinder.volume_list(IsA(http.HttpRequest), search_opts=None)\
-            .AndReturn(self.volumes.list())
-        cinder.volume_snapshot_list(IsA(http.HttpRequest),
-                                    search_opts=None).\
-            AndReturn(self.cinder_volume_snapshots.list())
-        api.nova.server_list(IsA(http.HttpRequest), search_opts=None)\
-            .AndReturn([self.servers.list(), False])
+        self._stub_volume_list_paged(self.volumes.list())
+        self._stub_volume_attributes(
+            self.volumes.list(), self.cinder_volume_snapshots.list())
         cinder.tenant_absolute_limits(IsA(http.HttpRequest))\
             .MultipleTimes('limits').AndReturn(limits)
 
@@ -1582,22 +1580,17 @@ class VolumeViewTests(test.TestCase):
                              "only have 80GiB of your quota available.")
 
     @test.create_stubs({cinder: ('volume_backup_supported',
-                                 'volume_list',
+                                 'volume_list_paged',
                                  'volume_snapshot_list',
                                  'tenant_absolute_limits'),
-                        api.nova: ('server_list',)})
+                        api.nova: ('server_get',)})
     def test_create_transfer_availability(self):
         limits = self.cinder_limits['absolute']
 
         cinder.volume_backup_supported(IsA(http.HttpRequest))\
             .MultipleTimes().AndReturn(False)
-        cinder.volume_list(IsA(http.HttpRequest), search_opts=None)\
-            .AndReturn(self.volumes.list())
-        cinder.volume_snapshot_list(IsA(http.HttpRequest),
-                                    search_opts=None).\
-            AndReturn([])
-        api.nova.server_list(IsA(http.HttpRequest), search_opts=None)\
-                .AndReturn([self.servers.list(), False])
+        self._stub_volume_list_paged(self.volumes.list())
+        self._stub_volume_attributes(self.volumes.list())
         cinder.tenant_absolute_limits(IsA(http.HttpRequest))\
               .MultipleTimes().AndReturn(limits)
 
@@ -1634,11 +1627,11 @@ class VolumeViewTests(test.TestCase):
         self.assertNoFormErrors(res)
 
     @test.create_stubs({cinder: ('volume_backup_supported',
-                                 'volume_list',
+                                 'volume_list_paged',
                                  'volume_snapshot_list',
                                  'transfer_delete',
                                  'tenant_absolute_limits'),
-                        api.nova: ('server_list',)})
+                        api.nova: ('server_get',)})
     def test_delete_transfer(self):
         transfer = self.cinder_volume_transfers.first()
         volumes = []
@@ -1654,14 +1647,9 @@ class VolumeViewTests(test.TestCase):
 
         cinder.volume_backup_supported(IsA(http.HttpRequest))\
             .MultipleTimes().AndReturn(False)
-        cinder.volume_list(IsA(http.HttpRequest), search_opts=None)\
-            .AndReturn(volumes)
-        cinder.volume_snapshot_list(IsA(http.HttpRequest),
-                                    search_opts=None).\
-            AndReturn([])
+        self._stub_volume_list_paged(volumes)
         cinder.transfer_delete(IsA(http.HttpRequest), transfer.id)
-        api.nova.server_list(IsA(http.HttpRequest), search_opts=None).\
-            AndReturn([self.servers.list(), False])
+        self._stub_volume_attributes(volumes)
         cinder.tenant_absolute_limits(IsA(http.HttpRequest)).MultipleTimes().\
             AndReturn(self.cinder_limits['absolute'])
 
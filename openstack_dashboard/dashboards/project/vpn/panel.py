@@ -41,6 +41,7 @@ class VPN(horizon.Panel):
             LOG.error("Call to list enabled services failed. This is likely "
                       "due to a problem communicating with the Neutron "
                       "endpoint. VPN panel will not be displayed.")
+            horizon.base.access_check_failed(context['request'])
             return False
         if not super(VPN, self).allowed(context):
             return False
@@ -0,0 +1,61 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+from optparse import make_option  # noqa
+import os
+import subprocess
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand  # noqa
+from django.core.management.base import CommandError  # noqa
+
+
+class Command(BaseCommand):
+
+    args = '[module ...]'
+    help = """List the slowest imports of a cold started dashboard process.
+
+The dashboard is loaded in a new Python process, the way a WSGI worker
+loads it, including every dashboard and panel. When modules are given,
+only those are imported instead.
+
+examples::
+
+    manage.py profile_imports
+    manage.py profile_imports --limit=50 --sort=self
+    manage.py profile_imports openstack_dashboard.api.nova
+"""
+
+    option_list = BaseCommand.option_list + (
+        make_option("-l", "--limit",
+                    default=20, type="int", dest="limit",
+                    help="the number of imports to list (default: 20)"),
+        make_option("-s", "--sort",
+                    default="cumulative", choices=("cumulative", "self"),
+                    dest="sort",
+                    help=("sort by the time including nested imports "
+                          "(cumulative) or excluding them (self)")),
+    )
+
+    def handle(self, *modules, **options):
+        command = [sys.executable, '-m',
+                   'openstack_dashboard.utils.importtime',
+                   '--limit', str(options['limit']),
+                   '--sort', options['sort']] + list(modules)
+        env = dict(os.environ, DJANGO_SETTINGS_MODULE=settings.SETTINGS_MODULE)
+        process = subprocess.Popen(command, env=env, stdout=subprocess.PIPE,
+                                   stderr=subprocess.STDOUT)
+        output = process.communicate()[0]
+        if process.returncode:
+            raise CommandError("Profiling the imports failed:\n%s" % output)
+        self.stdout.write(output.decode('utf-8'))
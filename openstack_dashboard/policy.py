@@ -11,21 +11,100 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import inspect
+import logging
+import threading
 
 from django.conf import settings
 
+from horizon.utils import memoized
+
+
+LOG = logging.getLogger(__name__)
+
+_stats_lock = threading.Lock()
+_stats = {'lookups': 0, 'evaluations': 0}
+
+
+def _count(counter):
+    with _stats_lock:
+        _stats[counter] += 1
+
+
+def _get_policy_check():
+    return getattr(settings, "POLICY_CHECK_FUNCTION", None)
+
+
+def _get_name(policy_check):
+    return '%s.%s' % (getattr(policy_check, '__module__', None),
+                      getattr(policy_check, '__name__', None))
+
+
+# The policy function is part of the keys below, so that decisions made by
+# a different function are never reused.
+@memoized.memoized
+def _check_target(policy_check, rules, request, target):
+    _count('evaluations')
+    return policy_check(rules, request, target)
+
+
+# Without a target, the decision only depends on the rules and on the roles
+# carried by the token, so it can be shared by all the requests using the
+# same token when MEMOIZED_CACHE_ENABLED is set. Only the name of the policy
+# function can be part of a key shared across processes.
+@memoized.memoized_with_ttl(300, scope='token')
+def _check_no_target(name, rules, request):
+    _count('evaluations')
+    return _get_policy_check()(rules, request, None)
+
 
 def check(actions, request, target=None):
-    """Wrapper of the configurable policy method."""
+    """Wrapper of the configurable policy method.
 
-    policy_check = getattr(settings, "POLICY_CHECK_FUNCTION", None)
+    Decisions are cached for the duration of the request, keyed by the
+    rules, the target and the request; see :func:`cache_stats`.
+    """
+
+    policy_check = _get_policy_check()
 
     if policy_check:
-        return policy_check(actions, request, target)
+        _count('lookups')
+        rules = tuple(tuple(rule) for rule in actions)
+        if target:
+            # The policy function may fill in the target, so it gets a copy
+            # and the key is calculated from the original.
+            return _check_target(policy_check, rules, request, dict(target))
+        return _check_no_target(_get_name(policy_check), rules, request)
 
     return True
 
 
+def cache_stats():
+    """Returns the hit and miss counters of the policy decision cache."""
+    with _stats_lock:
+        lookups, misses = _stats['lookups'], _stats['evaluations']
+    hits = lookups - misses
+    return {'hits': hits, 'misses': misses,
+            'hit_rate': float(hits) / lookups if lookups else 0.0}
+
+
+def preload():
+    """Loads and parses the policy rules ahead of the first check.
+
+    This is only supported for policy functions whose module loads its
+    rules with ``_get_enforcer()``, such as ``openstack_auth.policy``, and
+    is done at startup when the ``POLICY_CHECK_PRELOAD`` setting is
+    ``True``.
+    """
+    module = inspect.getmodule(_get_policy_check())
+    get_enforcer = getattr(module, '_get_enforcer', None)
+    if get_enforcer is None:
+        LOG.debug("The policy rules of %s cannot be preloaded.", module)
+        return
+    enforcers = get_enforcer()
+    LOG.debug("Preloaded the policy rules of %s.", ', '.join(enforcers))
+
+
 class PolicyTargetMixin(object):
     """Mixin that adds the get_policy_target function
 
@@ -18,10 +18,14 @@
 
 from __future__ import absolute_import
 
+import datetime
+
 from django.conf import settings
+from django.test.utils import override_settings
 
 from horizon import exceptions
 
+from openstack_dashboard import api
 from openstack_dashboard.api import base as api_base
 from openstack_dashboard.api import cinder
 from openstack_dashboard.api import glance
@@ -152,6 +156,16 @@ class APIDictWrapperTests(test.TestCase):
         self.assertFalse(0 in resource)
 
 
+class ApiPackageTests(test.TestCase):
+
+    def test_service_modules(self):
+        self.assertIs(keystone, api.keystone)
+        self.assertTrue(set(api.__all__).issubset(dir(api)))
+
+    def test_unknown_attribute(self):
+        self.assertRaises(AttributeError, getattr, api, 'unknown')
+
+
 class ApiVersionTests(test.TestCase):
     def setUp(self):
         super(ApiVersionTests, self).setUp()
@@ -283,3 +297,74 @@ class QuotaSetTests(test.TestCase):
     def test_quotaset_add_with_wrong_type(self):
         quota_set = api_base.QuotaSet({'foo': 1, 'bar': 10})
         self.assertRaises(ValueError, quota_set.add, {'test': 7})
+
+
+class Token(object):
+    def __init__(self, token_id, lifetime=3600):
+        self.id = token_id
+        self.expires = (datetime.datetime.utcnow() +
+                        datetime.timedelta(seconds=lifetime))
+
+
+class ClientPoolTests(test.TestCase):
+
+    def setUp(self):
+        super(ClientPoolTests, self).setUp()
+        self.pool = api_base.ClientPool()
+
+    def _get(self, token, endpoint='http://compute:8774'):
+        return self.pool.get('compute', endpoint, token, object)
+
+    def test_disabled_by_default(self):
+        token = Token('abc')
+        self.assertIsNot(self._get(token), self._get(token))
+        self.assertEqual(0, self.pool.stats()['size'])
+
+    @override_settings(API_CLIENT_POOL_SIZE=10)
+    def test_reuse_per_token_and_endpoint(self):
+        token = Token('abc')
+        client = self._get(token)
+        self.assertIs(client, self._get(Token('abc')))
+        self.assertIsNot(client, self._get(Token('def')))
+        self.assertIsNot(client, self._get(token, 'http://other:8774'))
+
+        stats = self.pool.stats()
+        self.assertEqual(3, stats['created'])
+        self.assertEqual(1, stats['reused'])
+        self.assertEqual(3, stats['size'])
+        self.assertEqual(0.25, stats['reuse_rate'])
+
+    @override_settings(API_CLIENT_POOL_SIZE=2)
+    def test_evicts_least_recently_used(self):
+        first, second = Token('1'), Token('2')
+        client = self._get(first)
+        self._get(second)
+        self._get(first)
+        self._get(Token('3'))
+
+        self.assertIs(client, self._get(first))
+        self.assertEqual(1, self.pool.stats()['evicted'])
+        self._get(second)
+        self.assertEqual(4, self.pool.stats()['created'])
+
+    @override_settings(API_CLIENT_POOL_SIZE=10, API_CLIENT_POOL_TTL=0)
+    def test_ttl(self):
+        token = Token('abc')
+        self.assertIsNot(self._get(token), self._get(token))
+        self.assertEqual(0, self.pool.stats()['size'])
+
+    @override_settings(API_CLIENT_POOL_SIZE=10)
+    def test_not_pooled_past_token_expiry(self):
+        token = Token('abc', lifetime=-1)
+        self.assertIsNot(self._get(token), self._get(token))
+        self.assertEqual(0, self.pool.stats()['size'])
+
+    @override_settings(API_CLIENT_POOL_SIZE=10)
+    def test_expired_client_is_replaced(self):
+        token = Token('abc')
+        client = self._get(token)
+        self.pool._clients[('compute', 'http://compute:8774', 'abc')] = (
+            client, 0)
+
+        self.assertIsNot(client, self._get(Token('abc')))
+        self.assertEqual(1, self.pool.stats()['expired'])
@@ -184,13 +184,14 @@ class CeilometerApiTests(test.APITestCase):
         ceilometerclient.resources.list(q=IsA(list)).AndReturn(resources[:1])
 
         ceilometerclient.statistics = self.mox.CreateMockAnything()
-        # check that list is called twice for one resource and 2 meters
+        # check that list is called twice for one resource and 2 meters,
+        # the calls run concurrently so their order is not defined
         ceilometerclient.statistics.list(meter_name=IsA(str),
                                          period=None, q=IsA(list)).\
-            AndReturn(statistics)
+            InAnyOrder().AndReturn(statistics)
         ceilometerclient.statistics.list(meter_name=IsA(str),
                                          period=None, q=IsA(list)).\
-            AndReturn(statistics)
+            InAnyOrder().AndReturn(statistics)
 
         api.ceilometer.CeilometerUsage\
             .get_user(IsA(str)).AndReturn(user)
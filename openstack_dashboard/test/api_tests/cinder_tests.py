@@ -25,9 +25,26 @@ class CinderApiTests(test.APITestCase):
 
     def test_volume_list(self):
         search_opts = {'all_tenants': 1}
-        detailed = True
         volumes = self.cinder_volumes.list()
+        cinderclient = self.stub_cinderclient()
+        cinderclient.volumes = self.mox.CreateMockAnything()
+        cinderclient.volumes.list(search_opts=search_opts,).AndReturn(volumes)
+        self.mox.ReplayAll()
+
+        # No volume is awaiting a transfer, so the transfers are not listed.
+        api_volumes = api.cinder.volume_list(self.request,
+                                             search_opts=search_opts)
+        self.assertEqual(len(volumes), len(api_volumes))
+        self.assertTrue(all(v.transfer is None for v in api_volumes))
+
+    def test_volume_list_with_transfer(self):
+        search_opts = {'all_tenants': 1}
+        detailed = True
         volume_transfers = self.cinder_volume_transfers.list()
+        volumes = self.cinder_volumes.list()
+        transferred = self.cinder_volumes.get(
+            id=volume_transfers[0].volume_id)
+        transferred.status = 'awaiting-transfer'
         cinderclient = self.stub_cinderclient()
         cinderclient.volumes = self.mox.CreateMockAnything()
         cinderclient.volumes.list(search_opts=search_opts,).AndReturn(volumes)
@@ -37,8 +54,64 @@ class CinderApiTests(test.APITestCase):
             search_opts=search_opts,).AndReturn(volume_transfers)
         self.mox.ReplayAll()
 
-        # No assertions are necessary. Verification is handled by mox.
-        api.cinder.volume_list(self.request, search_opts=search_opts)
+        api_volumes = api.cinder.volume_list(self.request,
+                                             search_opts=search_opts)
+        for volume in api_volumes:
+            if volume.id == transferred.id:
+                self.assertEqual(volume_transfers[0].id, volume.transfer.id)
+            else:
+                self.assertIsNone(volume.transfer)
+
+    def test_volume_get_without_details(self):
+        volume = self.cinder_volumes.first()
+        volume.status = 'awaiting-transfer'
+        cinderclient = self.stub_cinderclient()
+        cinderclient.volumes = self.mox.CreateMockAnything()
+        cinderclient.volumes.get(volume.id).AndReturn(volume)
+        self.mox.ReplayAll()
+
+        # Neither the attached instances nor the transfers are retrieved.
+        api_volume = api.cinder.volume_get(self.request, volume.id,
+                                           details=False)
+        self.assertEqual(volume.id, api_volume.id)
+        self.assertIsNone(api_volume.transfer)
+
+    @override_settings(API_RESULT_PAGE_SIZE=2)
+    def test_volume_list_paged(self):
+        search_opts = {'all_tenants': 1}
+        volumes = self.cinder_volumes.list()[:3]
+        cinderclient = self.stub_cinderclient()
+        cinderclient.volumes = self.mox.CreateMockAnything()
+        cinderclient.volumes.list(search_opts=search_opts, limit=3,
+                                  marker=None, sort='created_at:desc') \
+            .AndReturn(volumes)
+        self.mox.ReplayAll()
+
+        api_volumes, has_more, has_prev = api.cinder.volume_list_paged(
+            self.request, search_opts=search_opts, paginate=True)
+        self.assertEqual([v.id for v in volumes[:2]],
+                         [v.id for v in api_volumes])
+        self.assertTrue(has_more)
+        self.assertFalse(has_prev)
+
+    @override_settings(API_RESULT_PAGE_SIZE=2)
+    def test_volume_list_paged_prev_page(self):
+        volumes = self.cinder_volumes.list()[:2]
+        marker = self.cinder_volumes.list()[2].id
+        cinderclient = self.stub_cinderclient()
+        cinderclient.volumes = self.mox.CreateMockAnything()
+        # The page before the marker is retrieved in reverse order.
+        cinderclient.volumes.list(search_opts=None, limit=3,
+                                  marker=marker, sort='created_at:asc') \
+            .AndReturn(list(reversed(volumes)))
+        self.mox.ReplayAll()
+
+        api_volumes, has_more, has_prev = api.cinder.volume_list_paged(
+            self.request, marker=marker, sort_dir='asc', paginate=True)
+        self.assertEqual([v.id for v in volumes],
+                         [v.id for v in api_volumes])
+        self.assertTrue(has_more)
+        self.assertFalse(has_prev)
 
     def test_volume_snapshot_list(self):
         search_opts = {'all_tenants': 1}
@@ -51,6 +124,25 @@ class CinderApiTests(test.APITestCase):
 
         api.cinder.volume_snapshot_list(self.request, search_opts=search_opts)
 
+    @override_settings(API_RESULT_PAGE_SIZE=2)
+    def test_volume_snapshot_list_paged_last_page(self):
+        volume_snapshots = self.cinder_volume_snapshots.list()[:1]
+        marker = 'c9d0881a-4c0b-4158-a212-ad27e11c2b0f'
+        cinderclient = self.stub_cinderclient()
+        cinderclient.volume_snapshots = self.mox.CreateMockAnything()
+        cinderclient.volume_snapshots.list(search_opts=None, limit=3,
+                                           marker=marker,
+                                           sort='created_at:desc') \
+            .AndReturn(volume_snapshots)
+        self.mox.ReplayAll()
+
+        snapshots, has_more, has_prev = \
+            api.cinder.volume_snapshot_list_paged(self.request, marker=marker,
+                                                  paginate=True)
+        self.assertEqual(1, len(snapshots))
+        self.assertFalse(has_more)
+        self.assertTrue(has_prev)
+
     def test_volume_snapshot_list_no_volume_configured(self):
         # remove volume from service catalog
         catalog = self.service_catalog
@@ -16,8 +16,17 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import copy
+import threading
+
 from django.conf import settings
+from django import http
 from django.test.utils import override_settings
+from glanceclient.v1 import images
+from mox3.mox import Func  # noqa
+from mox3.mox import IsA  # noqa
+
+from horizon.utils import memoized
 
 from openstack_dashboard import api
 from openstack_dashboard.test import helpers as test
@@ -248,6 +257,102 @@ class GlanceApiTests(test.APITestCase):
         image = api.glance.image_get(self.request, 'empty')
         self.assertIsNone(image.name)
 
+    @override_settings(MEMOIZED_CACHE_ENABLED=True,
+                       MEMOIZED_CACHE_BACKEND=None)
+    def test_image_index_refresh(self):
+        memoized.get_ttl_backend().clear()
+        images = self.images.list()
+        deleted = copy.copy(images[0])
+        deleted.deleted = True
+        self.mox.StubOutWithMock(api.glance, 'image_list_detailed')
+        api.glance.image_list_detailed(IsA(http.HttpRequest)) \
+            .AndReturn((images, False, False))
+        api.glance.image_list_detailed(
+            IsA(http.HttpRequest),
+            filters=Func(lambda filters: 'changes-since' in filters)) \
+            .AndReturn(([deleted], False, False))
+        self.mox.ReplayAll()
+
+        index = api.glance.image_index(self.request)
+        self.assertEqual(len(images), len(index))
+        self.assertEqual(images[0], index.get(images[0].id))
+        # The shared images don't keep the client of the user who listed
+        # them.
+        self.assertTrue(all(image.manager is None for image in index))
+        # Cached until the TTL is over.
+        self.assertIs(index, api.glance.image_index(self.request))
+        self.assertEqual(images[1], api.glance.image_index_lookup(
+            self.request, images[1].id))
+
+        index.refreshed -= 3600
+        index = api.glance.image_index(self.request)
+        self.assertEqual(len(images) - 1, len(index))
+        self.assertNotIn(images[0].id, index)
+        self.assertIsNone(api.glance.image_index_lookup(self.request,
+                                                        images[0].id))
+
+    @override_settings(MEMOIZED_CACHE_ENABLED=True,
+                       MEMOIZED_CACHE_BACKEND=None)
+    def test_image_index_invalidated(self):
+        memoized.get_ttl_backend().clear()
+        public_images = [image for image in self.images.list()
+                         if image.is_public and image.status == 'active']
+        glanceclient = self.stub_glanceclient()
+        glanceclient.images = self.mox.CreateMockAnything()
+        glanceclient.images.delete(public_images[0].id)
+        self.mox.StubOutWithMock(api.glance, 'image_list_detailed')
+        api.glance.image_list_detailed(
+            IsA(http.HttpRequest),
+            filters={'is_public': True, 'status': 'active'}) \
+            .AndReturn((public_images, False, False))
+        api.glance.image_list_detailed(
+            IsA(http.HttpRequest),
+            filters=Func(lambda filters: filters.get('is_public') and
+                         'changes-since' in filters)) \
+            .AndReturn(([], False, False))
+        self.mox.ReplayAll()
+
+        api.glance.image_index(self.request, 'public')
+        api.glance.image_delete(self.request, public_images[0].id)
+        index = api.glance.image_index(self.request, 'public')
+        self.assertEqual(len(public_images), len(index))
+
+    @override_settings(MEMOIZED_CACHE_ENABLED=True,
+                       MEMOIZED_CACHE_BACKEND='default')
+    def test_image_index_shared_cache(self):
+        memoized.get_ttl_backend().clear()
+        # Images of a real client hold objects which cannot be pickled.
+        manager = images.ImageManager(threading.Lock())
+        image_list = [images.Image(manager, image.to_dict(), loaded=True)
+                      for image in self.images.list()]
+        self.mox.StubOutWithMock(api.glance, 'image_list_detailed')
+        api.glance.image_list_detailed(IsA(http.HttpRequest)) \
+            .AndReturn((image_list, False, False))
+        self.mox.ReplayAll()
+
+        api.glance.image_index(self.request)
+        index = api.glance.image_index(self.request)
+        self.assertEqual([image.to_dict() for image in image_list],
+                         [image.to_dict() for image in index])
+        self.assertTrue(all(isinstance(image, images.Image)
+                            for image in index))
+        self.assertEqual(image_list[1].name, api.glance.image_index_lookup(
+            self.request, image_list[1].id).name)
+
+    def test_image_index_no_cache(self):
+        self.mox.StubOutWithMock(api.glance, 'image_list_detailed')
+        api.glance.image_list_detailed(
+            IsA(http.HttpRequest),
+            filters={'property-owner_id': '1', 'status': 'active'}) \
+            .MultipleTimes().AndReturn((self.images.list(), False, False))
+        self.mox.ReplayAll()
+
+        index = api.glance.image_index(self.request, 'project', '1')
+        self.assertIsNot(index,
+                         api.glance.image_index(self.request, 'project', '1'))
+        self.assertIsNone(api.glance.image_index_lookup(
+            self.request, self.images.first().id))
+
     def test_metadefs_namespace_list(self):
         metadata_defs = self.metadata_defs.list()
         limit = getattr(settings, 'API_RESULT_LIMIT', 1000)
@@ -19,6 +19,7 @@
 from __future__ import absolute_import
 
 from keystoneclient.v2_0 import client as keystone_client
+import mock
 import six
 
 from openstack_dashboard import api
@@ -72,6 +73,40 @@ class RoleAPITests(test.APITestCase):
         self.mox.ReplayAll()
         api.keystone.remove_tenant_user(self.request, tenant.id, self.user.id)
 
+    def test_get_role_changes(self):
+        current = {'1': ['1', '2'], '2': ['2']}
+        desired = {'1': set(['2']), '3': set(['1'])}
+        to_grant, to_revoke = api.keystone.get_role_changes(current, desired)
+        self.assertEqual([('3', '1')], to_grant)
+        self.assertEqual([('1', '1'), ('2', '2')], to_revoke)
+
+    def test_update_project_roles(self):
+        keystoneclient = self.stub_keystoneclient()
+        tenant = self.tenants.first()
+        current = {'1': ['1'], '2': ['2']}
+        desired = {'1': ['1', '2'], '3': ['2']}
+
+        # Mox is not thread-safe, so the concurrent calls are recorded with
+        # mock instead. Its methods are set up before the calls are made,
+        # as concurrent calls could each create one of their own.
+        keystoneclient.roles = mock.Mock()
+        keystoneclient.roles.grant.return_value = None
+        keystoneclient.roles.revoke.side_effect = self.exceptions.keystone
+        self.mox.ReplayAll()
+
+        # Every change is attempted, the failed ones are returned.
+        failures = api.keystone.update_project_roles(self.request, tenant.id,
+                                                     current, desired)
+        keystoneclient.roles.grant.assert_has_calls(
+            [mock.call('2', user=user_id, project=tenant.id, group=None,
+                       domain=None) for user_id in ('1', '3')],
+            any_order=True)
+        self.assertEqual(2, keystoneclient.roles.grant.call_count)
+        keystoneclient.roles.revoke.assert_called_once_with(
+            '2', user='2', project=tenant.id, group=None, domain=None)
+        self.assertEqual([('2', '2')],
+                         [failure[:2] for failure in failures])
+
     def test_get_default_role(self):
         keystoneclient = self.stub_keystoneclient()
         keystoneclient.roles = self.mox.CreateMockAnything()
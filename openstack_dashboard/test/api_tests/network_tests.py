@@ -280,16 +280,14 @@ class NetworkApiNeutronTests(NetworkApiNeutronTestBase):
 
         self.qclient.list_ports(device_id=server_ids) \
             .AndReturn({'ports': server_ports})
+        # Networks and floating IPs are listed concurrently.
+        self.qclient.list_networks(id=set(server_network_ids),
+                                   fields=['id', 'name']).InAnyOrder() \
+            .AndReturn({'networks': server_networks})
         if router_enabled:
             self.qclient.list_floatingips(tenant_id=tenant_id,
                                           port_id=server_port_ids) \
-                .AndReturn({'floatingips': assoc_fips})
-            self.qclient.list_ports(tenant_id=tenant_id) \
-                .AndReturn({'ports': self.api_ports.list()})
-        self.qclient.list_networks(id=set(server_network_ids)) \
-            .AndReturn({'networks': server_networks})
-        self.qclient.list_subnets() \
-            .AndReturn({'subnets': self.api_subnets.list()})
+                .InAnyOrder().AndReturn({'floatingips': assoc_fips})
         self.mox.ReplayAll()
 
         api.network.servers_update_addresses(self.request, servers)
@@ -569,8 +569,9 @@ class NeutronApiTests(test.APITestCase):
         neutronclient = self.stub_neutronclient()
         uri_len_exc = neutron_exc.RequestURITooLong(excess=220)
         neutronclient.list_ports(id=port_ids).AndRaise(uri_len_exc)
+        # The chunks are requested concurrently.
         for i in range(0, 10, 4):
-            neutronclient.list_ports(id=port_ids[i:i + 4]) \
+            neutronclient.list_ports(id=port_ids[i:i + 4]).InAnyOrder() \
                 .AndReturn({'ports': ports[i:i + 4]})
         self.mox.ReplayAll()
 
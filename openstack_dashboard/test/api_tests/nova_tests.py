@@ -19,15 +19,20 @@
 
 from __future__ import absolute_import
 
+import copy
+
 from django.conf import settings
 from django import http
 from django.test.utils import override_settings
 
 from mox3.mox import IsA  # noqa
 from novaclient import exceptions as nova_exceptions
+from novaclient.v2 import flavors
 from novaclient.v2 import servers
 import six
 
+from horizon.utils import memoized
+
 from openstack_dashboard import api
 from openstack_dashboard.test import helpers as test
 
@@ -177,6 +182,25 @@ class ComputeApiTests(test.APITestCase):
         self.assertEqual(page_size, len(ret_val))
         self.assertTrue(has_more)
 
+    @override_settings(MEMOIZED_CACHE_ENABLED=True,
+                       MEMOIZED_CACHE_BACKEND='default')
+    def test_flavor_list_shared_cache(self):
+        memoized.get_ttl_backend().clear()
+        manager = flavors.FlavorManager(None)
+        self.mox.StubOutWithMock(manager, 'list')
+        manager.list(is_public=True).AndReturn(self.flavors.list())
+        novaclient = self.stub_novaclient()
+        novaclient.flavors = manager
+        self.mox.ReplayAll()
+
+        api.nova.flavor_list(self.request)
+        # The flavors of another request are rebuilt from the cached data.
+        cached = api.nova.flavor_list(copy.copy(self.request))
+        self.assertEqual([flavor.to_dict() for flavor in self.flavors.list()],
+                         [flavor.to_dict() for flavor in cached])
+        self.assertTrue(all(isinstance(flavor, flavors.Flavor) and
+                            flavor.manager is manager for flavor in cached))
+
     def test_usage_get(self):
         novaclient = self.stub_novaclient()
         novaclient.usage = self.mox.CreateMockAnything()
@@ -18,7 +18,12 @@
 
 from __future__ import absolute_import
 
+import json
+
+from django.test.utils import override_settings
+from mox3.mox import IgnoreArg  # noqa
 from mox3.mox import IsA  # noqa
+import six
 
 from horizon import exceptions
 
@@ -32,8 +37,7 @@ class SwiftApiTests(test.APITestCase):
         cont_data = [c._apidict for c in containers]
         swift_api = self.stub_swiftclient()
         swift_api.get_account(limit=1001,
-                              marker=None,
-                              full_listing=True).AndReturn([{}, cont_data])
+                              marker=None).AndReturn([{}, cont_data])
         self.mox.ReplayAll()
 
         (conts, more) = api.swift.swift_get_containers(self.request)
@@ -114,8 +118,7 @@ class SwiftApiTests(test.APITestCase):
                                 limit=1001,
                                 marker=None,
                                 prefix=None,
-                                delimiter='/',
-                                full_listing=True).AndReturn([{}, objects])
+                                delimiter='/').AndReturn([{}, objects])
         self.mox.ReplayAll()
 
         (objs, more) = api.swift.swift_get_objects(self.request,
@@ -123,6 +126,50 @@ class SwiftApiTests(test.APITestCase):
         self.assertEqual(len(objects), len(objs))
         self.assertFalse(more)
 
+    @override_settings(API_RESULT_LIMIT=2)
+    def test_swift_filter_objects(self):
+        container = self.containers.first()
+        objects = [obj._apidict for obj in self.objects.list()]
+
+        swift_api = self.stub_swiftclient()
+        for marker, page in ((None, objects[:2]),
+                             (objects[1]['name'], objects[2:]),
+                             (objects[3]['name'], [])):
+            swift_api.get_container(container.name,
+                                    limit=2,
+                                    marker=marker,
+                                    prefix=None,
+                                    delimiter='/').AndReturn([{}, page])
+        self.mox.ReplayAll()
+
+        objs = api.swift.swift_filter_objects(self.request, 'T*TWO',
+                                              container.name)
+        self.assertEqual([objects[1]['name']], [obj.name for obj in objs])
+
+    @override_settings(API_RESULT_LIMIT=2)
+    def test_swift_filter_objects_stops_when_filled(self):
+        container = self.containers.first()
+        objects = [obj._apidict for obj in self.objects.list()]
+
+        swift_api = self.stub_swiftclient()
+        swift_api.get_container(container.name,
+                                limit=2,
+                                marker=None,
+                                prefix=None,
+                                delimiter='/').AndReturn([{}, objects[:2]])
+        self.mox.ReplayAll()
+
+        objs = api.swift.swift_filter_objects(self.request, 'object',
+                                              container.name)
+        self.assertEqual(2, len(objs))
+
+    def test_wildcard_search(self):
+        self.assertTrue(api.swift.wildcard_search('test.txt', 't*.t'))
+        self.assertTrue(api.swift.wildcard_search('test.txt', '*'))
+        self.assertTrue(api.swift.wildcard_search('test.txt', 'EST'))
+        self.assertFalse(api.swift.wildcard_search('test.txt', 'txt*.'))
+        self.assertFalse(api.swift.wildcard_search('test_txt', 'test.txt'))
+
     def test_swift_get_object_with_data_non_chunked(self):
         container = self.containers.first()
         object = self.objects.first()
@@ -170,6 +217,46 @@ class SwiftApiTests(test.APITestCase):
         self.assertEqual(object.name, obj.name)
         self.assertIsNone(obj.data)
 
+    def test_swift_get_object_range(self):
+        container = self.containers.first()
+        object = self.objects.first()
+        headers = {'content-length': '4',
+                   'content-range': 'bytes 0-3/9',
+                   'etag': 'object_hash'}
+
+        swift_api = self.stub_swiftclient()
+        swift_api.get_object(
+            container.name, object.name, resp_chunk_size=api.swift.CHUNK_SIZE,
+            headers={'Range': 'bytes=0-3'}
+        ).AndReturn([headers, object.data[:4]])
+
+        self.mox.ReplayAll()
+
+        obj = api.swift.swift_get_object(self.request, container.name,
+                                         object.name,
+                                         headers={'Range': 'bytes=0-3'})
+        self.assertEqual('bytes 0-3/9', obj.content_range)
+        self.assertEqual('4', obj.bytes)
+        self.assertEqual('object_hash', obj.etag)
+
+    def test_swift_prefetch_object(self):
+        container = self.containers.first()
+        object = self.objects.first()
+
+        swift_api = self.stub_swiftclient(expected_calls=3)
+        for first, last in ((0, 3), (4, 7), (8, 8)):
+            headers = {'Range': 'bytes=%d-%d' % (first, last),
+                       'If-Match': 'object_hash'}
+            swift_api.get_object(container.name, object.name,
+                                 headers=headers) \
+                .InAnyOrder().AndReturn([{}, object.data[first:last + 1]])
+        self.mox.ReplayAll()
+
+        data = api.swift.swift_prefetch_object(
+            self.request, container.name, object.name, 0, 8,
+            etag='object_hash', segment_size=4, prefetch=1)
+        self.assertEqual(object.data, b''.join(data))
+
     def test_swift_create_pseudo_folder(self):
         container = self.containers.first()
         folder = self.folder.first()
@@ -227,6 +314,82 @@ class SwiftApiTests(test.APITestCase):
                                       obj.name,
                                       test_file)
 
+    def test_swift_upload_object_segmented(self):
+        container = self.containers.first()
+        obj = self.objects.first()
+        segments_container = container.name + '_segments'
+
+        swift_api = self.stub_swiftclient(expected_calls=4)
+        swift_api.put_container(segments_container)
+        for data in (b'0123', b'4567', b'89'):
+            swift_api.put_object(segments_container,
+                                 IsA(six.string_types),
+                                 data,
+                                 content_length=len(data)) \
+                .InAnyOrder().AndReturn('etag-%s' % data.decode())
+        exc = self.exceptions.swift
+        swift_api.head_object(container.name, obj.name).AndRaise(exc)
+        swift_api.put_object(container.name,
+                             obj.name,
+                             IgnoreArg(),
+                             headers={'X-Object-Meta-Orig-Filename':
+                                      'fake_object.bin'},
+                             query_string='multipart-manifest=put') \
+            .AndReturn('etag')
+        self.mox.ReplayAll()
+
+        upload = api.swift.SegmentedUpload(self.request, container.name,
+                                           segment_size=4, max_workers=2)
+        for data in (b'012', b'3456', b'789'):
+            upload.write(data)
+        upload.close()
+        self.assertEqual(['etag-0123', 'etag-4567', 'etag-89'],
+                         [segment['etag'] for segment in upload.segments])
+        self.assertEqual([4, 4, 2],
+                         [segment['size_bytes']
+                          for segment in upload.segments])
+
+        class FakeFile(object):
+            name = 'fake_object.bin'
+            size = upload.size
+            segmented_upload = upload
+
+        response = api.swift.swift_upload_object(self.request,
+                                                 container.name,
+                                                 obj.name,
+                                                 FakeFile())
+        self.assertEqual(10, response['bytes'])
+        self.assertTrue(upload.stored)
+
+    def test_swift_upload_object_segment_failure(self):
+        container = self.containers.first()
+        obj = self.objects.first()
+        segments_container = container.name + '_segments'
+
+        swift_api = self.stub_swiftclient(expected_calls=3)
+        swift_api.put_container(segments_container)
+        swift_api.put_object(segments_container, IsA(six.string_types),
+                             b'0123', content_length=4).AndReturn('etag')
+        swift_api.put_object(segments_container, IsA(six.string_types),
+                             b'45', content_length=2) \
+            .AndRaise(self.exceptions.swift)
+        swift_api.delete_object(segments_container, IsA(six.string_types))
+        self.mox.ReplayAll()
+
+        upload = api.swift.SegmentedUpload(self.request, container.name,
+                                           segment_size=4, max_workers=1)
+        upload.write(b'012345')
+        upload.close()
+
+        class FakeFile(object):
+            name = 'fake_object.bin'
+            size = upload.size
+            segmented_upload = upload
+
+        with self.assertRaises(type(self.exceptions.swift)):
+            api.swift.swift_upload_object(self.request, container.name,
+                                          obj.name, FakeFile())
+
     def test_swift_upload_duplicate_object(self):
         container = self.containers.first()
         obj = self.objects.first()
@@ -269,6 +432,91 @@ class SwiftApiTests(test.APITestCase):
                                                  None)
         self.assertEqual(0, response['bytes'])
 
+    def test_swift_upload_object_overwrite(self):
+        container = self.containers.first()
+        obj = self.objects.first()
+        segments_container = container.name + '_segments'
+        manifest = [{'name': '/%s/old/00000000' % segments_container},
+                    {'name': '/%s/old/00000001' % segments_container}]
+
+        swift_api = self.stub_swiftclient()
+        swift_api.head_object(container.name, obj.name) \
+            .AndReturn({'x-static-large-object': 'True'})
+        swift_api.get_object(container.name, obj.name,
+                             query_string='multipart-manifest=get') \
+            .AndReturn(({}, six.b(json.dumps(manifest))))
+        swift_api.put_object(container.name,
+                             obj.name,
+                             None,
+                             content_length=0,
+                             headers={})
+        # The segments of the replaced object are deleted once the new
+        # object has been stored.
+        swift_api.delete_object(segments_container, 'old/00000000')
+        swift_api.delete_object(segments_container, 'old/00000001')
+        self.mox.ReplayAll()
+
+        api.swift.swift_upload_object(self.request, container.name, obj.name,
+                                      None, overwrite=True)
+
+    def test_swift_upload_object_overwrite_failure(self):
+        container = self.containers.first()
+        obj = self.objects.first()
+        manifest = [{'name': '/%s_segments/old/00000000' % container.name}]
+
+        swift_api = self.stub_swiftclient()
+        swift_api.head_object(container.name, obj.name) \
+            .AndReturn({'x-static-large-object': 'True'})
+        swift_api.get_object(container.name, obj.name,
+                             query_string='multipart-manifest=get') \
+            .AndReturn(({}, six.b(json.dumps(manifest))))
+        swift_api.put_object(container.name,
+                             obj.name,
+                             None,
+                             content_length=0,
+                             headers={}).AndRaise(self.exceptions.swift)
+        self.mox.ReplayAll()
+
+        with self.assertRaises(type(self.exceptions.swift)):
+            api.swift.swift_upload_object(self.request, container.name,
+                                          obj.name, None, overwrite=True)
+
+    def _stub_get_objects(self, container, obj):
+        self.mox.StubOutWithMock(api.swift, 'swift_get_objects')
+        api.swift.swift_get_objects(self.request, container.name,
+                                    prefix=obj.name).AndReturn([[obj], False])
+
+    def test_swift_delete_object(self):
+        container = self.containers.first()
+        obj = self.objects.first()
+        self._stub_get_objects(container, obj)
+
+        swift_api = self.stub_swiftclient()
+        swift_api.head_object(container.name, obj.name).AndReturn({})
+        swift_api.delete_object(container.name, obj.name, query_string=None)
+        self.mox.ReplayAll()
+
+        self.assertTrue(api.swift.swift_delete_object(self.request,
+                                                      container.name,
+                                                      obj.name))
+
+    def test_swift_delete_static_large_object(self):
+        container = self.containers.first()
+        obj = self.objects.first()
+        self._stub_get_objects(container, obj)
+
+        swift_api = self.stub_swiftclient()
+        swift_api.head_object(container.name, obj.name) \
+            .AndReturn({'x-static-large-object': 'True'})
+        # Swift deletes the segments along with the manifest.
+        swift_api.delete_object(container.name, obj.name,
+                                query_string='multipart-manifest=delete')
+        self.mox.ReplayAll()
+
+        self.assertTrue(api.swift.swift_delete_object(self.request,
+                                                      container.name,
+                                                      obj.name))
+
     def test_swift_object_exists(self):
         container = self.containers.first()
         obj = self.objects.first()
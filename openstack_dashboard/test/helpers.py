@@ -194,7 +194,7 @@ class TestCase(horizon_helpers.TestCase):
         """Global mocks on panels that get called on all views."""
         self.patchers['aggregates'] = mock.patch(
             'openstack_dashboard.dashboards.admin'
-            '.aggregates.panel.Aggregates.can_access',
+            '.aggregates.panel.Aggregates.allowed',
             mock.Mock(return_value=True))
         self.patchers['aggregates'].start()
 
@@ -501,7 +501,7 @@ class SeleniumTestCase(horizon_helpers.SeleniumTestCase):
         self.patchers = {}
         self.patchers['aggregates'] = mock.patch(
             'openstack_dashboard.dashboards.admin'
-            '.aggregates.panel.Aggregates.can_access',
+            '.aggregates.panel.Aggregates.allowed',
             mock.Mock(return_value=True))
         self.patchers['aggregates'].start()
         os.environ["HORIZON_TEST_RUN"] = "True"
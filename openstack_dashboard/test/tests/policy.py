@@ -11,13 +11,25 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import copy
+
 from django.test.utils import override_settings
 from openstack_auth import policy as policy_backend
 
+from horizon.utils import memoized
+
 from openstack_dashboard import policy
 from openstack_dashboard.test import helpers as test
 
 
+CHECKED = []
+
+
+def counting_check(actions, request, target=None):
+    CHECKED.append((actions, target))
+    return target is None or target.get('project_id') != 'other'
+
+
 class PolicyTestCase(test.TestCase):
     @override_settings(POLICY_CHECK_FUNCTION=policy_backend.check)
     def test_policy_check_set(self):
@@ -31,6 +43,56 @@ class PolicyTestCase(test.TestCase):
                              request=self.request)
         self.assertTrue(value)
 
+    @override_settings(POLICY_CHECK_FUNCTION=policy_backend.check)
+    def test_preload(self):
+        policy_backend.reset()
+        policy.preload()
+        self.assertIn('compute', policy_backend._ENFORCER)
+
+
+@override_settings(POLICY_CHECK_FUNCTION=counting_check)
+class PolicyCacheTestCase(test.TestCase):
+    rules = (("compute", "compute:start"),)
+
+    def setUp(self):
+        super(PolicyCacheTestCase, self).setUp()
+        memoized.get_ttl_backend().clear()
+        del CHECKED[:]
+
+    def test_check_cached_per_request(self):
+        stats = policy.cache_stats()
+        for i in range(3):
+            self.assertTrue(policy.check(self.rules, self.request))
+        self.assertEqual(1, len(CHECKED))
+        self.assertTrue(policy.check(self.rules, copy.copy(self.request)))
+        self.assertEqual(2, len(CHECKED))
+
+        new_stats = policy.cache_stats()
+        self.assertEqual(2, new_stats['hits'] - stats['hits'])
+        self.assertEqual(2, new_stats['misses'] - stats['misses'])
+
+    def test_check_cached_per_target(self):
+        target = {'project_id': 'other'}
+        self.assertFalse(policy.check(self.rules, self.request, target))
+        self.assertTrue(policy.check(self.rules, self.request,
+                                     {'project_id': '1'}))
+        self.assertFalse(policy.check(self.rules, self.request,
+                                      {'project_id': 'other'}))
+        self.assertTrue(policy.check(self.rules, self.request))
+        self.assertEqual(3, len(CHECKED))
+        self.assertEqual({'project_id': 'other'}, target)
+
+    @override_settings(MEMOIZED_CACHE_ENABLED=True)
+    def test_check_without_target_cached_across_requests(self):
+        self.assertTrue(policy.check(self.rules, self.request))
+        self.assertTrue(policy.check(self.rules, copy.copy(self.request)))
+        target = {'project_id': '1'}
+        self.assertTrue(policy.check(self.rules, self.request, target))
+        self.assertTrue(policy.check(self.rules, copy.copy(self.request),
+                                     target))
+        self.assertEqual([(self.rules, None), (self.rules, target),
+                          (self.rules, target)], CHECKED)
+
 
 class PolicyBackendTestCaseAdmin(test.BaseAdminViewTests):
     @override_settings(POLICY_CHECK_FUNCTION=policy_backend.check)
@@ -19,9 +19,14 @@
 
 from __future__ import absolute_import
 
+import copy
+
 from django import http
+from django.test.utils import override_settings
 from mox3.mox import IsA  # noqa
 
+from horizon.utils import memoized
+
 from openstack_dashboard import api
 from openstack_dashboard.api import cinder
 from openstack_dashboard.test import helpers as test
@@ -263,3 +268,115 @@ class QuotaTests(test.APITestCase):
 
         # Compare internal structure of usages to expected.
         self.assertItemsEqual(expected_output, quota_usages.usages)
+
+    @test.create_stubs({api.nova: ('server_list',
+                                   'flavor_list',
+                                   'tenant_quota_get',),
+                        api.network: ('tenant_floating_ip_list',
+                                      'floating_ip_supported',
+                                      'security_group_list'),
+                        api.neutron: ('is_extension_supported',
+                                      'is_quotas_extension_supported',
+                                      'tenant_quota_get',
+                                      'network_list',
+                                      'subnet_list',
+                                      'router_list'),
+                        api.base: ('is_service_enabled',)})
+    def test_tenant_quota_usages_neutron(self):
+        tenant_id = self.request.user.tenant_id
+        networks = [net for net in self.networks.list()
+                    if net.tenant_id == tenant_id]
+        routers = [router for router in self.routers.list()
+                   if router.tenant_id == tenant_id]
+
+        api.base.is_service_enabled(IsA(http.HttpRequest),
+                                    'volume').AndReturn(False)
+        api.base.is_service_enabled(IsA(http.HttpRequest),
+                                    'network').AndReturn(True)
+        api.neutron.is_extension_supported(IsA(http.HttpRequest),
+                                           'security-group').AndReturn(True)
+        api.neutron.is_quotas_extension_supported(IsA(http.HttpRequest)) \
+            .AndReturn(True)
+        api.nova.tenant_quota_get(IsA(http.HttpRequest), '1') \
+            .AndReturn(self.quotas.first())
+        api.neutron.tenant_quota_get(IsA(http.HttpRequest), '1') \
+            .AndReturn(self.neutron_quotas.first())
+        api.nova.server_list(IsA(http.HttpRequest),
+                             search_opts={'tenant_id': tenant_id},
+                             all_tenants=True) \
+            .AndReturn([[], False])
+        api.nova.flavor_list(IsA(http.HttpRequest)) \
+            .AndReturn(self.flavors.list())
+        api.network.floating_ip_supported(IsA(http.HttpRequest)) \
+            .AndReturn(True)
+        api.network.tenant_floating_ip_list(IsA(http.HttpRequest)) \
+            .AndReturn(self.floating_ips.list())
+        api.network.security_group_list(IsA(http.HttpRequest)) \
+            .AndReturn(self.q_secgroups.list())
+        # Networks are counted with a single call which doesn't expand
+        # their subnets.
+        api.neutron.network_list(IsA(http.HttpRequest), tenant_id=tenant_id,
+                                 expand_subnet=False).AndReturn(networks)
+        api.neutron.subnet_list(IsA(http.HttpRequest)) \
+            .AndReturn(self.subnets.list())
+        api.neutron.router_list(IsA(http.HttpRequest), tenant_id=tenant_id) \
+            .AndReturn(routers)
+
+        self.mox.ReplayAll()
+
+        quota_usages = quotas.tenant_quota_usages(self.request)
+
+        self.assertEqual(len(self.floating_ips.list()),
+                         quota_usages['floating_ips']['used'])
+        self.assertEqual(len(self.q_secgroups.list()),
+                         quota_usages['security_groups']['used'])
+        self.assertEqual(len(networks), quota_usages['networks']['used'])
+        self.assertEqual(len(self.subnets.list()),
+                         quota_usages['subnets']['used'])
+        self.assertEqual(len(routers), quota_usages['routers']['used'])
+        self.assertEqual(0, quota_usages['instances']['used'])
+
+    @override_settings(MEMOIZED_CACHE_ENABLED=True,
+                       MEMOIZED_CACHE_BACKEND=None)
+    @test.create_stubs({api.nova: ('server_list',
+                                   'flavor_list',
+                                   'tenant_quota_get',),
+                        api.network: ('tenant_floating_ip_list',
+                                      'floating_ip_supported'),
+                        api.base: ('is_service_enabled',)})
+    def test_tenant_quota_usages_cached(self):
+        memoized.get_ttl_backend().clear()
+        servers = [s for s in self.servers.list()
+                   if s.tenant_id == self.request.user.tenant_id]
+        novaclient = self.stub_novaclient()
+        novaclient.servers = self.mox.CreateMockAnything()
+        novaclient.servers.delete(servers[0].id)
+
+        # The usages are retrieved again once the server is deleted.
+        for i in range(2):
+            api.base.is_service_enabled(IsA(http.HttpRequest),
+                                        'volume').AndReturn(False)
+            api.base.is_service_enabled(IsA(http.HttpRequest),
+                                        'network').AndReturn(False)
+            api.nova.flavor_list(IsA(http.HttpRequest)) \
+                .AndReturn(self.flavors.list())
+            api.nova.tenant_quota_get(IsA(http.HttpRequest), '1') \
+                .AndReturn(self.quotas.first())
+            api.network.floating_ip_supported(IsA(http.HttpRequest)) \
+                .AndReturn(False)
+            search_opts = {'tenant_id': self.request.user.tenant_id}
+            api.nova.server_list(IsA(http.HttpRequest),
+                                 search_opts=search_opts,
+                                 all_tenants=True) \
+                .AndReturn([servers[i:], False])
+
+        self.mox.ReplayAll()
+
+        quota_usages = quotas.tenant_quota_usages(self.request)
+        # Another request of the same user is served from the cache.
+        self.assertIs(quota_usages,
+                      quotas.tenant_quota_usages(copy.copy(self.request)))
+
+        api.nova.server_delete(self.request, servers[0].id)
+        quota_usages = quotas.tenant_quota_usages(copy.copy(self.request))
+        self.assertEqual(len(servers) - 1, quota_usages['instances']['used'])
@@ -14,10 +14,12 @@
 #    under the License.
 
 import datetime
+import sys
 import uuid
 
 from openstack_dashboard.test import helpers as test
 from openstack_dashboard.utils import filters
+from openstack_dashboard.utils import importtime
 from openstack_dashboard.utils import metering
 
 
@@ -63,3 +65,30 @@ class UtilsMeteringTests(test.TestCase):
     def test_calc_date_args_invalid(self):
         self.assertRaises(
             ValueError, metering.calc_date_args, object, object, "other")
+
+
+class UtilsImportTimeTests(test.TestCase):
+    def test_profile_new_imports(self):
+        sys.modules.pop('colorsys', None)
+        with importtime.ImportProfiler() as profiler:
+            import colorsys  # noqa
+            import datetime  # noqa
+        self.assertEqual(['colorsys'], list(profiler.timings))
+        cumulative, own = profiler.timings['colorsys']
+        self.assertTrue(cumulative >= own >= 0)
+        report = profiler.report(limit=1)
+        self.assertEqual(2, len(report))
+        self.assertTrue(report[1].endswith('  colorsys'))
+
+    def test_resolve_name(self):
+        module_globals = {'__name__': 'openstack_dashboard.utils.importtime',
+                          '__package__': 'openstack_dashboard.utils'}
+        self.assertEqual('openstack_dashboard.utils.filters',
+                         importtime._resolve_name('filters', module_globals,
+                                                  1))
+        self.assertEqual('openstack_dashboard.api',
+                         importtime._resolve_name('api', module_globals, 2))
+        self.assertEqual('os', importtime._resolve_name('os', module_globals,
+                                                        -1))
+        self.assertEqual('os', importtime._resolve_name('os', module_globals,
+                                                        0))
@@ -17,7 +17,8 @@ import logging
 from django.utils.translation import ugettext_lazy as _
 
 from horizon import exceptions
-from horizon.utils.memoized import memoized  # noqa
+from horizon.utils import concurrency
+from horizon.utils.memoized import memoized_with_ttl  # noqa
 
 from openstack_dashboard.api import base
 from openstack_dashboard.api import cinder
@@ -258,30 +259,42 @@ def get_disabled_quotas(request):
     return disabled_quotas
 
 
-def _get_tenant_compute_usages(request, usages, disabled_quotas, tenant_id):
+def _get_tenant_compute_calls(request, disabled_quotas, tenant_id):
     if tenant_id:
         # determine if the user has permission to view across projects
         # there are cases where an administrator wants to check the quotas
         # on a project they are not scoped to
         all_tenants = policy.check((("compute", "compute:get_all_tenants"),),
                                    request)
-        instances, has_more = nova.server_list(
-            request, search_opts={'tenant_id': tenant_id},
-            all_tenants=all_tenants)
+        servers = concurrency.Task(
+            nova.server_list, args=(request,),
+            kwargs={'search_opts': {'tenant_id': tenant_id},
+                    'all_tenants': all_tenants})
     else:
-        instances, has_more = nova.server_list(request)
-
-    # Fetch deleted flavors if necessary.
-    flavors = dict([(f.id, f) for f in nova.flavor_list(request)])
-    missing_flavors = [instance.flavor['id'] for instance in instances
-                       if instance.flavor['id'] not in flavors]
-    for missing in missing_flavors:
-        if missing not in flavors:
-            try:
-                flavors[missing] = nova.flavor_get(request, missing)
-            except Exception:
-                flavors[missing] = {}
-                exceptions.handle(request, ignore=True)
+        servers = concurrency.Task(nova.server_list, args=(request,))
+    return {'servers': servers,
+            'flavors': concurrency.Task(nova.flavor_list, args=(request,))}
+
+
+def _get_tenant_compute_usages(request, usages, calls):
+    instances, has_more = calls['servers'].get()
+    flavors = dict([(f.id, f) for f in calls['flavors'].get()])
+
+    # Fetch deleted flavors if necessary, all of them at once.
+    missing_flavors = []
+    for instance in instances:
+        flavor_id = instance.flavor['id']
+        if flavor_id not in flavors and flavor_id not in missing_flavors:
+            missing_flavors.append(flavor_id)
+    tasks = concurrency.execute([
+        concurrency.Task(nova.flavor_get, args=(request, missing))
+        for missing in missing_flavors])
+    for missing, task in zip(missing_flavors, tasks):
+        try:
+            flavors[missing] = task.get()
+        except Exception:
+            flavors[missing] = {}
+            exceptions.handle(request, ignore=True)
 
     usages.tally('instances', len(instances))
 
@@ -296,69 +309,86 @@ def _get_tenant_compute_usages(request, usages, disabled_quotas, tenant_id):
         usages.tally('ram', 0)
 
 
-def _get_tenant_network_usages(request, usages, disabled_quotas, tenant_id):
-    floating_ips = []
+def _tenant_floating_ip_list(request):
+    if network.floating_ip_supported(request):
+        return network.tenant_floating_ip_list(request)
+    return []
+
+
+def _get_tenant_network_calls(request, disabled_quotas, tenant_id):
+    calls = {'floating_ips': concurrency.Task(_tenant_floating_ip_list,
+                                              args=(request,))}
+    # Neutron filters by project, so that the counted resources don't
+    # have to be listed for every project an administrator can see.
+    filters = {'tenant_id': tenant_id} if tenant_id else {}
+    if 'security_group' not in disabled_quotas:
+        calls['security_groups'] = concurrency.Task(
+            network.security_group_list, args=(request,))
+    if 'network' not in disabled_quotas:
+        # Both shared and unshared networks count, and the subnets need
+        # not be expanded just to count the networks.
+        calls['networks'] = concurrency.Task(
+            neutron.network_list, args=(request,),
+            kwargs=dict(filters, expand_subnet=False))
+    if 'subnet' not in disabled_quotas:
+        calls['subnets'] = concurrency.Task(neutron.subnet_list,
+                                            args=(request,))
+    if 'router' not in disabled_quotas:
+        calls['routers'] = concurrency.Task(neutron.router_list,
+                                            args=(request,), kwargs=filters)
+    return calls
+
+
+def _get_tenant_network_usages(request, usages, calls):
     try:
-        if network.floating_ip_supported(request):
-            floating_ips = network.tenant_floating_ip_list(request)
+        floating_ips = calls['floating_ips'].get()
     except Exception:
-        pass
+        floating_ips = []
     usages.tally('floating_ips', len(floating_ips))
 
-    if 'security_group' not in disabled_quotas:
-        security_groups = []
-        security_groups = network.security_group_list(request)
-        usages.tally('security_groups', len(security_groups))
-
-    if 'network' not in disabled_quotas:
-        networks = []
-        networks = neutron.network_list(request, shared=False)
-        if tenant_id:
-            networks = [net for net in networks if net.tenant_id == tenant_id]
-        usages.tally('networks', len(networks))
-        # get shared networks
-        shared_networks = neutron.network_list(request, shared=True)
-        if tenant_id:
-            shared_networks = [net for net in shared_networks
-                               if net.tenant_id == tenant_id]
-        usages.tally('networks', len(shared_networks))
+    for name in ('security_groups', 'networks', 'subnets', 'routers'):
+        if name in calls:
+            usages.tally(name, len(calls[name].get()))
 
-    if 'subnet' not in disabled_quotas:
-        subnets = []
-        subnets = neutron.subnet_list(request)
-        usages.tally('subnets', len(subnets))
 
-    if 'router' not in disabled_quotas:
-        routers = []
-        routers = neutron.router_list(request)
-        if tenant_id:
-            routers = [rou for rou in routers if rou.tenant_id == tenant_id]
-        usages.tally('routers', len(routers))
+def _get_tenant_volume_calls(request, disabled_quotas, tenant_id):
+    if 'volumes' in disabled_quotas:
+        return {}
+    args = (request,)
+    if tenant_id:
+        args += ({'all_tenants': 1, 'project_id': tenant_id},)
+    return {'volumes': concurrency.Task(cinder.volume_list, args=args),
+            'snapshots': concurrency.Task(cinder.volume_snapshot_list,
+                                          args=args)}
 
 
-def _get_tenant_volume_usages(request, usages, disabled_quotas, tenant_id):
-    if 'volumes' not in disabled_quotas:
-        try:
-            if tenant_id:
-                opts = {'all_tenants': 1, 'project_id': tenant_id}
-                volumes = cinder.volume_list(request, opts)
-                snapshots = cinder.volume_snapshot_list(request, opts)
-            else:
-                volumes = cinder.volume_list(request)
-                snapshots = cinder.volume_snapshot_list(request)
-            usages.tally('gigabytes', sum([int(v.size) for v in volumes]))
-            usages.tally('volumes', len(volumes))
-            usages.tally('snapshots', len(snapshots))
-        except cinder.ClientException:
-            msg = _("Unable to retrieve volume limit information.")
-            exceptions.handle(request, msg)
+def _get_tenant_volume_usages(request, usages, disabled_quotas, calls):
+    # The volume quotas are disabled as well when they could not be
+    # retrieved, in which case there is nothing to tally the usage against.
+    if not calls or 'volumes' in disabled_quotas:
+        return
+    try:
+        volumes = calls['volumes'].get()
+        snapshots = calls['snapshots'].get()
+        usages.tally('gigabytes', sum([int(v.size) for v in volumes]))
+        usages.tally('volumes', len(volumes))
+        usages.tally('snapshots', len(snapshots))
+    except cinder.ClientException:
+        msg = _("Unable to retrieve volume limit information.")
+        exceptions.handle(request, msg)
 
 
-@memoized
+@memoized_with_ttl(30)
 def tenant_quota_usages(request, tenant_id=None):
     """Get our quotas and construct our usage object.
     If no tenant_id is provided, a the request.user.project_id
     is assumed to be used
+
+    The quotas and the usage of every service are retrieved concurrently.
+    When the cross-request cache is enabled the result is kept for a short
+    while per token, since the usages counted depend on the policies of
+    the user; creating or deleting resources counted against a quota through
+    the API invalidates it.
     """
     if not tenant_id:
         tenant_id = request.user.project_id
@@ -366,15 +396,27 @@ def tenant_quota_usages(request, tenant_id=None):
     disabled_quotas = get_disabled_quotas(request)
     usages = QuotaUsage()
 
-    for quota in get_tenant_quota_data(request,
-                                       disabled_quotas=disabled_quotas,
-                                       tenant_id=tenant_id):
+    quotas = concurrency.Task(get_tenant_quota_data, args=(request,),
+                              kwargs={'disabled_quotas': disabled_quotas,
+                                      'tenant_id': tenant_id})
+    compute_calls = _get_tenant_compute_calls(request, disabled_quotas,
+                                              tenant_id)
+    network_calls = _get_tenant_network_calls(request, disabled_quotas,
+                                              tenant_id)
+    volume_calls = _get_tenant_volume_calls(request, disabled_quotas,
+                                            tenant_id)
+    concurrency.execute(itertools.chain([quotas],
+                                        compute_calls.values(),
+                                        network_calls.values(),
+                                        volume_calls.values()))
+
+    for quota in quotas.get():
         usages.add_quota(quota)
 
     # Get our usages.
-    _get_tenant_compute_usages(request, usages, disabled_quotas, tenant_id)
-    _get_tenant_network_usages(request, usages, disabled_quotas, tenant_id)
-    _get_tenant_volume_usages(request, usages, disabled_quotas, tenant_id)
+    _get_tenant_compute_usages(request, usages, compute_calls)
+    _get_tenant_network_usages(request, usages, network_calls)
+    _get_tenant_volume_usages(request, usages, disabled_quotas, volume_calls)
 
     return usages
 
@@ -30,24 +30,38 @@ class UsageView(tables.DataTableView):
             raise AttributeError("You must specify a usage_class attribute "
                                  "which is a subclass of BaseUsage.")
 
+    def is_csv(self):
+        return self.request.GET.get('format', 'html') == 'csv'
+
     def get_template_names(self):
-        if self.request.GET.get('format', 'html') == 'csv':
+        if self.is_csv():
             return (self.csv_template_name or
                     ".".join((self.template_name.rsplit('.', 1)[0], 'csv')))
         return self.template_name
 
     def get_content_type(self):
-        if self.request.GET.get('format', 'html') == 'csv':
+        if self.is_csv():
             return "text/csv"
         return "text/html"
 
+    def get(self, request, *args, **kwargs):
+        if self.is_csv():
+            # The export only needs the usage: the table and the charts of
+            # the page aren't built, so the response starts right after the
+            # usage is retrieved and its rows are written while streamed.
+            self.get_data()
+            return self.render_to_response({'usage': self.usage})
+        return super(UsageView, self).get(request, *args, **kwargs)
+
     def get_data(self):
         try:
             project_id = self.kwargs.get('project_id',
                                          self.request.user.tenant_id)
             self.usage = self.usage_class(self.request, project_id)
             self.usage.summarize(*self.usage.get_date_range())
-            self.usage.get_limits()
+            # The limits are only shown on the page, not in the CSV export.
+            if not self.is_csv():
+                self.usage.get_limits()
             self.kwargs['usage'] = self.usage
             return self.usage.usage_list
         except Exception:
@@ -98,7 +112,7 @@ class UsageView(tables.DataTableView):
         return context
 
     def render_to_response(self, context, **response_kwargs):
-        if self.request.GET.get('format', 'html') == 'csv':
+        if self.is_csv():
             render_class = self.csv_response_class
             response_kwargs.setdefault("filename", "usage.csv")
         else:
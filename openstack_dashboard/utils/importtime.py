@@ -0,0 +1,144 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+Measures the time spent importing modules.
+
+Run as a script, this module starts Django and loads the URLconf, including
+every dashboard and panel, the way a WSGI worker does, and prints the
+slowest imports::
+
+    python -m openstack_dashboard.utils.importtime [--limit N] [module ...]
+
+Use ``manage.py profile_imports`` rather than running it directly.
+"""
+
+from __future__ import print_function
+
+import argparse
+import importlib
+import sys
+import time
+
+import six
+from six.moves import builtins
+
+
+class ImportProfiler(object):
+    """Records how long each import statement run in its context takes.
+
+    Only imports which load new modules are recorded. ``cumulative`` is the
+    time spent in the import, including the modules imported by the
+    imported module; ``self`` excludes the latter.
+    """
+    def __init__(self):
+        self.timings = {}
+        self._children = []
+        self._original_import = None
+
+    def __enter__(self):
+        self._original_import = builtins.__import__
+        builtins.__import__ = self._import
+        return self
+
+    def __exit__(self, *exc_info):
+        builtins.__import__ = self._original_import
+
+    def _import(self, name, globals=None, *args, **kwargs):
+        loaded = len(sys.modules)
+        self._children.append(0.0)
+        started = time.time()
+        try:
+            return self._original_import(name, globals, *args, **kwargs)
+        finally:
+            elapsed = time.time() - started
+            children = self._children.pop()
+            if self._children:
+                self._children[-1] += elapsed
+            if len(sys.modules) != loaded:
+                level = (args[2] if len(args) > 2 else
+                         kwargs.get('level', 0 if six.PY3 else -1))
+                timing = self.timings.setdefault(
+                    _resolve_name(name, globals, level), [0.0, 0.0])
+                timing[0] += elapsed
+                timing[1] += elapsed - children
+
+    def report(self, limit=20, sort='cumulative'):
+        """Returns the ``limit`` slowest imports as lines of text."""
+        column = 1 if sort == 'self' else 0
+        timings = sorted(self.timings.items(),
+                         key=lambda item: item[1][column], reverse=True)
+        lines = ['%12s %10s  %s' % ('cumulative', 'self', 'module')]
+        for name, (cumulative, own) in timings[:limit]:
+            lines.append('%10.1fms %8.1fms  %s' % (cumulative * 1000,
+                                                   own * 1000, name))
+        return lines
+
+
+def _resolve_name(name, globals, level):
+    """Returns the absolute name of the module imported as ``name``."""
+    if not globals or level == 0:
+        return name
+    package = globals.get('__package__')
+    if package is None:
+        package = globals.get('__name__', '')
+        if '__path__' not in globals:
+            package = package.rpartition('.')[0]
+    for i in range(max(level, 1) - 1):
+        package = package.rpartition('.')[0]
+    if not package:
+        return name
+    full_name = '%s.%s' % (package, name) if name else package
+    # Python 2 tries implicit relative imports first.
+    if level > 0 or sys.modules.get(full_name) is not None:
+        return full_name
+    return name
+
+
+def _load_dashboard():
+    import django
+    from django.conf import settings
+    from django.core import urlresolvers
+
+    django.setup()
+    importlib.import_module(settings.ROOT_URLCONF)
+    # Horizon discovers the dashboards and panels when its URL patterns
+    # are first evaluated.
+    urlresolvers.get_resolver(None).reverse_dict
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Profile module imports.')
+    parser.add_argument('modules', nargs='*',
+                        help='modules to import instead of the dashboard')
+    parser.add_argument('--limit', type=int, default=20)
+    parser.add_argument('--sort', choices=('cumulative', 'self'),
+                        default='cumulative')
+    args = parser.parse_args(argv)
+
+    started = time.time()
+    with ImportProfiler() as profiler:
+        if args.modules:
+            for module in args.modules:
+                importlib.import_module(module)
+        else:
+            _load_dashboard()
+    total = time.time() - started
+
+    for line in profiler.report(args.limit, args.sort):
+        print(line)
+    loaded = [module for module in sys.modules.values() if module is not None]
+    print('Loaded %d modules in %.1fms.' % (len(loaded), total * 1000))
+
+
+if __name__ == '__main__':
+    main()